@@ -0,0 +1 @@
+"""Headless-Benchmarks für den Ziehpfad und den Speicher (siehe benchmarks/run.py)."""
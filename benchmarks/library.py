@@ -0,0 +1,167 @@
+"""
+Synthetische Formations- und Teambibliotheken für Benchmarks und Lasttests.
+
+Die Formationen entsprechen dem Schema von formations.json: Ballpositionen im
+Bewegungsbereich des Balls (BallItem.movement_boundary), sechs Spieler in einer
+Abwehraufstellung, die dem Ball folgt, und Annahmezonen um einzelne Spieler. Gleiche
+Parameter ergeben dieselbe Bibliothek.
+
+Aufruf im Projektverzeichnis:
+    python -m benchmarks.library --formations 10000 --teams 50 --json bibliothek/
+    python -m benchmarks.library --formations 100000 --sqlite bibliothek.sqlite3
+
+Die Dateien lassen sich über VSM_FORMATIONS_PATH/VSM_TEAMS_PATH bzw. VSM_STORE=sqlite und
+VSM_SQLITE_PATH in Desktop-App und Webapp verwenden.
+"""
+import argparse  # Importiert argparse für die Kommandozeile.
+import os  # Importiert os für Pfade.
+import random  # Importiert random für reproduzierbare Zufallswerte.
+import sys  # Importiert sys für Ausgaben und Pfade.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Projektverzeichnis.
+if ROOT not in sys.path:  # Auch als Skript (python benchmarks/library.py) aufrufbar.
+    sys.path.insert(0, ROOT)
+
+from core.geometry import CourtDimensions, DEFAULT_SCALE  # noqa: E402  Qt-freie Spielfeldmaße.
+
+PLAYER_COUNT = 6  # Spieler je Formation.
+BALL_RADIUS = 12  # Radius des Balls in Pixeln (wie in main.py).
+PLAYER_DIAMETER = 20  # Durchmesser der Spieler in Pixeln (wie in main.py).
+PLAYER_OVERHANG = 30  # Spieler dürfen bis zu 30 Pixel neben das Feld (PlayerItem-Bewegungsgrenze).
+FRONT_ATTACK_SHARE = 0.7  # Anteil der Angriffe aus der Vorderzone (3 m vor dem Netz).
+ATTACK_LANES = (1.0, 4.5, 8.0)  # Typische Angriffspositionen (IV, III, II) in Metern vom linken Rand.
+# Abwehraufstellung in Metern hinter dem Netz (x, Tiefe); die ersten beiden blocken am Ball
+DEFENSE_TEMPLATE = [(0.0, 0.5), (0.8, 0.5), (7.5, 6.0), (1.5, 6.0), (4.5, 8.0), (8.0, 3.0)]  # MB, OH, S, OH, L, Oppo.
+BLOCKERS = 2  # Anzahl der Spieler, die am Ball blocken (x relativ zum Ball).
+SHIFT_TO_BALL = 0.3  # Anteil, um den die übrigen Spieler zur Ballseite rücken.
+JITTER = 0.4  # Streuung der Spielerpositionen in Metern.
+MAX_ZONES = 3  # Höchstzahl der Zonen je Formation.
+FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Elif", "Finn", "Greta", "Hannes", "Ida", "Jonas", "Kira", "Luca",
+               "Mia", "Noah", "Olga", "Paul", "Quirin", "Rosa", "Sami", "Tara", "Umut", "Vera", "Wiebke", "Yusuf"]  # Vornamen für Teams.
+LAST_NAMES = ["Becker", "Demir", "Fischer", "Hoffmann", "Kaya", "Klein", "Krüger", "Lange", "Meyer", "Neumann",
+              "Richter", "Schmidt", "Schulz", "Wagner", "Weber", "Wolf", "Zimmermann"]  # Nachnamen für Teams.
+CLUBS = ["TV", "SC", "VfB", "TSV", "SV", "VC"]  # Vereinskürzel für Teamnamen.
+CITIES = ["Aachen", "Berlin", "Dresden", "Essen", "Freiburg", "Kiel", "Leipzig", "Mainz", "Münster", "Ulm"]  # Orte für Teamnamen.
+
+
+def _clamp(value, low, high):  # Begrenzt einen Wert auf [low, high].
+    return max(low, min(high, value))
+
+
+def _ball_position(rng, dims, scale):  # Zufällige Ballposition (Mittelpunkt) im Bewegungsbereich.
+    if rng.random() < FRONT_ATTACK_SHARE:  # Angriff aus der Vorderzone über eine der Angriffspositionen.
+        x = rng.gauss(rng.choice(ATTACK_LANES), 1.0) * scale
+        y = dims.net_y - rng.uniform(0.3, 3.0) * scale
+    else:  # Angriff aus dem Hinterfeld.
+        x = rng.uniform(0, dims.width)
+        y = rng.uniform(0, dims.net_y - 3 * scale)
+    return (_clamp(x, BALL_RADIUS, dims.width - BALL_RADIUS), _clamp(y, BALL_RADIUS, dims.net_y - BALL_RADIUS))
+
+
+def _player_positions(rng, dims, scale, bx):  # Spielerpositionen (linke obere Ecke) der Abwehr.
+    positions = []
+    for i, (x, depth) in enumerate(DEFENSE_TEMPLATE):
+        if i < BLOCKERS:  # Blockspieler stehen am Ball.
+            cx = bx + (x - 0.4) * scale
+        else:  # Übrige Spieler rücken zur Ballseite.
+            cx = x * scale + SHIFT_TO_BALL * (bx - dims.width / 2)
+        cx += rng.gauss(0, JITTER) * scale
+        cy = dims.net_y + (depth + rng.gauss(0, JITTER)) * scale
+        px = _clamp(cx - PLAYER_DIAMETER / 2, -PLAYER_OVERHANG, dims.width + PLAYER_OVERHANG - PLAYER_DIAMETER)
+        py = _clamp(cy - PLAYER_DIAMETER / 2, dims.net_y, dims.height - PLAYER_DIAMETER)
+        positions.append((px, py))
+    return positions
+
+
+def _zones(rng, dims, scale, players):  # Annahmezonen um zufällige Spieler.
+    zones = []
+    for _ in range(rng.randint(0, MAX_ZONES)):
+        index = rng.randrange(PLAYER_COUNT)
+        px, py = players[index]
+        w, h = rng.uniform(1, 3) * scale, rng.uniform(1, 3) * scale  # Größe 1-3 m.
+        x = _clamp(px + PLAYER_DIAMETER / 2 - w / 2, 0, dims.width - w)
+        y = _clamp(py + PLAYER_DIAMETER / 2 - h / 2, dims.net_y, dims.height - h)
+        zones.append({
+            "player_index": index,
+            "rect": [round(x, 2), round(y, 2), round(w, 2), round(h, 2)],
+            "color": [rng.randrange(256), rng.randrange(256), rng.randrange(256), 255],
+        })
+    return zones
+
+
+def _formation_name(i, bx, by, dims, scale):  # Name nach Angriffsposition und Zone.
+    lane = "Pos IV" if bx < 3 * scale else "Pos II" if bx > 6 * scale else "Pos III"
+    row = "vorne" if by >= dims.net_y - 3 * scale else "hinten"
+    return "%s %s %d" % (lane, row, i + 1)
+
+
+def make_formations(count, seed=0, scale=DEFAULT_SCALE):  # Erzeugt eine synthetische Formationsbibliothek.
+    """
+    Erzeugt count Formationen im Format von formations.json (ohne id/version).
+
+    70 % der Ballpositionen liegen in der Vorderzone um die Angriffspositionen IV/III/II, der
+    Rest im Hinterfeld. Zwei Spieler blocken am Ball, die übrigen stehen in einer Abwehr, die
+    zur Ballseite rückt; jede Formation erhält bis zu drei Zonen um einzelne Spieler.
+    """
+    rng = random.Random(seed)  # Eigener Zufallsgenerator (unabhängig vom globalen Zustand).
+    dims = CourtDimensions(scale)  # Spielfeldmaße in Pixeln.
+    formations = []  # Erzeugte Formationen.
+    for i in range(count):  # Erzeugt jede Formation.
+        bx, by = _ball_position(rng, dims, scale)  # Ballmittelpunkt.
+        players = _player_positions(rng, dims, scale, bx)  # Spielerpositionen.
+        formations.append({
+            "name": _formation_name(i, bx, by, dims, scale),
+            "ball": [round(bx, 2), round(by, 2)],
+            "offsets": [[round(px - bx, 2), round(py - by, 2)] for px, py in players],
+            "zones": _zones(rng, dims, scale, players),
+        })
+    return formations  # Gibt die Bibliothek zurück.
+
+
+def make_teams(count, seed=0):  # Erzeugt synthetische Teams.
+    """Erzeugt count Teams im Format von teams.json mit je sechs Spielernamen."""
+    rng = random.Random(seed)  # Eigener Zufallsgenerator.
+    return [{
+        "name": "%s %s %d" % (rng.choice(CLUBS), rng.choice(CITIES), i + 1),
+        "player_names": ["%s %s" % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(PLAYER_COUNT)],
+    } for i in range(count)]
+
+
+def write_library(store, formations, teams):  # Schreibt eine Bibliothek in einen Speicher.
+    """Ersetzt alle Formationen und Teams im Speicher (JsonStore, SqliteStore) und schreibt sofort."""
+    # Flache Kopien: der Speicher ergänzt id und version, die übergebenen Listen bleiben unverändert
+    store.replace_formations([dict(form, zones=[dict(zone) for zone in form["zones"]]) for form in formations])
+    store.replace_teams([dict(team) for team in teams])
+    store.flush()
+
+
+def main(argv=None):  # Kommandozeile.
+    from storage import JsonStore, SqliteStore, WriteBehind  # Erst hier, damit die Erzeugung ohne Speicher auskommt.
+    parser = argparse.ArgumentParser(description="Erzeugt synthetische Formations- und Teambibliotheken.")
+    parser.add_argument("--formations", type=int, default=1000, help="Anzahl der Formationen")
+    parser.add_argument("--teams", type=int, default=20, help="Anzahl der Teams")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert (gleicher Wert, gleiche Bibliothek)")
+    parser.add_argument("--scale", type=float, default=DEFAULT_SCALE, help="Pixel pro Meter")
+    parser.add_argument("--json", metavar="VERZEICHNIS", help="formations.json und teams.json in dieses Verzeichnis schreiben")
+    parser.add_argument("--sqlite", metavar="DATEI", help="in diese SQLite-Datenbank schreiben (Inhalt wird ersetzt)")
+    args = parser.parse_args(argv)
+    if not args.json and not args.sqlite:
+        parser.error("mindestens --json oder --sqlite angeben")
+
+    formations = make_formations(args.formations, args.seed, args.scale)  # Formationen.
+    teams = make_teams(args.teams, args.seed)  # Teams.
+    if args.json:  # JSON-Dateien.
+        os.makedirs(args.json, exist_ok=True)
+        formations_path = os.path.join(args.json, "formations.json")
+        teams_path = os.path.join(args.json, "teams.json")
+        write_library(JsonStore(formations_path, teams_path, WriteBehind(delay=0)), formations, teams)
+        print("JSON: VSM_FORMATIONS_PATH=%s VSM_TEAMS_PATH=%s" % (formations_path, teams_path), file=sys.stderr)
+    if args.sqlite:  # SQLite-Datenbank (ohne Import der JSON-Dateien des Projekts).
+        write_library(SqliteStore(args.sqlite, os.devnull, os.devnull), formations, teams)
+        print("SQLite: VSM_STORE=sqlite VSM_SQLITE_PATH=%s" % args.sqlite, file=sys.stderr)
+    print("%d Formationen, %d Teams (Startwert %d)" % (len(formations), len(teams), args.seed), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Headless-Wiedergabe eines Sitzungsmitschnitts (VSM_RECORD, siehe session_recorder.py) durch
+denselben Ziehpfad wie in der App: BallItem.drag_moved/flush_position, positionChanged mit
+Interpolation und Einrasten, Spieler- und Zonenereignisse.
+
+Aufruf im Projektverzeichnis (QT_QPA_PLATFORM=offscreen wird automatisch gesetzt):
+    python -m benchmarks.replay sitzung.jsonl.gz                      # so schnell wie möglich
+    python -m benchmarks.replay sitzung.jsonl.gz --speed recorded     # im aufgezeichneten Takt
+    python -m benchmarks.replay sitzung.jsonl.gz --output neu.json --compare alt.json
+
+Mit --speed max wird jede Ballposition sofort verarbeitet (DRAG_IMMEDIATE); das Ergebnis ist
+deterministisch und eignet sich für Vergleiche zwischen Versionen. Mit --speed recorded laufen
+die Ereignisse im aufgezeichneten Takt mit dem Aktualisierungsmodus der Aufnahme; die Latenz
+einer Ballposition reicht dann bis zum Ende des Bildes, das sie verarbeitet.
+
+Ergebnis: JSON mit Gesamtzeit, Latenzverteilung je Ereignisart (Mikrosekunden) und dem
+Endzustand (Ball, Spieler, Zonen, ausgewählte Formation). --compare meldet abweichende
+Endzustände und langsamere p95-Latenzen und endet dann mit Exit-Code 1.
+"""
+import argparse  # Importiert argparse für die Kommandozeile.
+import contextlib  # Importiert contextlib, um Debug-Ausgaben während der Wiedergabe umzuleiten.
+import copy  # Importiert copy für die Formationen der Aufnahme.
+import io  # Importiert io für die umgeleiteten Ausgaben.
+import json  # Importiert json für die Ergebnisse.
+import os  # Importiert os für Pfade.
+import sys  # Importiert sys für Ausgaben und Exit-Code.
+import time  # Importiert time für die Zeitmessung.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Projektverzeichnis.
+if ROOT not in sys.path:  # Auch als Skript (python benchmarks/replay.py) aufrufbar.
+    sys.path.insert(0, ROOT)
+
+from benchmarks.run import headless_window, metadata, REGRESSION_THRESHOLD  # Gemeinsamer Aufbau mit den Benchmarks.
+
+SPEED_MAX = "max"  # So schnell wie möglich, jede Position sofort.
+SPEED_RECORDED = "recorded"  # Im aufgezeichneten Takt.
+POSITION_TOLERANCE = 0.01  # Erlaubte Abweichung der Endpositionen in Pixeln.
+
+
+def latency_stats(values):  # Fasst Latenzen in Mikrosekunden zusammen.
+    from frame_profiler import percentile  # Gemeinsame Perzentil-Berechnung.
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "p99": round(percentile(values, 99), 1),
+        "max": round(values[-1], 1),
+        "mean": round(sum(values) / len(values), 1),
+    }
+
+
+def final_state(window):  # Endzustand nach der Wiedergabe.
+    ball = window.ball
+    return {
+        "ball": [round(ball.pos().x(), 3), round(ball.pos().y(), 3)],
+        "players": [[round(p.pos().x(), 3), round(p.pos().y(), 3)] for p in window.players],
+        "zones": [[[round(z.rect().x(), 2), round(z.rect().y(), 2), round(z.rect().width(), 2), round(z.rect().height(), 2)]
+                   for z in p.zones_items] for p in window.players],
+        "selected_formation": window.def_panel.current_index,
+    }
+
+
+def replay(session, speed=SPEED_MAX):  # Spielt einen Mitschnitt ab.
+    """Spielt (Kopfzeile, Ereignisse) im Hauptfenster ab und gibt Zeiten und Endzustand zurück."""
+    from PySide6.QtCore import QRectF  # Erst hier, damit --help ohne Qt funktioniert.
+    from PySide6.QtGui import QColor
+    from components.ball_item import DRAG_IMMEDIATE
+    from session_recorder import EVENT_BALL, EVENT_RELEASE, EVENT_PLAYER, EVENT_ZONE, EVENT_FORMATIONS
+
+    header, events = session
+    app, window, store = headless_window()  # Hauptfenster auf einem leeren Speicher.
+    ball, players, panel = window.ball, window.players, window.def_panel
+
+    def set_formations(formations):  # Übernimmt eine Formationsliste wie beim Laden.
+        store.replace_formations(copy.deepcopy(formations))
+        panel.load_formations()  # Setzt Liste und Auswahl zurück, sendet formationsChanged (Marker, Interpolation, Einrasten).
+        if not panel.formations:  # Leere Liste sendet kein Signal.
+            window.update_formation_markers(panel.formations)
+
+    latencies = {}  # Latenzen je Ereignisart in Mikrosekunden.
+    pending = []  # Zeitpunkte noch nicht verarbeiteter Ballpositionen.
+    frames = 0  # Verarbeitete Ballpositionen (Bilder).
+
+    def settle():  # Ordnet verarbeiteten Ballpositionen ihre Latenz zu.
+        if pending and not ball._drag_pending:  # Das letzte Bild hat alle offenen Positionen verarbeitet.
+            done = time.perf_counter()
+            latencies.setdefault(EVENT_BALL, []).extend((done - t) * 1e6 for t in pending)
+            pending.clear()
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Debug-Ausgaben der Anwendung nicht in die Ergebnisse mischen.
+        set_formations(header["formations"])  # Ausgangszustand der Aufnahme.
+        ball.setPos(*header["ball"])
+        ball.update_sector_position()
+        for player, pos in zip(players, header["players"]):
+            player.setPos(*pos)
+            player.update_after_move()
+        app.processEvents()
+        ball.drag_mode = DRAG_IMMEDIATE if speed == SPEED_MAX else header["drag_mode"]
+
+        started = time.perf_counter()  # Beginn der Wiedergabe.
+        for event in events:
+            t, kind, args = event[0], event[1], event[2:]
+            if speed == SPEED_RECORDED:  # Bis zum aufgezeichneten Zeitpunkt warten, dabei Ereignisse verarbeiten.
+                target = started + t / 1000
+                while time.perf_counter() < target:
+                    app.processEvents()
+                    settle()
+                    time.sleep(min(0.0005, max(0.0, target - time.perf_counter())))
+            start = time.perf_counter()
+            if kind == EVENT_BALL:  # Ball verschoben: derselbe Weg wie mouseMoveEvent.
+                pending.append(start)
+                ball.setPos(args[0], args[1])
+                ball.drag_moved()
+                settle()
+                continue
+            if kind == EVENT_RELEASE:  # Ball losgelassen.
+                frames += ball.drag_updates + (1 if ball._drag_pending else 0)
+                ball.end_drag()
+                settle()
+            elif kind == EVENT_PLAYER:  # Spieler gezogen.
+                player = players[args[0]]
+                player.setPos(args[1], args[2])
+                player.update_after_move()
+            elif kind == EVENT_ZONE:  # Zone gezeichnet.
+                players[args[0]].finish_zone(QRectF(*args[1]), QColor(*args[2]))
+            elif kind == EVENT_FORMATIONS:  # Formationsliste geändert.
+                set_formations(args[0])
+            latencies.setdefault(kind, []).append((time.perf_counter() - start) * 1e6)
+        frames += ball.drag_updates + (1 if ball._drag_pending else 0)
+        ball.end_drag()  # Noch ausstehende Position verarbeiten.
+        settle()
+        total = time.perf_counter() - started
+
+    return {
+        "total_s": round(total, 4),
+        "events": len(events),
+        "frames": frames,
+        "latency_us": {kind: latency_stats(values) for kind, values in sorted(latencies.items())},
+        "final": final_state(window),
+    }
+
+
+def compare(result, baseline, threshold, speed):  # Vergleicht Endzustand und Latenzen mit einem früheren Lauf.
+    """Gibt die Vergleichszeilen und die Anzahl der Abweichungen zurück (Latenzen nur bei gleichem Tempo)."""
+    lines, problems = [], 0
+    old, new = baseline["final"], result["final"]
+    positions = [(old["ball"], new["ball"])] + list(zip(old["players"], new["players"]))
+    deviation = max(max(abs(a - b) for a, b in zip(p, q)) for p, q in positions)  # Größte Abweichung in Pixeln.
+    same = (deviation <= POSITION_TOLERANCE and len(old["players"]) == len(new["players"])
+            and old["zones"] == new["zones"] and old["selected_formation"] == new["selected_formation"])
+    lines.append("Endzustand: %s (größte Abweichung %.3f px)" % ("gleich" if same else "ABWEICHUNG", deviation))
+    problems += not same
+    if baseline.get("meta", {}).get("speed") != speed:  # Latenzen verschiedener Tempi sind nicht vergleichbar.
+        lines.append("Latenzen nicht verglichen: Tempo %s statt %s" % (speed, baseline.get("meta", {}).get("speed")))
+        return lines, problems
+    for kind, stats in result["latency_us"].items():
+        before = baseline["latency_us"].get(kind, {}).get("p95")
+        if not before or not stats.get("p95"):  # Neue Ereignisart.
+            continue
+        ratio = stats["p95"] / before
+        flag = "REGRESSION" if ratio > threshold else ""
+        problems += bool(flag)
+        lines.append("Latenz %-2s p95 %10.1f -> %10.1f us %6.2fx %s" % (kind, before, stats["p95"], ratio, flag))
+    return lines, problems
+
+
+def main(argv=None):  # Kommandozeile.
+    from session_recorder import load_session  # Liest den Mitschnitt.
+    parser = argparse.ArgumentParser(description="Headless-Wiedergabe eines Sitzungsmitschnitts.")
+    parser.add_argument("session", help="Mitschnitt (VSM_RECORD), .jsonl oder .jsonl.gz")
+    parser.add_argument("--speed", choices=(SPEED_MAX, SPEED_RECORDED), default=SPEED_MAX, help="Wiedergabetempo")
+    parser.add_argument("--output", help="Ergebnis-JSON in diese Datei statt auf stdout schreiben")
+    parser.add_argument("--compare", help="früheres Ergebnis-JSON zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Faktor, ab dem eine p95-Latenz als Regression gilt")
+    args = parser.parse_args(argv)
+
+    result = replay(load_session(args.session), args.speed)  # Spielt den Mitschnitt ab.
+    report = {"meta": metadata(session=os.path.abspath(args.session), speed=args.speed), **result}
+    text = json.dumps(report, indent=2)
+    if args.output:  # In eine Datei.
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:  # Auf stdout.
+        print(text)
+
+    print("%d Ereignisse, %d Bilder in %.3f s" % (result["events"], result["frames"], result["total_s"]), file=sys.stderr)  # Übersicht.
+    for kind, stats in result["latency_us"].items():
+        if stats["count"]:
+            print("%-2s %6d  p50 %9.1f  p95 %9.1f  p99 %9.1f  max %9.1f us" % (kind, stats["count"], stats["p50"], stats["p95"],
+                                                                             stats["p99"], stats["max"]), file=sys.stderr)
+
+    if args.compare:  # Vergleich mit einem früheren Lauf.
+        with open(args.compare, encoding="utf-8") as f:
+            lines, problems = compare(result, json.load(f), args.threshold, args.speed)
+        for line in lines:
+            print(line, file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Headless-Benchmarks für den Ziehpfad (Interpolation, Schatten, Angriffssektor, Einrasten),
+das Zeichnen der Szene und den JSON-Speicher mit synthetischen Bibliotheken aus 10/100/1000 Formationen.
+
+Aufruf im Projektverzeichnis (QT_QPA_PLATFORM=offscreen wird automatisch gesetzt):
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json   # Vergleich mit einem früheren Lauf
+
+Ergebnis: JSON mit Metadaten (Commit, Versionen, Parameter) und je Messung Median, Minimum,
+p95 und Mittelwert pro Aufruf in Mikrosekunden. Mit --compare werden die Mediane mit einem
+früheren Ergebnis verglichen; ist eine Messung um mehr als --threshold langsamer, endet der
+Lauf mit Exit-Code 1.
+"""
+import argparse  # Importiert argparse für die Kommandozeile.
+import contextlib  # Importiert contextlib, um Debug-Ausgaben während der Messung umzuleiten.
+import io  # Importiert io für die umgeleiteten Ausgaben.
+import json  # Importiert json für die Ergebnisse.
+import os  # Importiert os für Pfade und Umgebungsvariablen.
+import platform  # Importiert platform für die Metadaten.
+import random  # Importiert random für reproduzierbare Ballpositionen.
+import statistics  # Importiert statistics für Median und Mittelwert.
+import subprocess  # Importiert subprocess für den aktuellen Commit.
+import sys  # Importiert sys für Pfade und Ausgaben.
+import tempfile  # Importiert tempfile für die temporären Speicherdateien.
+import time  # Importiert time für die Zeitmessung.
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Ohne Bildschirm lauffähig.
+os.environ.pop("VSM_RECORD", None)  # Die Messungen selbst nicht mitschneiden.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Projektverzeichnis.
+if ROOT not in sys.path:  # Auch als Skript (python benchmarks/run.py) aufrufbar.
+    sys.path.insert(0, ROOT)
+
+from benchmarks.library import make_formations  # noqa: E402  Synthetische Formationen.
+
+DEFAULT_SIZES = (10, 100, 1000)  # Größen der Bibliotheken.
+DEFAULT_REPEATS = 7  # Messdurchläufe je Benchmark (nach einem Aufwärmdurchlauf).
+QUERY_POINTS = 200  # Ballpositionen je Durchlauf.
+APPLY_SAMPLE = 50  # Formationen je Durchlauf von apply_defensive_formation.
+REGRESSION_THRESHOLD = 1.25  # Median mehr als 25 % langsamer gilt als Regression.
+
+
+def measure(name, size, func, inputs, repeats):  # Misst einen Benchmark.
+    """Ruft func(*args) für alle Eingaben auf (ein Aufwärm- und repeats Messdurchläufe) und fasst die Zeit pro Aufruf zusammen."""
+    for args in inputs:  # Aufwärmdurchlauf (Caches, Lazy-Imports).
+        func(*args)
+    per_call = []  # Zeit pro Aufruf je Durchlauf in Mikrosekunden.
+    for _ in range(repeats):  # Messdurchläufe.
+        start = time.perf_counter()
+        for args in inputs:
+            func(*args)
+        per_call.append((time.perf_counter() - start) / len(inputs) * 1e6)
+    per_call.sort()
+    return {
+        "name": name,
+        "size": size,
+        "calls": len(inputs),
+        "repeats": repeats,
+        "median_us": round(statistics.median(per_call), 3),
+        "min_us": round(per_call[0], 3),
+        "p95_us": round(per_call[min(len(per_call) - 1, round(0.95 * (len(per_call) - 1)))], 3),
+        "mean_us": round(statistics.fmean(per_call), 3),
+    }
+
+
+def headless_window():  # Baut das Hauptfenster für Messungen auf.
+    """Gibt (QApplication, Hauptfenster, Speicher) zurück: Fenster ohne Event-Loop auf einem leeren temporären JSON-Speicher."""
+    from PySide6.QtWidgets import QApplication  # Erst hier, damit --help ohne Qt funktioniert.
+    import main as app_main  # Hauptfenster und Ziehpfad.
+    from storage import JsonStore, WriteBehind  # JSON-Speicher.
+
+    app = QApplication.instance() or QApplication([])  # Qt-Anwendung (ohne Event-Loop).
+    directory = tempfile.mkdtemp(prefix="vsm-bench-")  # Temporäre Speicherdateien.
+    store = JsonStore(os.path.join(directory, "formations.json"), os.path.join(directory, "teams.json"),
+                      WriteBehind(delay=0))  # Leerer Speicher, der beim flush() sofort schreibt.
+    with contextlib.redirect_stdout(io.StringIO()):  # Debug-Ausgaben beim Aufbau unterdrücken.
+        window = app_main.build_main_window(store)  # Hauptfenster ohne Event-Loop.
+    return app, window, store
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeats=DEFAULT_REPEATS, seed=0):  # Führt alle Benchmarks aus.
+    """Baut das Hauptfenster ohne Event-Loop auf einem temporären JSON-Speicher auf und misst alle Pfade."""
+    import main as app_main  # Ziehpfad (apply_defensive_formation).
+    from storage import JsonStore  # JSON-Speicher.
+    from startup_loader import StartupLoader  # Laden beim Start.
+    from PySide6.QtGui import QImage, QPainter  # Zeichnen der Szene in ein Bild.
+
+    app, window, store = headless_window()  # Hauptfenster und Speicher.
+    formations_path, teams_path, writer = store.formations_path, store.teams_path, store.writer  # Für frische Speicher beim Laden.
+    results = []  # Ergebnisse.
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Debug-Ausgaben der Anwendung nicht in die Ergebnisse mischen.
+        rng = random.Random(seed)  # Reproduzierbare Ballpositionen.
+        boundary = window.ball.movement_boundary  # Bewegungsbereich des Balls.
+        points = [(rng.uniform(boundary.left(), boundary.right()), rng.uniform(boundary.top(), boundary.bottom()))
+                  for _ in range(QUERY_POINTS)]  # Ballpositionen.
+
+        # Größenunabhängig: Angriffssektor, Blockschatten, Anwenden einer Formation
+        results.append(measure("AttackSector.update_path", None, window.attack_sector.updatePosition, points, repeats))
+        player = window.players[0]  # Spieler am Netz, damit der Schatten berechnet wird.
+        dims = player.court_dims  # Spielfeldmaße.
+        player.setPos(dims.width / 2, dims.net_y - player.rect().height() / 2)  # Mittelpunkt auf der Netzlinie.
+        results.append(measure("PlayerItem.updateShadow", None, player.updateShadow, points, repeats))
+        sample = make_formations(APPLY_SAMPLE, seed)  # Formationen zum Anwenden.
+        formations = [((f["ball"][0], f["ball"][1]), [tuple(o) for o in f["offsets"]], f["zones"]) for f in sample]
+        results.append(measure("apply_defensive_formation", None, app_main.apply_defensive_formation,
+                               [(f,) for f in formations], repeats))
+
+        for size in sizes:  # Je Bibliotheksgröße.
+            library = make_formations(size, seed)  # Synthetische Bibliothek.
+            window.def_panel.set_formations(library)  # Wie nach dem Laden: Marker, Triangulation und Einrast-Index.
+            results.append(measure("update_interpolation_data", size, window.update_interpolation_data, [()], repeats))
+            engine = window.interpolation_engine  # Engine mit der Bibliothek.
+            results.append(measure("InterpolationEngine.query", size, engine.query, [(p,) for p in points], repeats))
+            results.append(measure("interpolate_player_positions", size, window.interpolate_player_positions, points, repeats))
+            snap_points = []  # Abwechselnd nahe einer Formation und zufällig.
+            for i, point in enumerate(points):
+                bx, by = library[i % size]["ball"]
+                snap_points += [(bx + 1.0, by - 1.0), point]
+            results.append(measure("snap_to_formation", size, window.snap_to_formation, snap_points, repeats))
+            image = QImage(int(window.scene.width()), int(window.scene.height()), QImage.Format.Format_ARGB32)  # Ziel für das Neuzeichnen.
+
+            def render():  # Zeichnet die ganze Szene (Spielfeld, Marker, Ball, Spieler) einmal.
+                painter = QPainter(image)
+                window.scene.render(painter)
+                painter.end()
+            results.append(measure("QGraphicsScene.render", size, render, [()], repeats))
+
+            store.replace_formations(library)  # Datei für den Lade-Benchmark.
+            store.flush()
+            results.append(measure("JsonStore.load_formations", size,
+                                   lambda: JsonStore(formations_path, teams_path, writer).load_formations(), [()], repeats))
+            results.append(measure("StartupLoader.load", size,
+                                   lambda: StartupLoader(JsonStore(formations_path, teams_path, writer), app_main.SNAP_RADIUS).load(),
+                                   [()], repeats))  # Laden beim Start: Dateien, Triangulation, Einrast-Index.
+
+            def save():  # Speichert die komplette Liste und schreibt sie sofort.
+                store.replace_formations(library)
+                store.flush()
+            results.append(measure("JsonStore.save", size, save, [()], repeats))
+
+    app.processEvents()  # Verarbeitet ausstehende Ereignisse vor dem Beenden.
+    return results  # Gibt die Ergebnisse zurück.
+
+
+def metadata(**params):  # Metadaten für den Vergleich von Läufen.
+    """Commit, Zeitpunkt und Versionen, ergänzt um die Parameter des Laufs."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):  # Kein git oder kein Repository.
+        commit = None
+    import numpy
+    import PySide6
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pyside6": PySide6.__version__,
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        **params,
+    }
+
+
+def compare(results, baseline, threshold):  # Vergleicht die Mediane mit einem früheren Lauf.
+    """Gibt die Vergleichszeilen und die Anzahl der Regressionen zurück."""
+    previous = {(r["name"], r["size"]): r for r in baseline["results"]}  # Frühere Ergebnisse.
+    lines, regressions = [], 0
+    for result in results:
+        old = previous.get((result["name"], result["size"]))
+        if old is None or not old["median_us"]:  # Neue Messung.
+            continue
+        ratio = result["median_us"] / old["median_us"]  # Verhältnis neu/alt.
+        flag = "REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        lines.append("%-30s %6s %12.1f %12.1f %7.2fx %s" % (result["name"], result["size"] or "-", old["median_us"],
+                                                           result["median_us"], ratio, flag))
+    return lines, regressions
+
+
+def main(argv=None):  # Kommandozeile.
+    parser = argparse.ArgumentParser(description="Headless-Benchmarks für Ziehpfad und Speicher.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Bibliotheksgrößen, z.B. 10,100,1000")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Messdurchläufe je Benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert der synthetischen Daten")
+    parser.add_argument("--output", help="Ergebnis-JSON in diese Datei statt auf stdout schreiben")
+    parser.add_argument("--compare", help="früheres Ergebnis-JSON zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Faktor, ab dem ein Median als Regression gilt")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    results = run_benchmarks(sizes, args.repeats, args.seed)  # Führt die Benchmarks aus.
+    report = {"meta": metadata(sizes=sizes, repeats=args.repeats, seed=args.seed), "results": results}  # Maschinenlesbares Ergebnis.
+    text = json.dumps(report, indent=2)
+    if args.output:  # In eine Datei.
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:  # Auf stdout.
+        print(text)
+
+    print("%-30s %6s %12s %12s %12s" % ("benchmark", "size", "median_us", "min_us", "p95_us"), file=sys.stderr)  # Übersicht.
+    for r in results:
+        print("%-30s %6s %12.1f %12.1f %12.1f" % (r["name"], r["size"] or "-", r["median_us"], r["min_us"], r["p95_us"]), file=sys.stderr)
+
+    if args.compare:  # Vergleich mit einem früheren Lauf.
+        with open(args.compare, encoding="utf-8") as f:
+            lines, regressions = compare(results, json.load(f), args.threshold)
+        print("\n%-30s %6s %12s %12s %8s" % ("benchmark", "size", "before_us", "after_us", "ratio"), file=sys.stderr)
+        for line in lines:
+            print(line, file=sys.stderr)
+        if regressions:  # Mindestens eine Regression.
+            print("%d Regression(en) über Faktor %.2f" % (regressions, args.threshold), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
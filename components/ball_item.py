@@ -1,17 +1,25 @@
-from PySide6.QtCore import QPointF, QRectF, Signal, QObject # Importiert notwendige Klassen von PySide6.QtCore
+import time # Importiert time für die Zeitmessung (ProfiledBallItem)
+from PySide6.QtCore import QPointF, QRectF, Signal, QObject, QTimer # Importiert notwendige Klassen von PySide6.QtCore
 from PySide6.QtWidgets import QGraphicsObject # Importiert QGraphicsObject von PySide6.QtWidgets
-from PySide6.QtGui import QBrush, QPen, QColor, QPainter # Importiert notwendige Klassen von PySide6.QtGui
+from PySide6.QtGui import QBrush, QPen, QColor, QPainter, QGuiApplication # Importiert notwendige Klassen von PySide6.QtGui
 from PySide6.QtCore import Qt # Importiert Qt von PySide6.QtCore
 
 # Verwendung absoluten Imports
 from utils import CourtDimensions # Importiert CourtDimensions von utils
 from volleyball_field import players # Importiert die Spielerliste vom Volleyballfeld
+from sectors.block_shadow import update_shadows # Importiert die gemeinsame Blockschatten-Berechnung
+
+# Aktualisierungsmodi beim Ziehen des Balls
+DRAG_IMMEDIATE = "immediate" # Jede Mausbewegung aktualisiert sofort alle abhängigen Objekte
+DRAG_COALESCED = "coalesced" # Mausbewegungen werden gesammelt und einmal pro Bild verarbeitet
+DEFAULT_FRAME_RATE = 60 # Bildrate, falls der Bildschirm keine liefert
 
 class BallItem(QGraphicsObject): # Definiert die Klasse BallItem, die von QGraphicsObject erbt
     """Repräsentiert den Ball auf dem Volleyballfeld als interaktives Grafikobjekt"""
     positionChanged = Signal(float, float) # Signal, das bei Positionsänderung des Balls ausgesendet wird
+    recorder = None # SessionRecorder für Mitschnitte (VSM_RECORD), sonst None
     
-    def __init__(self, rect, label="", court_dimensions=None, parent=None): # Konstruktor der Klasse
+    def __init__(self, rect, label="", court_dimensions=None, parent=None, drag_mode=DRAG_COALESCED): # Konstruktor der Klasse
         """
         Initialisiert den Ball mit einer bestimmten Größe und Position
         
@@ -20,6 +28,7 @@ class BallItem(QGraphicsObject): # Definiert die Klasse BallItem, die von QGraph
             label: Optionaler Text für den Ball (meist nicht verwendet)
             court_dimensions: Spielfeldmaße oder None für Standardmaße
             parent: Übergeordnetes Qt-Element
+            drag_mode: DRAG_COALESCED (einmal pro Bild) oder DRAG_IMMEDIATE (bei jeder Mausbewegung)
         """
         super().__init__(parent) # Ruft den Konstruktor der Basisklasse auf
         self._rect = rect # Speichert das Rechteck des Balls
@@ -34,6 +43,15 @@ class BallItem(QGraphicsObject): # Definiert die Klasse BallItem, die von QGraph
         # Aussehen des Balls
         self._brush = QBrush(QColor("yellow")) # Setzt die Füllfarbe des Balls auf Gelb
         self._pen = QPen(QColor("black"), 2) # Setzt den Stift für den Rand des Balls auf Schwarz mit einer Dicke von 2
+        # Zusammenfassen von Mausbewegungen: nur die neueste Position wird pro Bild verarbeitet
+        self.drag_mode = drag_mode # Aktualisierungsmodus beim Ziehen
+        self._drag_pending = False # Liegt eine noch nicht verarbeitete Position vor?
+        self._frame_timer = QTimer(self) # Taktgeber für die Aktualisierung pro Bild
+        self._frame_timer.setSingleShot(True) # Läuft nur, solange Positionen anstehen
+        self._frame_timer.setTimerType(Qt.TimerType.PreciseTimer) # Genauer Takt für flüssiges Ziehen
+        self._frame_timer.timeout.connect(self.flush_position) # Verarbeitet die neueste Position
+        self.drag_events = 0 # Anzahl der Mausbewegungen, die den Ball verschoben haben
+        self.drag_updates = 0 # Anzahl der tatsächlich ausgeführten Aktualisierungen
     
     def boundingRect(self): # Methode zur Rückgabe des Begrenzungsrechtecks
         """
@@ -123,8 +141,87 @@ class BallItem(QGraphicsObject): # Definiert die Klasse BallItem, die von QGraph
             if new_x != pos.x() or new_y != pos.y(): # Wenn sich die Position geändert hat, um innerhalb der Grenzen zu bleiben
                 self.setPos(new_x, new_y) # Setzt die neue Position
         if old_pos != self.pos():   # wenn alte und neue Position unterschiedlich sind, wird die Position des Balls aktualisiert
-            ball_center = self.scenePos() + QPointF(self._rect.width()/2, self._rect.height()/2) # Berechnet die Mittelpunktkoordinaten des Balls in der Szene
-            self.update_sector_position() # Aktualisiert die Position des Angriffssektors
-            for player in players: # Iteriert über alle Spieler
-                player.updateShadow(ball_center.x(), ball_center.y()) # Aktualisiert den Schatten jedes Spielers basierend auf der Ballposition
-            self.positionChanged.emit(ball_center.x(), ball_center.y()) # Sendet das Signal für die Positionsänderung mit den neuen Koordinaten 
\ No newline at end of file
+            if self.recorder is not None: # Mitschnitt aktiv
+                self.recorder.ball_moved(self.pos()) # Zeichnet die neue Position auf
+            self.drag_moved() # Aktualisiert sofort oder beim nächsten Bild
+    
+    def drag_moved(self): # Methode zur Verarbeitung einer neuen Position beim Ziehen
+        """
+        Merkt die aktuelle Position zur Aktualisierung vor: sofort (DRAG_IMMEDIATE) oder beim
+        nächsten Bild (DRAG_COALESCED). Wird auch vom Wiedergabe-Werkzeug aufgerufen.
+        """
+        self.drag_events += 1 # Zählt die Mausbewegung
+        self._drag_pending = True # Merkt die neue Position vor
+        if self.drag_mode == DRAG_IMMEDIATE: # Sofortige Aktualisierung
+            self.flush_position() # Aktualisiert alle abhängigen Objekte
+        elif not self._frame_timer.isActive(): # Erste Bewegung seit dem letzten Bild
+            self._frame_timer.start(self._frame_interval()) # Aktualisiert beim nächsten Bild
+    
+    def mouseReleaseEvent(self, event): # Methode zur Behandlung des Loslassens
+        super().mouseReleaseEvent(event) # Ruft die Methode der Basisklasse auf
+        if self.recorder is not None and self.drag_events: # Mitschnitt aktiv und es wurde gezogen
+            self.recorder.ball_released() # Zeichnet das Loslassen auf
+        self.end_drag() # Schließt den Drag ab
+    
+    def end_drag(self): # Methode zum Abschluss eines Drags
+        """Verarbeitet eine noch ausstehende Position sofort und setzt die Zähler zurück"""
+        self.flush_position() # Verarbeitet eine noch ausstehende Position sofort
+        self.drag_events = 0 # Setzt die Zähler für den nächsten Drag zurück
+        self.drag_updates = 0
+    
+    def coalesced_events(self): # Methode zur Abfrage der zusammengefassten Bewegungen
+        """Anzahl der Mausbewegungen im aktuellen Drag, die ohne eigene Aktualisierung verworfen wurden"""
+        return self.drag_events - self.drag_updates - (1 if self._drag_pending else 0) # Ausstehende Position zählt noch nicht
+    
+    def flush_position(self): # Methode zur Verarbeitung der neuesten Position
+        """
+        Aktualisiert Angriffssektor, Spieler (über positionChanged) und Schatten für die aktuelle
+        Ballposition, falls seit der letzten Aktualisierung eine neue Position vorliegt.
+        """
+        if not self._drag_pending: # Keine neue Position
+            return # Beendet die Methode
+        self._drag_pending = False # Position wird jetzt verarbeitet
+        self._frame_timer.stop() # Kein weiterer Takt nötig
+        self.drag_updates += 1 # Zählt die Aktualisierung
+        ball_center = self.scenePos() + QPointF(self._rect.width()/2, self._rect.height()/2) # Berechnet die Mittelpunktkoordinaten des Balls in der Szene
+        self.update_sector_position() # Aktualisiert die Position des Angriffssektors
+        self.positionChanged.emit(ball_center.x(), ball_center.y()) # Sendet das Signal für die Positionsänderung mit den neuen Koordinaten
+        # Schatten erst nach dem Verschieben der Spieler: bereits aktualisierte Schatten werden übersprungen
+        self.update_player_shadows(ball_center.x(), ball_center.y()) # Aktualisiert die Schatten aller Spieler in einem Durchlauf
+    
+    def update_player_shadows(self, x, y): # Methode zur Aktualisierung der Spielerschatten
+        """Aktualisiert die Blockschatten aller Spieler für die Ballposition (x, y)"""
+        update_shadows(players, x, y) # Gemeinsame Berechnung, siehe sectors/block_shadow.py
+    
+    def _frame_interval(self): # Private Methode: Dauer eines Bildes in Millisekunden
+        screen = QGuiApplication.primaryScreen() # Hauptbildschirm
+        rate = screen.refreshRate() if screen else 0 # Bildwiederholrate des Bildschirms
+        return max(1, int(1000 / (rate if rate > 0 else DEFAULT_FRAME_RATE))) # Millisekunden pro Bild 
+
+
+class ProfiledBallItem(BallItem): # Definiert einen Ball mit Zeitmessung pro Bild (nur bei VSM_PROFILE=1)
+    """
+    BallItem, das Mausbewegungen und jede Aktualisierung (ein Bild) an einen FrameProfiler meldet.
+
+    Wird nur bei aktivierter Zeitmessung statt BallItem erzeugt, damit der normale Ziehpfad
+    unverändert bleibt.
+    """
+    def __init__(self, rect, profiler, **kwargs): # Konstruktor der Klasse
+        super().__init__(rect, **kwargs) # Ruft den Konstruktor der Basisklasse auf
+        self.profiler = profiler # Speichert den FrameProfiler
+        self.update_sector_position = profiler.wrap("sector", self.update_sector_position) # Misst den Angriffssektor
+        self.update_player_shadows = profiler.wrap("shadows", self.update_player_shadows) # Misst die Schatten
+
+    def mouseMoveEvent(self, event): # Methode zur Behandlung von Mausbewegungen
+        start = time.perf_counter() # Beginn der Verarbeitung
+        super().mouseMoveEvent(event) # Ruft die Methode der Basisklasse auf
+        self.profiler.record_event(start, time.perf_counter() - start) # Meldet die Mausbewegung
+
+    def flush_position(self): # Methode zur Verarbeitung der neuesten Position
+        if not self._drag_pending: # Keine neue Position, kein Bild
+            return # Beendet die Methode
+        self.profiler.begin_frame() # Beginnt ein Bild
+        try:
+            super().flush_position() # Aktualisiert Sektor, Spieler und Schatten
+        finally:
+            self.profiler.end_frame() # Schließt das Bild ab
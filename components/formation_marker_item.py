@@ -1,32 +1,108 @@
-from PySide6.QtWidgets import QGraphicsEllipseItem
-from PySide6.QtGui import QBrush, QPen, QColor
-from PySide6.QtCore import Qt, QRectF
-
-class FormationMarkerItem(QGraphicsEllipseItem):
-    """Ein kleiner kreisförmiger Marker, der gespeicherte Ballpositionen auf dem Spielfeld anzeigt."""
-    
-    def __init__(self, ball_pos, formation_index, radius=3):  
+import numpy as np  # Importiert NumPy für das Array der Positionen
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsEllipseItem  # Importiert die Grafik-Items von PySide6.QtWidgets
+from PySide6.QtGui import QBrush, QPen, QColor, QPainterPath  # Importiert Pinsel, Stift, Farbe und Pfad von PySide6.QtGui
+from PySide6.QtCore import Qt, QRectF, QPointF  # Importiert Qt-Konstanten, Rechteck und Punkt von PySide6.QtCore
+
+class FormationMarkersItem(QGraphicsItem):  # Definiert eine Klasse für alle Formationsmarker
+    """
+    Ein einziges Item, das die kleinen kreisförmigen Marker aller gespeicherten Ballpositionen zeichnet.
+
+    Die Positionen liegen in einem NumPy-Array (N x 2). paint() zeichnet alle Marker mit einem
+    einzigen drawPath; der Pfad wird nur nach Änderungen neu aufgebaut, und das Ergebnis liegt im
+    Cache des Items (DeviceCoordinateCache), sodass Ball und Spieler beim Ziehen über den Markern
+    nur ein Bild kopieren. Einfügen, Löschen und Verschieben ändern nur das Array; die hervorgehobene
+    (ausgewählte bzw. eingerastete) Formation ist ein eigenes Kind-Item und verwirft den Cache nicht.
+    """
+
+    def __init__(self, radius=3, parent=None):  # Konstruktor der Klasse
         """
-        Erstellt einen Marker an der Ballposition.
-        
         Parameter:
-            ball_pos: Tupel (x, y) mit den Ballkoordinaten
-            formation_index: Index der Formation in der Liste
-            radius: Radius des Markers in Pixel
+            radius: Radius eines Markers in Pixel
+            parent: Übergeordnetes Grafik-Item
         """
-        diameter = radius * 2   # Durchmesser des Markers
-        super().__init__(-radius, -radius, diameter, diameter) # Erstellt einen Kreis mit dem Durchmesser
-        
-        self.formation_index = formation_index 
-        self.setPos(ball_pos[0], ball_pos[1]) # Setzt die Position des Markers auf die Ballposition
-        
-      
-        self.setBrush(QBrush(Qt.BrushStyle.NoBrush))  # Erstellt einen QBrush ohne Füllung
-        self.setPen(QPen(QColor("red"), 1))          # Setzt einen roten Rand mit Dicke 1
-        
+        super().__init__(parent)  # Ruft den Konstruktor der Basisklasse auf
+        self.radius = radius  # Radius eines Markers
+        self.points = np.empty((0, 2))  # Ballpositionen (x, y) in der Reihenfolge der Formationen
+        self.highlighted = None  # Index der hervorgehobenen Formation oder None
+        self.pen = QPen(QColor("red"), 1)  # Roter Rand mit Dicke 1, ohne Füllung
+        self._path = None  # Pfad aller Marker (None = neu aufbauen)
+        self._rect = QRectF()  # Umgebendes Rechteck aller Marker
+
         # Verwendet einen niedrigeren Z-Wert als der Ball, aber höher als das Spielfeld
-        self.setZValue(100) # Setzt den Z-Wert für die Stapelreihenfolge
-        
-        # Macht den Marker nicht interaktiv, man kann nichts mit ihm machen 
-        self.setFlag(QGraphicsEllipseItem.GraphicsItemFlag.ItemIsSelectable, False) # Deaktiviert die Auswählbarkeit des Markers
-        self.setFlag(QGraphicsEllipseItem.GraphicsItemFlag.ItemIsMovable, False) # Deaktiviert die Beweglichkeit des Markers
+        self.setZValue(100)  # Z-Wert 100
+        # Macht die Marker nicht interaktiv, Mausklicks gehen an die Objekte darunter
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)  # Keine Maustasten annehmen
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)  # Zeichnet nur nach Änderungen neu
+
+        # Hervorhebung der ausgewählten Formation (eigenes Item, damit der Cache erhalten bleibt)
+        r = radius + 2  # Radius der Hervorhebung (etwas größer als ein Marker)
+        self.highlight = QGraphicsEllipseItem(-r, -r, 2 * r, 2 * r, self)  # Kreis um den Ursprung als Kind-Item
+        self.highlight.setPen(QPen(QColor("red"), 2))  # Roter Rand mit Dicke 2
+        self.highlight.setBrush(QBrush(QColor(255, 0, 0, 120)))  # Halbtransparente rote Füllung
+        self.highlight.hide()  # Zu Beginn ist nichts hervorgehoben
+
+    def __len__(self):  # Anzahl der Marker
+        return len(self.points)  # Gibt die Anzahl der Zeilen des Arrays zurück
+
+    def _changed(self):  # Umgebendes Rechteck neu berechnen und Pfad verwerfen
+        self.prepareGeometryChange()  # Kündigt die Änderung des umgebenden Rechtecks an
+        if len(self.points):  # Mindestens ein Marker vorhanden
+            margin = self.radius + self.pen.widthF()  # Rand für Radius und Stiftbreite
+            (x0, y0), (x1, y1) = self.points.min(axis=0), self.points.max(axis=0)  # Kleinste und größte Koordinaten
+            self._rect = QRectF(x0 - margin, y0 - margin, x1 - x0 + 2 * margin, y1 - y0 + 2 * margin)  # Rechteck um alle Marker mit Rand
+        else:  # Keine Marker
+            self._rect = QRectF()  # Leeres Rechteck
+        self._path = None  # Pfad beim nächsten Zeichnen neu aufbauen
+        self.update()  # Fordert ein Neuzeichnen an
+
+    def set_positions(self, positions):  # Methode zum Setzen aller Positionen
+        """Ersetzt alle Marker durch die Ballpositionen positions ([(x, y), ...])."""
+        self.points = np.array(positions, dtype=float).reshape(-1, 2)  # Kopiert die Positionen in ein (N x 2)-Array
+        self._changed()  # Rechteck und Pfad aktualisieren
+        self.set_highlight(self.highlighted)  # Hervorhebung prüfen und neu platzieren
+
+    def insert(self, index, pos):  # Methode zum Einfügen eines Markers
+        """Fügt einen Marker für die Formation an Position index ein."""
+        self.points = np.insert(self.points, index, pos, axis=0)  # Fügt die Zeile im Array ein
+        self._changed()  # Rechteck und Pfad aktualisieren
+        if self.highlighted is not None and self.highlighted >= index:  # Hervorhebung rückt nach hinten
+            self.highlighted += 1  # Verschiebt den Index um eins
+        self.set_highlight(self.highlighted)  # Hervorhebung neu platzieren
+
+    def remove(self, index):  # Methode zum Entfernen eines Markers
+        """Entfernt den Marker der Formation an Position index."""
+        self.points = np.delete(self.points, index, axis=0)  # Löscht die Zeile aus dem Array
+        self._changed()  # Rechteck und Pfad aktualisieren
+        if self.highlighted == index:  # Hervorgehobene Formation gelöscht
+            self.highlighted = None  # Keine Hervorhebung mehr
+        elif self.highlighted is not None and self.highlighted > index:  # Hervorhebung rückt nach vorn
+            self.highlighted -= 1  # Verschiebt den Index um eins
+        self.set_highlight(self.highlighted)  # Hervorhebung neu platzieren
+
+    def move(self, index, pos):  # Methode zum Verschieben eines Markers
+        """Verschiebt den Marker der Formation an Position index."""
+        self.points[index] = pos  # Überschreibt die Position im Array
+        self._changed()  # Rechteck und Pfad aktualisieren
+        self.set_highlight(self.highlighted)  # Hervorhebung neu platzieren
+
+    def set_highlight(self, index):  # Methode zum Hervorheben eines Markers
+        """Hebt den Marker der Formation index hervor (None = keinen)."""
+        if index is None or not 0 <= index < len(self.points):  # Kein oder ungültiger Index
+            self.highlighted = None  # Keine Hervorhebung
+            self.highlight.hide()  # Blendet die Hervorhebung aus
+            return  # Beendet die Methode
+        self.highlighted = index  # Merkt sich den Index
+        self.highlight.setPos(*self.points[index])  # Setzt die Hervorhebung auf die Ballposition
+        self.highlight.show()  # Blendet die Hervorhebung ein
+
+    def boundingRect(self):  # Gibt das umgebende Rechteck an
+        return self._rect  # Gibt das zwischengespeicherte Rechteck zurück
+
+    def paint(self, painter, option, widget=None):  # Zeichnet alle Marker
+        if self._path is None:  # Pfad nach einer Änderung einmal neu aufbauen
+            self._path = QPainterPath()  # Leerer Pfad
+            for x, y in self.points.tolist():  # Für jede Ballposition
+                self._path.addEllipse(QPointF(x, y), self.radius, self.radius)  # Fügt einen Kreis mit dem Markerradius hinzu
+        painter.setPen(self.pen)  # Setzt den roten Stift
+        painter.setBrush(Qt.BrushStyle.NoBrush)  # Ohne Füllung
+        painter.drawPath(self._path)  # Alle Marker in einem Aufruf
@@ -1,11 +1,11 @@
-import math # Importiert das Modul math für mathematische Operationen
 from PySide6.QtWidgets import QGraphicsPathItem, QGraphicsTextItem, QGraphicsRectItem, QMenu, QColorDialog # Importiert notwendige Klassen von PySide6.QtWidgets
-from PySide6.QtGui import QBrush, QColor, QPen, QPainterPath, QRadialGradient # Importiert notwendige Klassen von PySide6.QtGui
+from PySide6.QtGui import QBrush, QColor, QPen, QPainterPath # Importiert notwendige Klassen von PySide6.QtGui
 from PySide6.QtCore import QRectF, Qt, QPointF # Importiert notwendige Klassen von PySide6.QtCore
 from player_editor import PlayerEditorDialog  # Importiert den Dialog zur Spielerbearbeitung
 
 # Use absolute imports instead of relative
 from utils import DraggableEllipse, CourtDimensions # Importiert DraggableEllipse und CourtDimensions von utils
+from sectors.block_shadow import update_shadows, new_shadow_gradient # Importiert die gemeinsame Blockschatten-Berechnung
 
 class ZoneItem(QGraphicsRectItem): # Definiert die Klasse ZoneItem, die von QGraphicsRectItem erbt
     """
@@ -19,16 +19,25 @@ class ZoneItem(QGraphicsRectItem): # Definiert die Klasse ZoneItem, die von QGra
         self.setAcceptedMouseButtons(Qt.MouseButton.NoButton) # Akzeptiert keine Mausklicks direkt
         self.player_item = player_item # Speichert das zugehörige Spieleritem
         self.panel = panel # Speichert das Panel, zu dem die Zone gehört
-        self.color = color # Speichert die Farbe der Zone
         # Zeichne Zone über dem Feld (z=1)
         self.setZValue(100) # Setzt den Z-Wert für die Stapelreihenfolge
         # Kein Rahmen, nur Füllung
         self.setPen(QPen(Qt.PenStyle.NoPen)) # Kein Rand für die Zone
+        self.setColor(color) # Setzt Farbe und Füllung der Zone
+
+    def setColor(self, color): # Methode zum Setzen der Zonenfarbe
+        self.color = color # Speichert die Farbe der Zone
         c = QColor(color) # Erstellt ein QColor-Objekt
         # Halbe Transparenz erzwingen
         semi_alpha = max(1, color.alpha() // 2) # Berechnet die halbe Transparenz
         c.setAlpha(semi_alpha) # Setzt die Transparenz der Farbe
         self.setBrush(QBrush(c)) # Setzt die Füllung der Zone
+
+    def setZone(self, rect, panel, color): # Methode zur Wiederverwendung einer Zone aus dem Pool
+        """Belegt ein vorhandenes ZoneItem mit neuen Daten, statt ein neues zu erzeugen."""
+        self.setRect(rect) # Setzt das Rechteck der Zone
+        self.panel = panel # Speichert das Panel, zu dem die Zone gehört
+        self.setColor(color) # Setzt Farbe und Füllung der Zone
 #
     def mousePressEvent(self, event): # Methode zur Behandlung von Mausklicks
         # Klick auf den Spieler durchreichen, wenn Zone darüber liegt
@@ -53,17 +62,12 @@ class ZoneItem(QGraphicsRectItem): # Definiert die Klasse ZoneItem, die von QGra
                         [r.x(), r.y(), r.width(), r.height()], # Übergibt die Dimensionen der Zone
                         [c.red(), c.green(), c.blue(), c.alpha()] # Übergibt die Farbwerte der Zone
                     )
-                if self.scene(): # Prüft, ob die Zone einer Szene hinzugefügt wurde
-                    self.scene().removeItem(self) # Entfernt die Zone aus der Szene
+                self.player_item.releaseZone(self) # Blendet die Zone aus und legt sie in den Pool zurück
             elif action == edit_zone: # Wenn die Aktion "Zone bearbeiten" war
                 color = QColorDialog.getColor(self.color) # Öffnet einen Farbauswahldialog
                 if color.isValid(): # Prüft, ob eine gültige Farbe ausgewählt wurde
-                    self.color = color # Speichert die neue Farbe
-                    c = QColor(color) # Erstellt ein QColor-Objekt mit der neuen Farbe
                     # Halbe Transparenz auch nach Farbänderung
-                    semi_alpha = max(1, color.alpha() // 2) # Berechnet die halbe Transparenz
-                    c.setAlpha(semi_alpha) # Setzt die Transparenz der Farbe
-                    self.setBrush(QBrush(c)) # Setzt die Füllung der Zone mit der neuen Farbe
+                    self.setColor(color) # Setzt die neue Farbe und Füllung der Zone
                     if self.panel and hasattr(self.panel, 'update_zone'): # Prüft, ob das Panel existiert und die Methode update_zone hat
                         r = self.rect() # Holt das Rechteck der Zone
                         self.panel.update_zone( # Ruft die Methode zum Aktualisieren der Zone im Panel auf
@@ -84,6 +88,8 @@ class ZoneItem(QGraphicsRectItem): # Definiert die Klasse ZoneItem, die von QGra
         event.ignore() # Ignoriert das Event
 
 class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von DraggableEllipse erbt
+    recorder = None # SessionRecorder für Mitschnitte (VSM_RECORD), sonst None
+
     def __init__(self, rect, label="", ball=None, court_dims=None, name_label=None, player_index=None, zone_update_callback=None): # Konstruktor der Klasse
         super().__init__(rect, label) # Ruft den Konstruktor der Basisklasse auf
         # Setze einen sehr hohen Z-Wert für den Spieler selbst
@@ -104,6 +110,9 @@ class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von D
         # Setzt den Blockschatten-Pinsel auf Grau
         self.shadow.setBrush(QBrush(QColor(128, 128, 128, 128))) # Setzt die Füllfarbe des Schattens
         self.shadow.setPen(QPen(Qt.PenStyle.NoPen)) # Kein Rand für den Schatten
+        self.shadow_path = QPainterPath() # Wiederverwendeter Pfad des Schattens
+        self.shadow_gradient = new_shadow_gradient() # Wiederverwendeter Farbverlauf des Schattens
+        self.shadow_state = None # Ball- und Spielerposition der letzten Schattenberechnung
         
         self.label = label  # Speichert das Label des Spielers (z.B. Position)
         # Wenn kein eigener Name übergeben wurde, nehme das Positions-Label als Standard (MB)
@@ -126,6 +135,7 @@ class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von D
         self.zone_update_callback = zone_update_callback  # Speichert die Callback-Funktion für Zonenaktualisierungen
         # Mehrfach-Zonen pro Spieler
         self.zones_items = []  # Initialisiert eine Liste für Zonenitems
+        self.zone_pool = []  # Ausgeblendete Zonenitems zur Wiederverwendung
         # Annahmezone-Attribute initialisieren
         self.zone_definition_active = False # Flag, ob die Zonendefinition aktiv ist
         self.zone_start = None # Startpunkt der Zonendefinition
@@ -133,51 +143,8 @@ class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von D
         # Scene-View übernimmt die Zone-Zeichnung
             
     def updateShadow(self, ball_x, ball_y): # Methode zur Aktualisierung des Blockschattens
-        player_center = self.scenePos() + self.rect().center() # Berechnet die Mittelpunktkoordinaten des Spielers
-        # Zeigt den Blockschatten nur, wenn der Spieler innerhalb von 1 Meter zum Netz ist
-        if abs(player_center.y() - self.court_dims.net_y) > self.court_dims.scale: # Prüft die Distanz zum Netz
-            self.shadow.setPath(QPainterPath())  # Entfernt Blockschatten, wenn weiter als 1 Meter entfernt
-            return # Beendet die Methode
-        dx = player_center.x() - ball_x # Differenz der X-Koordinaten von Spieler und Ball
-        dy = player_center.y() - ball_y # Differenz der Y-Koordinaten von Spieler und Ball
-        d = math.hypot(dx, dy) # Berechnet die Distanz zwischen Spieler und Ball
-        if d == 0: # Wenn die Distanz Null ist (Ball auf Spieler)
-            return # Beendet die Methode
-            
-        # Spieler-Radius
-        R = self.rect().width() / 2 # Berechnet den Radius des Spielers
-        
-        # Prüft ob der Blockschatten angezeigt werden soll
-        if d + 2*R > 150: # Wenn die Distanz plus zweimal der Radius größer als 150 ist (heuristischer Wert)
-            self.shadow.setPath(QPainterPath()) # Entfernt den Schatten
-        else: # Andernfalls wird der Schatten berechnet und gezeichnet
-            # Rest der Blockschatten-Berechnung
-            theta = math.atan2(dy, dx) # Winkel zwischen Spieler und Ball
-            alpha = math.asin(min(R/d, 1)) # Winkel des Tangentenabschnitts
-            left_angle = theta - alpha # Linker Winkel des Schattenbereichs
-            right_angle = theta + alpha # Rechter Winkel des Schattenbereichs
-            arc_radius = 250 # Radius des Schattenbogens
-            
-            path = QPainterPath() # Erstellt einen neuen Pfad für den Schatten
-            path.moveTo(ball_x, ball_y) # Bewegt den Startpunkt des Pfades zur Ballposition
-            rect_arc = QRectF(ball_x - arc_radius, ball_y - arc_radius, # Definiert das Rechteck für den Schattenbogen
-                             arc_radius * 2, arc_radius * 2)
-            start_angle_deg = -math.degrees(left_angle) # Startwinkel des Bogens in Grad
-            sweep_angle_deg = -math.degrees(right_angle - left_angle) # Ausdehnungswinkel des Bogens in Grad
-            path.arcTo(rect_arc, start_angle_deg, sweep_angle_deg) # Fügt den Bogen zum Pfad hinzu
-            path.lineTo(ball_x, ball_y) # Schließt den Pfad zur Ballposition
-            self.shadow.setPath(path) # Setzt den berechneten Pfad für das Schattenitem
-            
-            # Erstellt Farbverlauf für Blockschatten mit grauen Farben
-            gradient = QRadialGradient(QPointF(ball_x, ball_y), arc_radius) # Erstellt einen radialen Farbverlauf
-            gradient.setColorAt(0.0, QColor(128, 128, 128, 0)) # Setzt die Farbe am Startpunkt des Verlaufs (transparent)
-            fraction = d / arc_radius # Berechnet den Anteil der Distanz am Bogenradius
-            fraction = max(0, min(fraction, 1)) # Stellt sicher, dass der Anteil zwischen 0 und 1 liegt
-            gradient.setColorAt(fraction - 0.01, QColor(128, 128, 128, 0)) # Setzt eine transparente Farbe kurz vor der Distanz
-            gradient.setColorAt(fraction, QColor(128, 128, 128, 128)) # Setzt eine halbtransparente graue Farbe an der Distanz
-            gradient.setColorAt(0.9, QColor(128, 128, 128, 128)) # Setzt eine halbtransparente graue Farbe bei 90% des Radius
-            gradient.setColorAt(1.0, QColor(128, 128, 128, 0)) # Setzt die Farbe am Endpunkt des Verlaufs (transparent)
-            self.shadow.setBrush(QBrush(gradient)) # Setzt den Farbverlauf als Füllung für den Schatten
+        # Gemeinsame Berechnung mit den anderen Spielern, siehe sectors/block_shadow.py
+        update_shadows((self,), ball_x, ball_y) # Aktualisiert nur diesen Spieler (nichts, wenn unverändert)
     
     def mouseMoveEvent(self, event): # Methode zur Behandlung von Mausbewegungen
         # rechteck aktualisieren während Zone-Definition 
@@ -188,6 +155,12 @@ class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von D
             return # Beendet die Methode
         # Standard-Bewegung
         super().mouseMoveEvent(event) # Ruft die Methode der Basisklasse für die Standardbewegung auf
+        if self.recorder is not None: # Mitschnitt aktiv
+            self.recorder.player_moved(self.player_index, self.pos()) # Zeichnet die neue Position auf
+        self.update_after_move() # Aktualisiert Namens-Label und Schatten
+    
+    def update_after_move(self): # Methode zur Aktualisierung nach dem Verschieben des Spielers
+        """Zentriert das Namens-Label und aktualisiert den Blockschatten für die aktuelle Ballposition"""
         # Zentriere das untere Namens-Label nach Bewegung
         self.updateNameTextPosition() # Aktualisiert die Position des Namenstextes
         
@@ -250,13 +223,9 @@ class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von D
             if color.isValid() and self.zone_rect_item: # Prüft, ob eine gültige Farbe ausgewählt wurde und das temporäre Rechteck existiert
                 # ZoneItem anstelle des temporären Rechtecks erstellen
                 rect = self.zone_rect_item.rect() # Holt das Rechteck des temporären Items
-                panel = self.zone_update_callback.__self__ if hasattr(self.zone_update_callback, '__self__') else None # Holt das Panel von der Callback-Funktion
-                zone_item = ZoneItem(rect, self, panel, color) # Erstellt ein neues ZoneItem
-                self.scene().addItem(zone_item) # Fügt das ZoneItem zur Szene hinzu
-                self.zones_items.append(zone_item) # Fügt das ZoneItem zur Liste der Zonen des Spielers hinzu
-                # Panel speichern
-                if panel and hasattr(panel, 'update_zone'): # Prüft, ob das Panel existiert und die Methode update_zone hat
-                    panel.update_zone(self.player_index, rect, color) # Aktualisiert die Zone im Panel
+                if self.recorder is not None: # Mitschnitt aktiv
+                    self.recorder.zone_drawn(self.player_index, rect, color) # Zeichnet die neue Zone auf
+                self.finish_zone(rect, color) # Zeigt die Zone an und speichert sie im Panel
                 # Entfernen des temporäres Rechteck
                 if self.zone_rect_item.scene(): # Prüft, ob das temporäre Rechteck einer Szene hinzugefügt wurde
                     self.zone_rect_item.scene().removeItem(self.zone_rect_item) # Entfernt das temporäre Rechteck aus der Szene
@@ -268,25 +237,54 @@ class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von D
             return # Beendet die Methode
         super().mouseReleaseEvent(event) # Ruft die Methode der Basisklasse auf
 
+    def finish_zone(self, rect, color): # Methode zum Abschluss einer gezeichneten Zone
+        """
+        Zeigt eine neu gezeichnete Zone an und speichert sie in der aktuellen Formation des Panels.
+        """
+        panel = self.zone_update_callback.__self__ if hasattr(self.zone_update_callback, '__self__') else None # Holt das Panel von der Callback-Funktion
+        self._acquireZone(rect, panel, color) # Zeigt die Zone mit einem (wiederverwendeten) ZoneItem an
+        # Panel speichern
+        if panel and hasattr(panel, 'update_zone'): # Prüft, ob das Panel existiert und die Methode update_zone hat
+            panel.update_zone(self.player_index, rect, color) # Aktualisiert die Zone im Panel
+
     def addZone(self, rect: QRectF, color: QColor): # Methode zum Hinzufügen einer gespeicherten Zone
         """
         Fügt eine gespeicherte Annahmezone hinzu und zeigt sie an.
         """
         # Erzeuge interaktives ZoneItem wie in der Erstellung per Maus
         panel = self.zone_update_callback.__self__ if hasattr(self.zone_update_callback, '__self__') else None # Holt das Panel von der Callback-Funktion
-        zone_item = ZoneItem(rect, self, panel, color) # Erstellt ein neues ZoneItem
-        if self.scene(): # Prüft, ob der Spieler einer Szene hinzugefügt wurde
+        self._acquireZone(rect, panel, color) # Zeigt die Zone mit einem (wiederverwendeten) ZoneItem an
+
+    def _acquireZone(self, rect, panel, color): # Private Methode: holt ein ZoneItem aus dem Pool oder erzeugt eines
+        if self.zone_pool: # Ausgeblendetes Item vorhanden
+            zone_item = self.zone_pool.pop() # Nimmt es aus dem Pool
+            zone_item.setZone(rect, panel, color) # Belegt es mit den neuen Daten
+        else: # Pool leer
+            zone_item = ZoneItem(rect, self, panel, color) # Erstellt ein neues ZoneItem
+        if zone_item.scene() is None and self.scene(): # Noch nicht im Spielfeld
             # fügt die Zone zum Spielfeld hinzu
             self.scene().addItem(zone_item) # Fügt das ZoneItem zur Szene hinzu
+        zone_item.show() # Blendet die Zone ein
         self.zones_items.append(zone_item) # Fügt das ZoneItem zur Liste der Zonen des Spielers hinzu
+        return zone_item # Gibt das ZoneItem zurück
+
+    def releaseZone(self, zone_item): # Methode zum Ausblenden einer einzelnen Zone
+        """
+        Blendet eine Zone aus und legt das Item zur Wiederverwendung in den Pool.
+        Das Item bleibt in der Szene, damit deren Index nicht neu aufgebaut werden muss.
+        """
+        if zone_item in self.zones_items: # Zone wird angezeigt
+            self.zones_items.remove(zone_item) # Entfernt sie aus der Liste der Zonen
+            zone_item.hide() # Blendet sie aus
+            self.zone_pool.append(zone_item) # Legt sie in den Pool
 
     def clearZones(self): # Methode zum Entfernen aller Zonen eines Spielers
         """
-        Entfernt alle Annahmezonen vom Spieler.
+        Entfernt alle Annahmezonen vom Spieler (die Items werden ausgeblendet und wiederverwendet).
         """
         for zi in self.zones_items: # Iteriert über alle Zonenitems des Spielers
-            if zi.scene(): # Prüft, ob das Zonenitem einer Szene hinzugefügt wurde
-                zi.scene().removeItem(zi) # Entfernt das Zonenitem aus der Szene
+            zi.hide() # Blendet das Zonenitem aus
+        self.zone_pool.extend(self.zones_items) # Legt die Zonenitems in den Pool
         self.zones_items.clear() # Leert die Liste der Zonenitems
 
     def contextMenuEvent(self, event): # Methode zur Behandlung von Kontextmenü-Events (erscheint beim Rechtsklick auf den Spieler)
@@ -310,9 +308,7 @@ class PlayerItem(DraggableEllipse): # Definiert die Klasse PlayerItem, die von D
                         [r.x(), r.y(), r.width(), r.height()], # Übergibt die Dimensionen der Zone
                         [c.red(), c.green(), c.blue(), c.alpha()] # Übergibt die Farbwerte der Zone
                     )
-                if zi.scene(): # Prüft, ob das Zonenitem einer Szene hinzugefügt wurde (entfernt die Zone aus der Szene)
-                    zi.scene().removeItem(zi) # Entfernt das Zonenitem aus der Szene
-            self.zones_items.clear() # Leert die Liste der Zonenitems
+            self.clearZones() # Blendet alle Zonenitems aus
         elif action == edit_player: # Wenn die Aktion "Name bearbeiten" war
             editor = PlayerEditorDialog(self) # Erstellt einen Dialog zur Spielerbearbeitung
             editor.exec() # Führt den Dialog aus
@@ -0,0 +1,6 @@
+"""
+Qt-freie Kernfunktionen (nur Python, NumPy wird erst bei Bedarf geladen):
+Spielfeldgeometrie, Triangulation, räumliche Indizes, Interpolation, Blockschatten
+und Angriffssektor. Die Qt-Klassen in components/ und sectors/ bauen darauf auf;
+die Webapp und Werkzeuge können das Paket ohne PySide6 verwenden.
+"""
@@ -0,0 +1,40 @@
+import math  # Importiert das math-Modul für mathematische Operationen.
+
+# Konstanten
+DEFAULT_SCALE = 30  # Definiert den Standardmaßstab: 30 Pixel pro Meter.
+
+class CourtDimensions:  # Definiert eine Klasse zur Speicherung und Berechnung von Spielfeldabmessungen.
+    def __init__(self, scale=DEFAULT_SCALE):  # Konstruktor der Klasse, nimmt einen optionalen Maßstab entgegen.
+        self.scale = scale  # Speichert den Maßstab.
+        self.width = 9 * scale  # Berechnet die Breite des Spielfelds.
+        self.height = 18 * scale  # Berechnet die Höhe des Spielfelds.
+        self.net_y = 9 * scale  # Definiert die y-Position der Netzlinie.
+        self.attack_line_y = self.net_y - 3 * scale  # Berechnet die y-Position der Angriffslinie (auf der eigenen Seite, daher Subtraktion).
+        self.defense_line_y = self.net_y + 3 * scale  # Berechnet die y-Position der (gegnerischen) Angriffslinie (aus Sicht der eigenen Seite).
+
+def calculate_distance(p1, p2) -> float:  # Definiert eine Funktion zur Abstandsberechnung zwischen zwei Punkten (x, y).
+    """Berechnet den Abstand zwischen zwei Punkten"""  # Docstring der Funktion.
+    return math.hypot(p2[0] - p1[0], p2[1] - p1[1])  # Gibt den euklidischen Abstand zurück.
+
+def calculate_angle(from_point, to_point) -> float:  # Definiert eine Funktion zur Winkelberechnung zwischen zwei Punkten (x, y).
+    """Berechnet den Winkel in Grad von einem Punkt zu einem anderen"""  # Docstring der Funktion.
+    dx = to_point[0] - from_point[0]  # Berechnet die Differenz der x-Koordinaten.
+    dy = to_point[1] - from_point[1]  # Berechnet die Differenz der y-Koordinaten.
+    return (-math.degrees(math.atan2(dy, dx))) % 360  # Gibt den Winkel in Grad zurück (im Uhrzeigersinn, 0° ist rechts).
+
+def get_intersection_with_net(player_pos, ball_pos, net_y: float):  # Definiert eine Funktion zur Berechnung des Schnittpunkts einer Linie mit dem Netz.
+    """Berechnet den Schnittpunkt (x, y) der Linie zwischen Spieler und Ball mit dem Netz oder None"""  # Docstring der Funktion.
+    px, py = player_pos[0], player_pos[1]  # Koordinaten des Spielers.
+    dx = ball_pos[0] - px  # Differenz der x-Koordinaten zwischen Ball und Spieler.
+    dy = ball_pos[1] - py  # Differenz der y-Koordinaten zwischen Ball und Spieler.
+
+    # Prüft, ob beide Punkte auf der gleichen Seite des Netzes sind
+    if (py < net_y and ball_pos[1] < net_y) or (py > net_y and ball_pos[1] > net_y):  # Beide Punkte auf derselben Seite.
+        return None  # Kein Schnittpunkt mit dem Netz möglich.
+
+    # Behandelt den Fall einer horizontalen Linie
+    if dy == 0:  # Wenn die y-Differenz null ist (horizontale Linie).
+        return (px, net_y)  # Punkt auf der Netzlinie mit der x-Koordinate des Spielers.
+
+    # Berechnet den Schnittpunkt mit der Geradengleichung
+    return (px + (net_y - py) * dx / dy, net_y)  # Gibt den Schnittpunkt zurück.
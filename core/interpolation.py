@@ -0,0 +1,538 @@
+import math  # Importiert das math-Modul für mathematische Operationen.
+from .triangulation import DelaunayTriangulation, orientation  # Importiert die Delaunay-Triangulation.
+from .spatial_index import TriangleGrid  # Importiert den Gitterindex über Dreiecke.
+
+# NumPy wird erst in den Stapel- und Gittermethoden importiert, damit Einzelabfragen
+# (und der Import dieses Moduls) ohne NumPy auskommen.
+
+def point_in_triangle(p, a, b, c):  # Definiert eine Funktion, um zu prüfen, ob ein Punkt in einem Dreieck liegt.
+    """
+    Prüft, ob ein Punkt p innerhalb des Dreiecks abc liegt.
+    Alle Punkte sind Tupel oder Listen mit (x, y)-Koordinaten.
+    
+    Gibt True zurück, wenn p im Dreieck liegt, sonst False.
+    """
+    def sign(p1, p2, p3):  # Definiert eine Hilfsfunktion zur Bestimmung der Orientierung von drei Punkten.
+        return (p1[0] - p3[0]) * (p2[1] - p3[1]) - (p2[0] - p3[0]) * (p1[1] - p3[1])  # Berechnet das Vorzeichen basierend auf dem Kreuzprodukt.
+    
+    d1 = sign(p, a, b)  # Berechnet die Orientierung des Punktes p relativ zur Seite ab.
+    d2 = sign(p, b, c)  # Berechnet die Orientierung des Punktes p relativ zur Seite bc.
+    d3 = sign(p, c, a)  # Berechnet die Orientierung des Punktes p relativ zur Seite ca.
+    
+    has_neg = (d1 < 0) or (d2 < 0) or (d3 < 0)  # Prüft, ob eine der Orientierungen negativ ist.
+    has_pos = (d1 > 0) or (d2 > 0) or (d3 > 0)  # Prüft, ob eine der Orientierungen positiv ist.
+    
+    return not (has_neg and has_pos)  # Gibt True zurück, wenn alle Orientierungen dasselbe Vorzeichen haben (oder null sind), andernfalls False.
+
+def get_barycentric_coordinates(p, a, b, c):  # Definiert eine Funktion zur Berechnung baryzentrischer Koordinaten.
+    """
+    Berechnet die baryzentrischen Koordinaten des Punkts p bezüglich des Dreiecks abc.
+    Alle Punkte sind Tupel oder Listen mit (x, y)-Koordinaten.
+    
+    Gibt (alpha, beta, gamma) zurück, wobei p = alpha*a + beta*b + gamma*c
+    und alpha + beta + gamma = 1.
+    """
+    # Berechnet die Dreiecksfläche (doppelt, vorzeichenbehaftet)
+    denominator = ((b[1] - c[1]) * (a[0] - c[0]) + (c[0] - b[0]) * (a[1] - c[1]))  # Berechnet den Nenner für die baryzentrischen Koordinaten (proportional zur Dreiecksfläche).
+    if abs(denominator) < 1e-10:  # Vermeidet Division durch Null für kollineare Punkte.
+        return (0.33, 0.33, 0.34)  # Gibt gleichmäßige Gewichte zurück, falls das Dreieck entartet ist.
+    
+    # Berechnet baryzentrische Koordinaten
+    alpha = ((b[1] - c[1]) * (p[0] - c[0]) + (c[0] - b[0]) * (p[1] - c[1])) / denominator  # Berechnet die Koordinate alpha.
+    beta = ((c[1] - a[1]) * (p[0] - c[0]) + (a[0] - c[0]) * (p[1] - c[1])) / denominator  # Berechnet die Koordinate beta.
+    gamma = 1.0 - alpha - beta  # Berechnet die Koordinate gamma, da die Summe 1 sein muss.
+    
+    return (alpha, beta, gamma)  # Gibt die baryzentrischen Koordinaten als Tupel zurück.
+
+def interpolate_position(p, triangles, offsets):  # Definiert eine Funktion zur Interpolation von Positionen basierend auf Dreiecken.
+    """
+    Interpoliert Positionen basierend auf vordefinierten Dreiecken und Offsets.
+    
+    Parameter:
+        p: Aktuelle Ballposition als (x, y)  # Die Position, für die interpoliert werden soll.
+        triangles: Liste von Dreiecksecken [(a, b, c), ...] wobei jede Ecke (x, y) ist  # Eine Liste von Dreiecken, die den Raum abdecken.
+        offsets: Liste entsprechender Spieler-Offsets für jede Dreiecksecke  # Offsets, die den Eckpunkten der Dreiecke zugeordnet sind.
+                 [[(offx1, offy1), ...], [(offx2, offy2), ...], ...]
+    
+    Gibt zurück:
+        Interpolierte Offsets als Liste von (x, y) oder None, wenn keine Interpolation möglich ist  # Die interpolierten Offsets oder None.
+    """
+    for i, triangle in enumerate(triangles):  # Iteriert über alle definierten Dreiecke mit ihrem Index.
+        if point_in_triangle(p, *triangle):  # Prüft, ob der Punkt p im aktuellen Dreieck liegt.
+            a, b, c = triangle  # Entpackt die Eckpunkte des Dreiecks.
+            weights = get_barycentric_coordinates(p, a, b, c)  # Berechnet die baryzentrischen Koordinaten von p im Dreieck.
+            
+            # Holt die entsprechenden Offsets
+            offsets_a = offsets[i][0]  # Holt die Offsets, die dem ersten Eckpunkt (a) des Dreiecks zugeordnet sind.
+            offsets_b = offsets[i][1]  # Holt die Offsets, die dem zweiten Eckpunkt (b) des Dreiecks zugeordnet sind.
+            offsets_c = offsets[i][2]  # Holt die Offsets, die dem dritten Eckpunkt (c) des Dreiecks zugeordnet sind.
+            
+            # Interpoliert Offsets für jeden Spieler
+            result = []  # Initialisiert eine leere Liste für die resultierenden interpolierten Offsets.
+            for player_idx in range(len(offsets_a)):  # Iteriert über die Anzahl der Spieler (basierend auf der Länge der Offset-Liste für einen Eckpunkt).
+                off_a = offsets_a[player_idx]  # Holt den Offset des aktuellen Spielers für Eckpunkt a.
+                off_b = offsets_b[player_idx]  # Holt den Offset des aktuellen Spielers für Eckpunkt b.
+                off_c = offsets_c[player_idx]  # Holt den Offset des aktuellen Spielers für Eckpunkt c.
+                
+                # Gewichteter Durchschnitt basierend auf baryzentrischen Koordinaten
+                interp_x = weights[0] * off_a[0] + weights[1] * off_b[0] + weights[2] * off_c[0]  # Interpoliert die x-Koordinate des Offsets.
+                interp_y = weights[0] * off_a[1] + weights[1] * off_b[1] + weights[2] * off_c[1]  # Interpoliert die y-Koordinate des Offsets.
+                
+                result.append((interp_x, interp_y))  # Fügt den interpolierten Offset zur Ergebnisliste hinzu.
+            
+            return result  # Gibt die Liste der interpolierten Offsets zurück.
+            
+    return None  # Kein Dreieck gefunden, das den Punkt enthält. Gibt None zurück, wenn p in keinem der Dreiecke liegt.
+
+
+class InterpolationEngine:  # Definiert eine Klasse, die Triangulation, räumlichen Index und Interpolation bündelt.
+    """
+    Interpolations-Engine über die gespeicherten Formationen.
+
+    Trianguliert die Ballpositionen, legt einen räumlichen Index (Gitter) über die Dreiecke
+    und beantwortet eine Abfrage in einem Schritt: gewähltes Dreieck, baryzentrische Gewichte
+    und interpolierte Offsets. Dadurch stimmen das angezeigte (gelbe) Dreieck und die
+    angewendeten Offsets immer überein, und die Abfragezeit bleibt unabhängig von der Anzahl
+    der Formationen nahezu konstant.
+    """
+
+    def __init__(self, ball_positions=(), player_offsets=(), cell_size=None):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            ball_positions: Liste der Ballpositionen (x, y) der Formationen
+            player_offsets: Liste der Spieler-Offsets je Formation [[(x, y), ...], ...]
+            cell_size: Zellgröße des Gitterindex oder None für automatische Wahl
+        """
+        self.cell_size = cell_size  # Speichert die gewünschte Zellgröße.
+        self.rebuild(ball_positions, player_offsets)  # Baut Triangulation und Index auf.
+
+    def rebuild(self, ball_positions, player_offsets):  # Methode zum vollständigen Neuaufbau.
+        """Trianguliert die Ballpositionen neu und baut den räumlichen Index auf."""
+        self.triangulation = DelaunayTriangulation(ball_positions)  # Delaunay-Triangulation der Ballpositionen.
+        self.triangulation.take_changes()  # Verwirft das Protokoll des Erstaufbaus.
+        # Ballpositionen und Offsets sind nach Punkt-id indiziert (entfernte Formationen bleiben als None stehen)
+        self.ball_positions = self.triangulation.points  # Ballpositionen je Punkt-id (gemeinsame Liste).
+        self.player_offsets = [[(float(o[0]), float(o[1])) for o in offs] for offs in player_offsets]  # Speichert die Offsets.
+        self.point_ids = list(range(len(self.ball_positions)))  # Zuordnung Formationsindex -> Punkt-id.
+        self._update_player_count()  # Bestimmt die Anzahl der Spieler.
+        items = self.triangulation.triangle_items()  # Nutzbare Dreiecke (id -> Index-Tripel).
+        self.triangle_indices = []  # Dreiecke als Punkt-id-Tripel.
+        self.triangles = []  # Dreiecke als Eckpunkte.
+        self.areas = []  # Flächen der Dreiecke (für Gleichstände auf Kanten).
+        self._tids = []  # Dreiecks-id der Triangulation je Eintrag.
+        self._slot_of_tid = {}  # Zuordnung Dreiecks-id -> Eintrag.
+        for tid, tri in items.items():  # Überträgt alle Dreiecke.
+            self._append_triangle(tid, tri)
+        self.grid = TriangleGrid(self.triangles, self.cell_size)  # Räumlicher Index über die Dreiecke.
+        self._grid_size = len(self.triangles)  # Dreiecksanzahl, für die das Gitter ausgelegt ist.
+        self._batch = None  # Vorberechnete Matrizen für die Stapelabfrage (werden bei Bedarf erzeugt).
+        self.version = getattr(self, "version", 0) + 1  # Versionszähler (ändert sich bei jeder Änderung).
+
+    def _update_player_count(self):  # Private Methode: Anzahl der Spieler bestimmen.
+        self.player_count = min((len(offs) for offs in self.player_offsets if offs is not None), default=0)  # Kleinster gemeinsamer Wert.
+
+    def _append_triangle(self, tid, tri):  # Private Methode: Dreieck an die Listen anhängen.
+        corners = tuple(self.ball_positions[i] for i in tri)  # Eckpunkte des Dreiecks.
+        self._slot_of_tid[tid] = len(self._tids)  # Merkt sich den Eintrag.
+        self._tids.append(tid)  # Dreiecks-id.
+        self.triangle_indices.append(tri)  # Punkt-id-Tripel.
+        self.triangles.append(corners)  # Eckpunkte.
+        self.areas.append(abs(orientation(*corners)) / 2)  # Fläche.
+        return len(self._tids) - 1  # Gibt den Eintrag zurück.
+
+    def _discard_triangle(self, tid):  # Private Methode: Dreieck aus Listen und Gitter entfernen.
+        slot = self._slot_of_tid.pop(tid, None)  # Eintrag des Dreiecks.
+        if slot is None:  # Dreieck war nicht nutzbar (z.B. am Hilfsdreieck).
+            return  # Nichts zu tun.
+        self.grid.remove(slot, self.triangles[slot])  # Entfernt das Dreieck aus dem Gitter.
+        last = len(self._tids) - 1  # Letzter Eintrag.
+        if slot != last:  # Letzten Eintrag in die Lücke verschieben (O(1) statt Umnummerierung).
+            self.grid.remove(last, self.triangles[last])  # Trägt den letzten Eintrag aus.
+            for values in (self._tids, self.triangle_indices, self.triangles, self.areas):  # Verschiebt alle Listenwerte.
+                values[slot] = values[last]
+            self._slot_of_tid[self._tids[slot]] = slot  # Aktualisiert die Zuordnung.
+            self.grid.insert(slot, self.triangles[slot])  # Trägt ihn unter dem neuen Eintrag ein.
+        for values in (self._tids, self.triangle_indices, self.triangles, self.areas):  # Kürzt alle Listen.
+            values.pop()
+
+    def _apply_changes(self):  # Private Methode: Änderungen der Triangulation übernehmen.
+        changes = self.triangulation.take_changes()  # Holt die geänderten Dreiecke.
+        if changes is None:  # Triangulation wurde vollständig neu aufgebaut.
+            offsets = list(self.player_offsets)  # Sichert die Offsets.
+            point_ids = list(self.point_ids)  # Sichert die Zuordnung.
+            self.rebuild([self.ball_positions[i] for i in point_ids], [offsets[i] for i in point_ids])  # Vollständiger Neuaufbau.
+            return  # Beendet die Methode.
+        removed, added = changes  # Entfernte und neue Dreiecke.
+        for tid in removed:  # Entfernt alte Dreiecke.
+            self._discard_triangle(tid)
+        for tid in added:  # Fügt neue Dreiecke hinzu.
+            tri = self.triangulation.triangle(tid)  # Prüft, ob das Dreieck nutzbar ist.
+            if tri is not None:  # Nur nutzbare Dreiecke.
+                self.grid.insert(self._append_triangle(tid, tri), self.triangles[-1])  # Hängt es an und indiziert es.
+        if len(self.triangles) > 4 * max(self._grid_size, 1):  # Gitter für die aktuelle Anzahl zu grob.
+            self.grid = TriangleGrid(self.triangles)  # Baut das Gitter mit angepasster Zellgröße neu auf.
+            self._grid_size = len(self.triangles)  # Merkt sich die neue Auslegung.
+        self._batch = None  # Vorberechnete Matrizen sind veraltet.
+        self.version += 1  # Neue Version.
+
+    def insert_formation(self, index, ball, offsets):  # Methode zum Einfügen einer Formation.
+        """Fügt eine Formation an Position index ein; nur die Dreiecke um den neuen Punkt ändern sich."""
+        point_id = self.triangulation.add_point(ball)  # Fügt den Punkt in die Triangulation ein.
+        self.player_offsets.append([(float(o[0]), float(o[1])) for o in offsets])  # Speichert die Offsets unter der Punkt-id.
+        self.point_ids.insert(index, point_id)  # Ordnet den Formationsindex zu.
+        self._update_player_count()  # Aktualisiert die Spieleranzahl.
+        self._apply_changes()  # Übernimmt die geänderten Dreiecke.
+
+    def remove_formation(self, index):  # Methode zum Entfernen einer Formation.
+        """Entfernt die Formation an Position index; nur das Loch um den Punkt wird neu trianguliert."""
+        point_id = self.point_ids.pop(index)  # Löst die Zuordnung.
+        self.triangulation.remove_point(point_id)  # Entfernt den Punkt aus der Triangulation.
+        self.player_offsets[point_id] = None  # Gibt die Offsets frei.
+        self._update_player_count()  # Aktualisiert die Spieleranzahl.
+        self._apply_changes()  # Übernimmt die geänderten Dreiecke.
+
+    def move_formation(self, index, ball):  # Methode zum Verschieben der Ballposition einer Formation.
+        """Verschiebt die Ballposition der Formation an Position index."""
+        offsets = self.player_offsets[self.point_ids[index]]  # Behält die Offsets.
+        self.remove_formation(index)  # Entfernt die alte Position.
+        self.insert_formation(index, ball, offsets)  # Fügt die neue Position ein.
+
+    def update_offsets(self, index, offsets):  # Methode zum Ändern der Offsets einer Formation.
+        """Ersetzt die Spieler-Offsets der Formation an Position index (die Triangulation bleibt unverändert)."""
+        self.player_offsets[self.point_ids[index]] = [(float(o[0]), float(o[1])) for o in offsets]  # Ersetzt die Offsets.
+        self._update_player_count()  # Aktualisiert die Spieleranzahl.
+        self._batch = None  # Vorberechnete Matrizen sind veraltet.
+        self.version += 1  # Neue Version.
+
+    def take_over(self, other):  # Methode zum Übernehmen einer anderen Engine.
+        """
+        Übernimmt Triangulation, Offsets und Index einer anderswo (z.B. im Hintergrund beim
+        Start) aufgebauten Engine. other darf danach nicht mehr verwendet werden.
+        """
+        version = self.version  # Bisherige Version.
+        self.__dict__.update(other.__dict__)  # Übernimmt alle Daten ohne Kopie.
+        self.version = max(version, other.version) + 1  # Neue Version (z.B. für das Interpolationsgitter).
+
+    def snapshot(self):  # Methode für eine unveränderliche Kopie.
+        """
+        Erzeugt eine Kopie für Abfragen aus einem anderen Thread (z.B. das Interpolationsgitter).
+        Die Kopie unterstützt Abfragen, aber keine weiteren inkrementellen Änderungen.
+        """
+        other = InterpolationEngine.__new__(InterpolationEngine)  # Neues Objekt ohne Neuaufbau.
+        other.cell_size = self.cell_size  # Zellgröße.
+        other.triangulation = None  # Keine Triangulation (nur Abfragen).
+        other.ball_positions = list(self.ball_positions)  # Kopiert die Ballpositionen.
+        other.player_offsets = list(self.player_offsets)  # Kopiert die Offset-Liste (die Einträge werden nur ersetzt).
+        other.point_ids = list(self.point_ids)  # Kopiert die Zuordnung.
+        other.player_count = self.player_count  # Spieleranzahl.
+        other.triangle_indices = list(self.triangle_indices)  # Kopiert die Dreiecke.
+        other.triangles = list(self.triangles)
+        other.areas = list(self.areas)
+        other._tids = list(self._tids)
+        other._slot_of_tid = dict(self._slot_of_tid)
+        other.grid = self.grid.copy()  # Kopiert das Gitter.
+        other._grid_size = self._grid_size
+        other._batch = self._batch  # Vorberechnete Matrizen (unveränderlich) können geteilt werden.
+        other.version = self.version  # Gleiche Version.
+        return other  # Gibt die Kopie zurück.
+
+    def __len__(self):  # Anzahl der Dreiecke.
+        return len(self.triangles)  # Gibt die Anzahl der Dreiecke zurück.
+
+    def locate(self, p):  # Methode zur Punktlokalisierung.
+        """
+        Sucht das Dreieck, das p enthält.
+
+        Gibt (Dreiecksindex, (alpha, beta, gamma)) zurück oder None, wenn p in keinem Dreieck liegt.
+        Liegt p genau auf einer gemeinsamen Kante, wird das kleinere Dreieck gewählt.
+        """
+        best = None  # Bisher bestes Dreieck.
+        for index in self.grid.candidates(p[0], p[1]):  # Prüft nur die Kandidaten der Gitterzelle.
+            weights = get_barycentric_coordinates(p, *self.triangles[index])  # Baryzentrische Koordinaten von p.
+            if min(weights) < -1e-9:  # p liegt außerhalb des Dreiecks.
+                continue  # Nächster Kandidat.
+            if best is None or self.areas[index] < self.areas[best[0]]:  # Kleineres Dreieck bevorzugen.
+                best = (index, weights)  # Merkt sich den Treffer.
+        return best  # Gibt den Treffer oder None zurück.
+
+    def query(self, p):  # Methode zur vollständigen Interpolationsabfrage.
+        """
+        Interpoliert die Spieler-Offsets für die Ballposition p.
+
+        Gibt (Dreieck, Gewichte, Offsets) zurück, wobei Dreieck die drei Eckpunkte (x, y) sind
+        und Offsets eine Liste von (x, y) je Spieler ist; None, wenn keine Interpolation möglich ist.
+        """
+        hit = self.locate(p)  # Sucht das Dreieck.
+        if hit is None:  # Kein Dreieck gefunden.
+            return None  # Keine Interpolation möglich.
+        index, weights = hit  # Entpackt den Treffer.
+        i, j, k = self.triangle_indices[index]  # Punkt-ids der Ecken.
+        offsets_a, offsets_b, offsets_c = self.player_offsets[i], self.player_offsets[j], self.player_offsets[k]  # Offsets der Ecken.
+        result = []  # Liste der interpolierten Offsets.
+        for off_a, off_b, off_c in zip(offsets_a, offsets_b, offsets_c):  # Für jeden Spieler.
+            interp_x = weights[0] * off_a[0] + weights[1] * off_b[0] + weights[2] * off_c[0]  # Interpoliert die x-Koordinate.
+            interp_y = weights[0] * off_a[1] + weights[1] * off_b[1] + weights[2] * off_c[1]  # Interpoliert die y-Koordinate.
+            result.append((interp_x, interp_y))  # Speichert den Offset.
+        return self.triangles[index], weights, result  # Gibt Dreieck, Gewichte und Offsets zurück.
+
+    def _prepare_batch(self):  # Private Methode zur Vorberechnung der Matrizen für Stapelabfragen.
+        """
+        Berechnet einmalig je Dreieck die affinen Abbildungen:
+          - weight_maps: (T, 3, 3), bildet [x, y, 1] auf die baryzentrischen Gewichte ab
+          - offset_maps: (T, Spieler*2, 3), bildet [x, y, 1] direkt auf die Offsets ab
+        sowie eine dichte Kandidatentabelle des Gitterindex.
+        """
+        import numpy as np  # Lädt NumPy erst bei Bedarf.
+        count = len(self.triangles)  # Anzahl der Dreiecke.
+        players = self.player_count  # Anzahl der Spieler.
+        if count == 0:  # Ohne Dreiecke gibt es nichts vorzuberechnen.
+            self._batch = {"players": players, "count": 0}  # Leerer Zustand.
+            return  # Beendet die Methode.
+        vertices = np.asarray(self.triangles, dtype=float)  # Eckpunkte (T, 3, 2).
+        corners = np.ones((count, 3, 3))  # Matrix [[ax, bx, cx], [ay, by, cy], [1, 1, 1]] je Dreieck.
+        corners[:, 0, :] = vertices[:, :, 0]  # x-Koordinaten der Ecken.
+        corners[:, 1, :] = vertices[:, :, 1]  # y-Koordinaten der Ecken.
+        weight_maps = np.linalg.inv(corners)  # Inverse: [x, y, 1] -> (alpha, beta, gamma).
+        offsets = np.zeros((len(self.player_offsets), players * 2))  # Offsets je Punkt-id (F, Spieler*2), entfernte bleiben 0.
+        for point_id, offs in enumerate(self.player_offsets):  # Überträgt die Offsets.
+            if offs is not None:  # Nur vorhandene Formationen.
+                offsets[point_id] = np.asarray(offs[:players], dtype=float).reshape(-1)
+        corner_offsets = offsets[np.asarray(self.triangle_indices)]  # Offsets der Ecken (T, 3, Spieler*2).
+        offset_maps = np.einsum("tkj,tki->tji", corner_offsets, weight_maps)  # Affine Abbildung [x, y, 1] -> Offsets (T, Spieler*2, 3).
+
+        # Dichte Kandidatentabelle über den belegten Bereich des Gitters
+        keys = list(self.grid.cells.keys())  # Alle belegten Zellen.
+        min_ix = min(k[0] for k in keys)  # Kleinster Spaltenindex.
+        min_iy = min(k[1] for k in keys)  # Kleinster Zeilenindex.
+        width = max(k[0] for k in keys) - min_ix + 1  # Anzahl der Spalten.
+        height = max(k[1] for k in keys) - min_iy + 1  # Anzahl der Zeilen.
+        depth = max(len(v) for v in self.grid.cells.values())  # Maximale Kandidatenzahl pro Zelle.
+        table = np.full((width * height, depth), -1, dtype=np.int64)  # Mit -1 aufgefüllte Kandidatentabelle.
+        for (ix, iy), cell in self.grid.cells.items():  # Überträgt die Zellen in die Tabelle.
+            table[(ix - min_ix) * height + (iy - min_iy), :len(cell)] = cell
+        self._batch = {  # Speichert alle vorberechneten Daten.
+            "players": players, "count": count,
+            "weight_maps": weight_maps, "offset_maps": offset_maps,
+            "areas": np.asarray(self.areas, dtype=float),
+            "table": table, "origin": (min_ix, min_iy), "shape": (width, height),
+        }
+
+    def locate_batch(self, points):  # Methode zur vektorisierten Punktlokalisierung.
+        """
+        Lokalisiert viele Ballpositionen auf einmal.
+
+        Parameter:
+            points: Array-ähnlich mit Form (N, 2)
+
+        Gibt zurück:
+            (triangle_ids, weights): triangle_ids (N,) mit -1 für Punkte außerhalb,
+            weights (N, 3) baryzentrische Gewichte (NaN für Punkte außerhalb)
+        """
+        import numpy as np  # Lädt NumPy erst bei Bedarf.
+        if self._batch is None:  # Matrizen noch nicht vorberechnet.
+            self._prepare_batch()  # Berechnet sie einmalig.
+        batch = self._batch  # Kurzname.
+        points = np.asarray(points, dtype=float).reshape(-1, 2)  # Normalisiert die Eingabe auf (N, 2).
+        n = len(points)  # Anzahl der Punkte.
+        triangle_ids = np.full(n, -1, dtype=np.int64)  # Standard: kein Dreieck.
+        weights = np.full((n, 3), np.nan)  # Standard: keine Gewichte.
+        if batch["count"] == 0 or n == 0:  # Keine Dreiecke oder keine Punkte.
+            return triangle_ids, weights  # Gibt leere Ergebnisse zurück.
+
+        # Gitterzelle je Punkt bestimmen
+        cells = np.floor(points / self.grid.cell_size).astype(np.int64)  # Zellindizes (N, 2).
+        ix = cells[:, 0] - batch["origin"][0]  # Spalte relativ zur Tabelle.
+        iy = cells[:, 1] - batch["origin"][1]  # Zeile relativ zur Tabelle.
+        width, height = batch["shape"]  # Tabellenausdehnung.
+        inside_grid = (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)  # Punkte innerhalb des Gitters.
+        rows = np.where(inside_grid, ix * height + iy, 0)  # Tabellenzeile je Punkt.
+        candidates = np.where(inside_grid[:, None], batch["table"][rows], -1)  # Kandidaten (N, K).
+
+        # Gewichte für alle Kandidaten: W[t] @ [x, y, 1]
+        homogeneous = np.column_stack([points, np.ones(n)])  # Homogene Koordinaten (N, 3).
+        safe = np.maximum(candidates, 0)  # Gültige Indizes für den Zugriff.
+        candidate_weights = np.einsum("nkij,nj->nki", batch["weight_maps"][safe], homogeneous)  # Gewichte (N, K, 3).
+        hit = (candidates >= 0) & (candidate_weights.min(axis=2) >= -1e-9)  # Punkt liegt im Kandidaten.
+        # Bei mehreren Treffern (gemeinsame Kante) das kleinste Dreieck wählen
+        score = np.where(hit, batch["areas"][safe], np.inf)  # Fläche oder unendlich.
+        best = np.argmin(score, axis=1)  # Bester Kandidat je Punkt.
+        found = np.isfinite(score[np.arange(n), best])  # Punkte mit Treffer.
+        triangle_ids[found] = candidates[found, best[found]]  # Gewählte Dreiecke.
+        weights[found] = candidate_weights[found, best[found]]  # Zugehörige Gewichte.
+        return triangle_ids, weights  # Gibt die Ergebnisse zurück.
+
+    def interpolate_batch(self, points):  # Methode zur vektorisierten Interpolation.
+        """
+        Interpoliert die Spieler-Offsets für viele Ballpositionen auf einmal
+        (Grundlage für Heatmaps, Trajektorien und serverseitige Abfragen).
+
+        Parameter:
+            points: Array-ähnlich mit Form (N, 2)
+
+        Gibt zurück:
+            (offsets, valid, triangle_ids):
+              offsets (N, Spieler, 2) mit NaN für ungültige Punkte,
+              valid (N,) boolesche Maske,
+              triangle_ids (N,) Index des verwendeten Dreiecks oder -1
+        """
+        triangle_ids, _ = self.locate_batch(points)  # Lokalisiert alle Punkte.
+        offsets, valid = self._batch_offsets(points, triangle_ids)  # Interpoliert die Offsets.
+        return offsets, valid, triangle_ids  # Gibt Offsets, Maske und Dreiecke zurück.
+
+    def query_batch(self, points):  # Methode zur vektorisierten Interpolationsabfrage.
+        """
+        Wie query(), aber für viele Ballpositionen auf einmal.
+
+        Gibt zurück:
+            (triangle_ids, weights, offsets): triangle_ids (N,) mit -1 für Punkte außerhalb,
+            weights (N, 3) und offsets (N, Spieler, 2), beide NaN für Punkte außerhalb;
+            die Eckpunkte eines Dreiecks liefert self.triangles[triangle_id]
+        """
+        triangle_ids, weights = self.locate_batch(points)  # Lokalisiert alle Punkte.
+        offsets, _ = self._batch_offsets(points, triangle_ids)  # Interpoliert die Offsets.
+        return triangle_ids, weights, offsets  # Gibt Dreiecke, Gewichte und Offsets zurück.
+
+    def _batch_offsets(self, points, triangle_ids):  # Private Methode: Offsets für lokalisierte Punkte.
+        import numpy as np  # Lädt NumPy erst bei Bedarf.
+        batch = self._batch  # Vorberechnete Daten.
+        points = np.asarray(points, dtype=float).reshape(-1, 2)  # Normalisiert die Eingabe.
+        n = len(points)  # Anzahl der Punkte.
+        players = batch["players"]  # Anzahl der Spieler.
+        offsets = np.full((n, players, 2), np.nan)  # Ergebnis mit NaN vorbelegt.
+        valid = triangle_ids >= 0  # Maske der gültigen Punkte.
+        if valid.any():  # Nur wenn es gültige Punkte gibt.
+            homogeneous = np.column_stack([points[valid], np.ones(int(valid.sum()))])  # Homogene Koordinaten (M, 3).
+            # Je Punkt eine Matrixmultiplikation: offset_maps[t] @ [x, y, 1]
+            flat = np.einsum("mij,mj->mi", batch["offset_maps"][triangle_ids[valid]], homogeneous)  # Offsets (M, Spieler*2).
+            offsets[valid] = flat.reshape(-1, players, 2)  # Formt in (M, Spieler, 2) um.
+        return offsets, valid  # Gibt Offsets und Maske zurück.
+
+
+# Standard-Rasterweite des Interpolationsgitters in Pixeln (bei scale=30 also 0,1 m)
+DEFAULT_LATTICE_RESOLUTION = 3.0  # Feiner als die Mausauflösung im üblichen Zoom.
+
+
+def _triangle_key(engine, index):  # Private Hilfsfunktion: inhaltlicher Schlüssel eines Dreiecks.
+    """Schlüssel aus Eckpunkten und Offsets, unabhängig von Dreiecksindex und Eckenreihenfolge."""
+    return tuple(sorted(  # Sortiert die Ecken, damit die Reihenfolge keine Rolle spielt.
+        (engine.ball_positions[i], tuple(engine.player_offsets[i])) for i in engine.triangle_indices[index]
+    ))
+
+
+class InterpolationLattice:  # Definiert ein vorberechnetes Interpolationsgitter.
+    """
+    Vorberechnetes Gitter der Interpolationsergebnisse über den Bewegungsbereich des Balls.
+
+    Die Offsets werden einmalig an allen Gitterknoten berechnet; während des Ziehens
+    genügt dann eine bilineare Interpolation zwischen vier Knoten (O(1) je Mausereignis).
+    Nach Änderungen an den Formationen werden nur die Knoten neu berechnet, die in den
+    Begrenzungsrechtecken entfernter oder neuer Dreiecke liegen.
+    """
+
+    def __init__(self, bounds, resolution=DEFAULT_LATTICE_RESOLUTION):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            bounds: (x, y, Breite, Höhe) des abzudeckenden Bereichs (z.B. BallItem.movement_boundary)
+            resolution: Abstand der Gitterknoten in Pixeln
+        """
+        import numpy as np  # Lädt NumPy erst bei Bedarf.
+        x, y, width, height = bounds  # Entpackt den Bereich.
+        self.bounds = (float(x), float(y), float(width), float(height))  # Speichert den Bereich.
+        self.step = float(resolution)  # Speichert die Rasterweite.
+        self.xs = x + np.arange(int(math.ceil(width / self.step)) + 1) * self.step  # x-Koordinaten der Knoten.
+        self.ys = y + np.arange(int(math.ceil(height / self.step)) + 1) * self.step  # y-Koordinaten der Knoten.
+        self.engine = None  # Engine, aus der das Gitter berechnet wurde.
+        self.offsets = None  # Offsets je Knoten (ny, nx, Spieler, 2).
+        self.valid = None  # Gültigkeit je Knoten (ny, nx).
+        self.triangle_ids = None  # Dreiecksindex je Knoten (ny, nx).
+
+    def _nodes(self):  # Private Methode: alle Knoten als (N, 2)-Array.
+        import numpy as np  # Lädt NumPy erst bei Bedarf.
+        gx, gy = np.meshgrid(self.xs, self.ys)  # Gitterkoordinaten (ny, nx).
+        return np.column_stack([gx.ravel(), gy.ravel()])  # Knoten zeilenweise.
+
+    def build(self, engine):  # Methode zum vollständigen Aufbau.
+        """Berechnet alle Gitterknoten aus der Engine."""
+        shape = (len(self.ys), len(self.xs))  # Form des Gitters.
+        offsets, valid, triangle_ids = engine.interpolate_batch(self._nodes())  # Stapelabfrage über alle Knoten.
+        self.offsets = offsets.reshape(shape + offsets.shape[1:])  # Formt in (ny, nx, Spieler, 2) um.
+        self.valid = valid.reshape(shape)  # Formt die Maske um.
+        self.triangle_ids = triangle_ids.reshape(shape)  # Formt die Dreiecksindizes um.
+        self.engine = engine  # Merkt sich die Engine.
+
+    def update(self, engine):  # Methode zur inkrementellen Aktualisierung.
+        """
+        Aktualisiert das Gitter auf den Stand der neuen Engine und berechnet dabei nur die
+        Knoten neu, deren Dreieck sich geändert haben kann. Gibt die Anzahl neu berechneter Knoten zurück.
+        """
+        import numpy as np  # Lädt NumPy erst bei Bedarf.
+        old = self.engine  # Engine des bisherigen Stands.
+        if old is None or self.offsets is None or old.player_count != engine.player_count:  # Kein Altstand oder andere Spielerzahl.
+            self.build(engine)  # Vollständiger Neuaufbau.
+            return self.valid.size  # Alle Knoten wurden berechnet.
+        old_keys = {_triangle_key(old, i): i for i in range(len(old))}  # Schlüssel der alten Dreiecke.
+        new_keys = {_triangle_key(engine, i): i for i in range(len(engine))}  # Schlüssel der neuen Dreiecke.
+        remap = np.full(len(old) + 1, -1, dtype=np.int64)  # Abbildung alter -> neuer Dreiecksindex (letzter Eintrag für -1).
+        dirty = np.zeros(self.valid.shape, dtype=bool)  # Neu zu berechnende Knoten.
+        for key, i in old_keys.items():  # Alte Dreiecke.
+            if key in new_keys:  # Dreieck unverändert vorhanden.
+                remap[i] = new_keys[key]  # Übernimmt den neuen Index.
+            else:  # Dreieck entfernt oder verändert.
+                self._mark(dirty, old.triangles[i])  # Markiert seinen Bereich.
+        for key, i in new_keys.items():  # Neue Dreiecke.
+            if key not in old_keys:  # Dreieck ist neu.
+                self._mark(dirty, engine.triangles[i])  # Markiert seinen Bereich.
+        self.triangle_ids = remap[self.triangle_ids]  # Überträgt die Indizes unveränderter Dreiecke (-1 bleibt -1).
+        if dirty.any():  # Nur wenn Knoten betroffen sind.
+            offsets, valid, triangle_ids = engine.interpolate_batch(self._nodes()[dirty.ravel()])  # Berechnet nur die betroffenen Knoten.
+            self.offsets[dirty] = offsets  # Übernimmt die Offsets.
+            self.valid[dirty] = valid  # Übernimmt die Gültigkeit.
+            self.triangle_ids[dirty] = triangle_ids  # Übernimmt die Dreiecke.
+        self.engine = engine  # Merkt sich die neue Engine.
+        return int(dirty.sum())  # Anzahl neu berechneter Knoten.
+
+    def _mark(self, dirty, triangle):  # Private Methode: markiert die Knoten im Begrenzungsrechteck eines Dreiecks.
+        import numpy as np  # Lädt NumPy erst bei Bedarf.
+        xs = [p[0] for p in triangle]  # x-Koordinaten der Ecken.
+        ys = [p[1] for p in triangle]  # y-Koordinaten der Ecken.
+        x0 = np.searchsorted(self.xs, min(xs) - self.step)  # Erste betroffene Spalte (mit Rand).
+        x1 = np.searchsorted(self.xs, max(xs) + self.step, side="right")  # Letzte betroffene Spalte.
+        y0 = np.searchsorted(self.ys, min(ys) - self.step)  # Erste betroffene Zeile.
+        y1 = np.searchsorted(self.ys, max(ys) + self.step, side="right")  # Letzte betroffene Zeile.
+        dirty[y0:y1, x0:x1] = True  # Markiert den Bereich.
+
+    def copy(self):  # Methode zum Kopieren des Gitters.
+        """Erzeugt eine unabhängige Kopie (z.B. für die Aktualisierung in einem Hintergrund-Thread)."""
+        other = InterpolationLattice(self.bounds, self.step)  # Neues Gitter mit gleichem Bereich.
+        other.engine = self.engine  # Gleiche Engine.
+        if self.offsets is not None:  # Nur wenn bereits berechnet.
+            other.offsets = self.offsets.copy()  # Kopiert die Offsets.
+            other.valid = self.valid.copy()  # Kopiert die Gültigkeit.
+            other.triangle_ids = self.triangle_ids.copy()  # Kopiert die Dreiecke.
+        return other  # Gibt die Kopie zurück.
+
+    def lookup(self, p):  # Methode zur bilinearen Abfrage.
+        """
+        Liest die Offsets für die Ballposition p bilinear aus dem Gitter.
+
+        Gibt (Dreieck, Offsets) zurück, wobei Dreieck das Dreieck des nächstgelegenen Knotens ist
+        (nahe Dreieckskanten nicht unbedingt das Dreieck, das p enthält – dafür InterpolationEngine.locate);
+        None, wenn p außerhalb des Gitters liegt oder nicht alle vier Nachbarknoten gültig sind
+        (z.B. am Rand der Triangulation) – dann sollte direkt die Engine gefragt werden.
+        """
+        if self.offsets is None:  # Gitter noch nicht berechnet.
+            return None  # Keine Abfrage möglich.
+        fx = (p[0] - self.bounds[0]) / self.step  # Gitterkoordinate x.
+        fy = (p[1] - self.bounds[1]) / self.step  # Gitterkoordinate y.
+        ix, iy = int(math.floor(fx)), int(math.floor(fy))  # Linke obere Zelle.
+        if ix < 0 or iy < 0 or ix + 1 >= len(self.xs) or iy + 1 >= len(self.ys):  # Außerhalb des Gitters.
+            return None  # Keine Abfrage möglich.
+        if not self.valid[iy:iy + 2, ix:ix + 2].all():  # Nicht alle vier Knoten gültig.
+            return None  # Rückfall auf die Engine.
+        tx, ty = fx - ix, fy - iy  # Anteile innerhalb der Zelle.
+        cell = self.offsets[iy:iy + 2, ix:ix + 2]  # Offsets der vier Knoten (2, 2, Spieler, 2).
+        top = cell[0, 0] * (1 - tx) + cell[0, 1] * tx  # Interpolation der oberen Kante.
+        bottom = cell[1, 0] * (1 - tx) + cell[1, 1] * tx  # Interpolation der unteren Kante.
+        offsets = top * (1 - ty) + bottom * ty  # Interpolation zwischen den Kanten.
+        nearest = self.triangle_ids[iy + int(round(ty)), ix + int(round(tx))]  # Dreieck des nächsten Knotens.
+        return self.engine.triangles[nearest], [tuple(o) for o in offsets.tolist()]  # Gibt Dreieck und Offsets zurück.
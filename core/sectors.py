@@ -0,0 +1,15 @@
+import math  # Importiert das math-Modul für mathematische Operationen.
+
+
+def attack_sector_arc(ball_x, ball_y, court_width, net_y):  # Berechnet den Bogen des Angriffssektors
+    """
+    Berechnet den Bogen des Angriffssektors vom Ball zu den beiden Netzenden.
+
+    Gibt (radius, start_angle, sweep_angle) zurück: den dynamischen Radius (Platz vom Ball
+    bis zum unteren Spielfeldrand) sowie Start- und Ausdehnungswinkel in Grad im Format
+    von QPainterPath.arcTo.
+    """
+    radius = net_y * 2 - ball_y  # Dynamischer Radius basierend auf Ballposition und Netzhöhe.
+    angle_left = math.degrees(math.atan2(ball_y - net_y, 0 - ball_x))  # Winkel zum linken Netzende.
+    angle_right = math.degrees(math.atan2(ball_y - net_y, court_width - ball_x))  # Winkel zum rechten Netzende.
+    return radius, angle_left, angle_right - angle_left  # Radius, Start- und Ausdehnungswinkel.
@@ -0,0 +1,31 @@
+SHADOW_MAX_DISTANCE = 150 # Schatten nur, wenn Abstand plus Spielerdurchmesser darunter liegt (heuristischer Wert)
+SHADOW_ARC_RADIUS = 250 # Radius des Schattenbogens
+
+
+def compute_block_shadows(centers, radii, net_y, scale, ball_x, ball_y): # Berechnet die Schattengeometrie für mehrere Spieler
+    """
+    Berechnet die Blockschatten aller übergebenen Spieler in einem NumPy-Durchlauf.
+
+    Parameter:
+        centers: (N, 2)-Array der Spielermittelpunkte
+        radii, net_y, scale: (N,)-Arrays mit Spielerradius, Netzposition und Maßstab
+        ball_x, ball_y: Ballmittelpunkt
+
+    Rückgabe:
+        (in_band, visible, start_deg, sweep_deg, fraction) als (N,)-Arrays;
+        in_band ist False für Spieler weiter als 1 Meter vom Netz, visible nur für
+        Spieler mit sichtbarem Schatten gesetzt.
+    """
+    import numpy as np # Lädt NumPy erst bei Bedarf
+    dx = centers[:, 0] - ball_x # Differenz der X-Koordinaten von Spieler und Ball
+    dy = centers[:, 1] - ball_y # Differenz der Y-Koordinaten von Spieler und Ball
+    d = np.hypot(dx, dy) # Distanz zwischen Spieler und Ball
+    in_band = np.abs(centers[:, 1] - net_y) <= scale # Spieler innerhalb von 1 Meter zum Netz
+    visible = in_band & (d > 0) & (d + 2 * radii <= SHADOW_MAX_DISTANCE) # Spieler mit sichtbarem Schatten
+    safe_d = np.where(d > 0, d, 1.0) # Vermeidet Division durch Null
+    theta = np.arctan2(dy, dx) # Winkel zwischen Spieler und Ball
+    alpha = np.arcsin(np.minimum(radii / safe_d, 1.0)) # Winkel des Tangentenabschnitts
+    start_deg = -np.degrees(theta - alpha) # Startwinkel des Bogens in Grad
+    sweep_deg = -np.degrees(2 * alpha) # Ausdehnungswinkel des Bogens in Grad
+    fraction = np.minimum(d / SHADOW_ARC_RADIUS, 1.0) # Anteil der Distanz am Bogenradius
+    return in_band, visible, start_deg, sweep_deg, fraction # Gibt die Ergebnisse zurück
@@ -0,0 +1,122 @@
+import math  # Importiert das math-Modul für mathematische Operationen.
+
+# Ziel: durchschnittlich so viele Dreiecke pro Gitterzelle
+TRIANGLES_PER_CELL = 2  # Wenige Kandidaten pro Zelle halten die Abfrage kurz.
+
+
+class TriangleGrid:  # Definiert ein gleichmäßiges Gitter als räumlichen Index über Dreiecke.
+    """
+    Gleichmäßiges Gitter (Spatial Hash) über die Begrenzungsrechtecke von Dreiecken.
+
+    Jede Zelle enthält die Indizes aller Dreiecke, deren Begrenzungsrechteck die Zelle
+    überlappt. Eine Punktabfrage muss damit nur die wenigen Dreiecke einer Zelle prüfen,
+    unabhängig davon, wie viele Dreiecke insgesamt existieren.
+    """
+
+    def __init__(self, triangles=(), cell_size=None):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            triangles: Liste von Dreiecken ((ax, ay), (bx, by), (cx, cy))
+            cell_size: Kantenlänge einer Zelle oder None für automatische Wahl
+        """
+        self.cells = {}  # Zellen: (ix, iy) -> Liste von Dreiecksindizes.
+        self.cell_size = cell_size or self._auto_cell_size(triangles)  # Setzt die Zellgröße.
+        for index, triangle in enumerate(triangles):  # Trägt alle Dreiecke ein.
+            self.insert(index, triangle)
+
+    @staticmethod
+    def _auto_cell_size(triangles):  # Private Methode zur Wahl einer passenden Zellgröße.
+        if not triangles:  # Ohne Dreiecke.
+            return 1.0  # Beliebige Standardgröße.
+        xs = [p[0] for tri in triangles for p in tri]  # Alle x-Koordinaten.
+        ys = [p[1] for tri in triangles for p in tri]  # Alle y-Koordinaten.
+        area = max((max(xs) - min(xs)) * (max(ys) - min(ys)), 1e-6)  # Fläche des Begrenzungsrechtecks.
+        return max(math.sqrt(area * TRIANGLES_PER_CELL / len(triangles)), 1e-3)  # Zellgröße für ca. TRIANGLES_PER_CELL Dreiecke je Zelle.
+
+    def _cell_range(self, triangle):  # Private Methode: Zellbereich eines Dreiecks.
+        xs = [p[0] for p in triangle]  # x-Koordinaten der Ecken.
+        ys = [p[1] for p in triangle]  # y-Koordinaten der Ecken.
+        x0, x1 = int(math.floor(min(xs) / self.cell_size)), int(math.floor(max(xs) / self.cell_size))  # Zellspalten.
+        y0, y1 = int(math.floor(min(ys) / self.cell_size)), int(math.floor(max(ys) / self.cell_size))  # Zellzeilen.
+        return x0, x1, y0, y1  # Gibt den Bereich zurück.
+
+    def insert(self, index, triangle):  # Methode zum Eintragen eines Dreiecks.
+        x0, x1, y0, y1 = self._cell_range(triangle)  # Ermittelt die überlappten Zellen.
+        for ix in range(x0, x1 + 1):  # Für jede Spalte.
+            for iy in range(y0, y1 + 1):  # Für jede Zeile.
+                self.cells.setdefault((ix, iy), []).append(index)  # Trägt das Dreieck ein.
+
+    def remove(self, index, triangle):  # Methode zum Austragen eines Dreiecks.
+        x0, x1, y0, y1 = self._cell_range(triangle)  # Ermittelt die überlappten Zellen.
+        for ix in range(x0, x1 + 1):  # Für jede Spalte.
+            for iy in range(y0, y1 + 1):  # Für jede Zeile.
+                cell = self.cells.get((ix, iy))  # Holt die Zelle.
+                if cell is not None and index in cell:  # Wenn das Dreieck eingetragen ist.
+                    cell.remove(index)  # Trägt es aus.
+                    if not cell:  # Leere Zellen werden entfernt.
+                        del self.cells[(ix, iy)]
+
+    def candidates(self, x, y):  # Methode zur Abfrage der Kandidaten für einen Punkt.
+        """Gibt die Indizes der Dreiecke zurück, deren Begrenzungsrechteck die Zelle von (x, y) überlappt."""
+        key = (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))  # Zelle des Punktes.
+        return self.cells.get(key, ())  # Gibt die Kandidaten zurück (leer, wenn keine).
+
+    def copy(self):  # Methode zum Kopieren des Index.
+        """Erzeugt eine unabhängige Kopie des Gitters."""
+        other = TriangleGrid(cell_size=self.cell_size)  # Leeres Gitter mit gleicher Zellgröße.
+        other.cells = {key: list(cell) for key, cell in self.cells.items()}  # Kopiert die Zellen.
+        return other  # Gibt die Kopie zurück.
+
+
+class PointGrid:  # Definiert ein gleichmäßiges Gitter als räumlichen Index über Punkte.
+    """
+    Gleichmäßiges Gitter (Spatial Hash) über Punkte, z.B. die gespeicherten Ballpositionen.
+
+    Ist die Zellgröße mindestens so groß wie der Suchradius, muss eine Abfrage nur die
+    3x3 Zellen um den Punkt prüfen, unabhängig davon, wie viele Punkte gespeichert sind.
+    """
+
+    def __init__(self, points=(), cell_size=1.0):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            points: Liste von Punkten (x, y); der Listenindex dient als Kennung
+            cell_size: Kantenlänge einer Zelle (sinnvoll: Suchradius)
+        """
+        self.cells = {}  # Zellen: (ix, iy) -> Liste von (Index, x, y).
+        self.cell_size = cell_size  # Setzt die Zellgröße.
+        for index, point in enumerate(points):  # Trägt alle Punkte ein.
+            self.insert(index, point)
+
+    def _key(self, x, y):  # Private Methode: Zelle eines Punktes.
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))  # Zellspalte und -zeile.
+
+    def insert(self, index, point):  # Methode zum Eintragen eines Punktes.
+        self.cells.setdefault(self._key(point[0], point[1]), []).append((index, point[0], point[1]))  # Trägt den Punkt ein.
+
+    def remove(self, index, point):  # Methode zum Austragen eines Punktes.
+        key = self._key(point[0], point[1])  # Zelle des Punktes.
+        cell = self.cells.get(key)  # Holt die Zelle.
+        if cell is None:  # Punkt nicht eingetragen.
+            return
+        cell[:] = [entry for entry in cell if entry[0] != index]  # Trägt den Punkt aus.
+        if not cell:  # Leere Zellen werden entfernt.
+            del self.cells[key]
+
+    def shift(self, start, delta):  # Methode zum Verschieben der Kennungen.
+        """Ändert alle Kennungen >= start um delta (nach Einfügen oder Löschen in der zugehörigen Liste)."""
+        for cell in self.cells.values():  # Für jede Zelle.
+            if any(entry[0] >= start for entry in cell):  # Nur Zellen mit betroffenen Kennungen neu aufbauen.
+                cell[:] = [(index + delta if index >= start else index, x, y) for index, x, y in cell]
+
+    def nearest(self, x, y, radius):  # Methode zur Suche des nächsten Punktes im Radius.
+        """Gibt den Index des nächsten Punktes mit Abstand <= radius zurück oder None."""
+        reach = int(math.ceil(radius / self.cell_size))  # Anzahl der zu prüfenden Nachbarzellen je Richtung.
+        cx, cy = self._key(x, y)  # Zelle des Suchpunktes.
+        best, best_dist = None, radius  # Bester Treffer bisher.
+        for ix in range(cx - reach, cx + reach + 1):  # Für jede Spalte.
+            for iy in range(cy - reach, cy + reach + 1):  # Für jede Zeile.
+                for index, px, py in self.cells.get((ix, iy), ()):  # Für jeden Punkt der Zelle.
+                    dist = math.hypot(x - px, y - py)  # Abstand zum Suchpunkt.
+                    if dist < best_dist or (dist == best_dist and (best is None or index < best)):  # Näher (bei Gleichstand kleinerer Index).
+                        best, best_dist = index, dist
+        return best  # Gibt den Index zurück (None, wenn keiner im Radius liegt).
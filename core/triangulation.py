@@ -0,0 +1,345 @@
+import math  # Importiert das math-Modul für mathematische Operationen.
+
+# Mindestqualität eines Dreiecks (1.0 = gleichseitig, 0.0 = entartet); flachere Dreiecke werden verworfen
+MIN_TRIANGLE_QUALITY = 0.05  # Entspricht grob einem Mindestwinkel von ca. 3 Grad.
+# Abstand, unterhalb dessen zwei Punkte als identisch gelten
+DUPLICATE_EPSILON = 1e-9  # Toleranz für doppelte Ballpositionen.
+# Faktor, um den das Hilfsdreieck größer als die Punktwolke ist
+SUPER_TRIANGLE_SCALE = 1000.0  # Groß genug, damit die Hülle nicht verfälscht wird.
+
+
+def orientation(a, b, c):  # Definiert eine Funktion zur Bestimmung der Orientierung von drei Punkten.
+    """
+    Gibt das doppelte, vorzeichenbehaftete Flächenmaß des Dreiecks abc zurück.
+    Positiv bei Gegenuhrzeigersinn, negativ bei Uhrzeigersinn, 0 bei Kollinearität.
+    """
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])  # Kreuzprodukt der Kantenvektoren.
+
+
+def in_circumcircle(a, b, c, p):  # Definiert eine Funktion für den Umkreistest.
+    """
+    Prüft, ob p echt innerhalb des Umkreises des gegen den Uhrzeigersinn
+    orientierten Dreiecks abc liegt.
+    """
+    adx, ady = a[0] - p[0], a[1] - p[1]  # Verschiebt a relativ zu p (verbessert die Genauigkeit).
+    bdx, bdy = b[0] - p[0], b[1] - p[1]  # Verschiebt b relativ zu p.
+    cdx, cdy = c[0] - p[0], c[1] - p[1]  # Verschiebt c relativ zu p.
+    det = ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)  # Determinante des Umkreistests (erster Term).
+           + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)  # Zweiter Term.
+           + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))  # Dritter Term.
+    return det > 0  # Positiv bedeutet: p liegt im Umkreis.
+
+
+def triangle_quality(a, b, c):  # Definiert eine Funktion zur Bewertung der Dreiecksform.
+    """
+    Normierte Formqualität eines Dreiecks: 4*sqrt(3)*Fläche / Summe der Kantenquadrate.
+    Ein gleichseitiges Dreieck hat die Qualität 1, ein entartetes die Qualität 0.
+    """
+    squares = ((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2  # Quadrat der Kante ab.
+               + (c[0] - b[0]) ** 2 + (c[1] - b[1]) ** 2  # Quadrat der Kante bc.
+               + (a[0] - c[0]) ** 2 + (a[1] - c[1]) ** 2)  # Quadrat der Kante ca.
+    if squares == 0:  # Alle Punkte identisch.
+        return 0.0  # Entartetes Dreieck.
+    area = abs(orientation(a, b, c)) / 2  # Fläche des Dreiecks.
+    return 4 * math.sqrt(3) * area / squares  # Normierte Qualität zwischen 0 und 1.
+
+
+class DelaunayTriangulation:  # Definiert eine Klasse für die inkrementelle Delaunay-Triangulation.
+    """
+    Inkrementelle Delaunay-Triangulation (Bowyer-Watson) über die Ballpositionen der Formationen.
+
+    Statt alle Dreieckskombinationen zu bilden (O(n³)), entsteht hier ein überlappungsfreies
+    Dreiecksnetz mit O(n) Dreiecken. Da die Dreiecke sich nicht überlappen, ist das Dreieck,
+    das eine Ballposition enthält, automatisch das "kleinste umschließende" aus der Nachbarschaft.
+    Die Punkte werden in räumlich sortierter Reihenfolge eingefügt und per Walk lokalisiert,
+    wodurch der Aufbau in der Praxis nahezu O(n log n) ist.
+    """
+
+    def __init__(self, points=(), min_quality=MIN_TRIANGLE_QUALITY):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            points: Iterierbare Folge von (x, y)-Punkten
+            min_quality: Dreiecke mit geringerer Formqualität werden bei triangles() verworfen
+        """
+        self.min_quality = min_quality  # Speichert die Mindestqualität für Dreiecke.
+        self.points = [(float(p[0]), float(p[1])) for p in points]  # Speichert die Eingabepunkte.
+        self._build()  # Baut die Triangulation auf.
+
+    def _build(self):  # Private Methode zum vollständigen Aufbau der Triangulation.
+        self._vertices = []  # Interne Eckpunkte (die ersten drei gehören zum Hilfsdreieck).
+        self._vertex_of_point = []  # Zuordnung Eingabepunkt -> interner Eckpunkt.
+        self._point_of_vertex = {}  # Zuordnung interner Eckpunkt -> erster Eingabepunkt.
+        self._triangles = {}  # Dreiecke: id -> (a, b, c) gegen den Uhrzeigersinn.
+        self._edges = {}  # Gerichtete Kanten: (a, b) -> Dreiecks-id.
+        self._next_id = 0  # Nächste freie Dreiecks-id.
+        self._last = None  # Zuletzt erzeugtes Dreieck als Startpunkt für den Walk.
+        self._added = set()  # Seit take_changes() neu erzeugte Dreiecke.
+        self._removed = set()  # Seit take_changes() entfernte Dreiecke.
+        self._reset = True  # Vollständiger Neuaufbau seit take_changes().
+        self._create_super_triangle(self.points)  # Legt das Hilfsdreieck um alle Punkte an.
+        self._vertex_of_point = [None] * len(self.points)  # Reserviert Platz für die Zuordnung.
+        # Räumlich sortierte Einfügereihenfolge, damit der Walk kurz bleibt
+        order = sorted(range(len(self.points)), key=lambda i: self._sort_key(self.points[i]))  # Sortiert die Punkte entlang einer Z-Kurve.
+        for i in order:  # Fügt alle Punkte nacheinander ein.
+            self._vertex_of_point[i] = self._insert(self.points[i], i)  # Merkt sich den internen Eckpunkt.
+
+    def _create_super_triangle(self, points):  # Private Methode zum Anlegen des Hilfsdreiecks.
+        if points:  # Wenn Punkte vorhanden sind.
+            xs = [p[0] for p in points]  # Alle x-Koordinaten.
+            ys = [p[1] for p in points]  # Alle y-Koordinaten.
+            min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)  # Begrenzungsrechteck.
+        else:  # Ohne Punkte wird ein Standardbereich verwendet.
+            min_x, max_x, min_y, max_y = 0.0, 1.0, 0.0, 1.0  # Einheitsquadrat als Platzhalter.
+        self._bounds = (min_x, min_y, max_x, max_y)  # Speichert das Begrenzungsrechteck für die Sortierung.
+        cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2  # Mittelpunkt der Punktwolke.
+        size = max(max_x - min_x, max_y - min_y, 1.0) * SUPER_TRIANGLE_SCALE  # Ausdehnung des Hilfsdreiecks.
+        self._vertices = [  # Drei Eckpunkte des Hilfsdreiecks gegen den Uhrzeigersinn.
+            (cx - 2 * size, cy - size),
+            (cx + 2 * size, cy - size),
+            (cx, cy + 2 * size),
+        ]
+        self._add_triangle(0, 1, 2)  # Legt das Hilfsdreieck als erstes Dreieck an.
+
+    def _sort_key(self, p):  # Private Methode für die räumliche Sortierung (Z-Kurve).
+        min_x, min_y, max_x, max_y = self._bounds  # Begrenzungsrechteck der Punkte.
+        w = max(max_x - min_x, 1e-12)  # Breite (gegen Division durch Null geschützt).
+        h = max(max_y - min_y, 1e-12)  # Höhe (gegen Division durch Null geschützt).
+        ix = int(min(max((p[0] - min_x) / w, 0.0), 1.0) * 1023)  # Quantisierte x-Koordinate (10 Bit).
+        iy = int(min(max((p[1] - min_y) / h, 0.0), 1.0) * 1023)  # Quantisierte y-Koordinate (10 Bit).
+        key = 0  # Morton-Schlüssel.
+        for bit in range(10):  # Verschränkt die Bits von x und y.
+            key |= ((ix >> bit) & 1) << (2 * bit) | ((iy >> bit) & 1) << (2 * bit + 1)  # Setzt je ein Bit von x und y.
+        return key  # Gibt den Schlüssel zurück.
+
+    def _add_triangle(self, a, b, c):  # Private Methode zum Anlegen eines Dreiecks.
+        tid = self._next_id  # Vergibt eine neue id.
+        self._next_id += 1  # Erhöht den Zähler.
+        self._triangles[tid] = (a, b, c)  # Speichert das Dreieck.
+        self._added.add(tid)  # Protokolliert das neue Dreieck.
+        self._edges[(a, b)] = tid  # Registriert die gerichteten Kanten.
+        self._edges[(b, c)] = tid
+        self._edges[(c, a)] = tid
+        self._last = tid  # Merkt sich das Dreieck als Startpunkt für den nächsten Walk.
+        return tid  # Gibt die id zurück.
+
+    def _remove_triangle(self, tid):  # Private Methode zum Entfernen eines Dreiecks.
+        a, b, c = self._triangles.pop(tid)  # Entfernt das Dreieck.
+        if tid in self._added:  # Dreieck wurde erst seit dem letzten Abruf erzeugt.
+            self._added.discard(tid)  # Taucht in den Änderungen gar nicht auf.
+        else:  # Dreieck war bereits bekannt.
+            self._removed.add(tid)  # Protokolliert das Entfernen.
+        for edge in ((a, b), (b, c), (c, a)):  # Entfernt die gerichteten Kanten.
+            if self._edges.get(edge) == tid:  # Nur wenn die Kante noch zu diesem Dreieck gehört.
+                del self._edges[edge]
+
+    def _locate(self, p):  # Private Methode zur Punktlokalisierung per Walk.
+        """Sucht das Dreieck, das p enthält, indem von Nachbar zu Nachbar gelaufen wird."""
+        tid = self._last if self._last in self._triangles else next(iter(self._triangles))  # Startdreieck.
+        for _ in range(len(self._triangles) + 3):  # Begrenzt die Schritte (ein Delaunay-Walk ist zyklenfrei).
+            tri = self._triangles[tid]  # Aktuelles Dreieck.
+            for k in range(3):  # Prüft alle drei Kanten.
+                a, b = tri[k], tri[(k + 1) % 3]  # Kante a -> b.
+                if orientation(self._vertices[a], self._vertices[b], p) < 0:  # p liegt jenseits dieser Kante.
+                    neighbour = self._edges.get((b, a))  # Nachbardreieck über diese Kante.
+                    if neighbour is not None:  # Wenn ein Nachbar existiert.
+                        tid = neighbour  # Läuft zum Nachbarn.
+                        break  # Prüft das neue Dreieck.
+            else:  # Keine Kante trennt p vom Dreieck.
+                return tid  # Dreieck gefunden.
+        # Rückfall: lineare Suche (sollte praktisch nie nötig sein)
+        for tid, (a, b, c) in self._triangles.items():  # Durchsucht alle Dreiecke.
+            va, vb, vc = self._vertices[a], self._vertices[b], self._vertices[c]  # Eckpunkte.
+            if orientation(va, vb, p) >= 0 and orientation(vb, vc, p) >= 0 and orientation(vc, va, p) >= 0:  # p liegt im Dreieck.
+                return tid  # Dreieck gefunden.
+        return None  # p liegt außerhalb des Hilfsdreiecks.
+
+    def _insert(self, p, point_index):  # Private Methode zum Einfügen eines Punktes (Bowyer-Watson).
+        tid = self._locate(p)  # Sucht das Dreieck, das p enthält.
+        if tid is None:  # p liegt außerhalb des Hilfsdreiecks.
+            raise ValueError("Punkt liegt außerhalb des Triangulationsbereichs")  # Sollte durch das große Hilfsdreieck nicht passieren.
+        for v in self._triangles[tid]:  # Prüft auf doppelte Punkte.
+            q = self._vertices[v]  # Eckpunkt des Dreiecks.
+            if abs(q[0] - p[0]) <= DUPLICATE_EPSILON and abs(q[1] - p[1]) <= DUPLICATE_EPSILON:  # Punkt existiert bereits.
+                return v  # Verwendet den vorhandenen Eckpunkt.
+
+        v = len(self._vertices)  # Index des neuen Eckpunkts.
+        self._vertices.append(p)  # Speichert den neuen Eckpunkt.
+        self._point_of_vertex[v] = point_index  # Merkt sich den Eingabepunkt.
+
+        # Hohlraum bestimmen: alle Dreiecke, deren Umkreis p enthält (zusammenhängend ab tid)
+        bad = {tid}  # Dreiecke, die entfernt werden müssen.
+        stack = [tid]  # Stapel für die Breitensuche.
+        while stack:  # Solange noch Dreiecke zu prüfen sind.
+            a, b, c = self._triangles[stack.pop()]  # Nächstes Dreieck.
+            for x, y in ((a, b), (b, c), (c, a)):  # Prüft alle Nachbarn.
+                n = self._edges.get((y, x))  # Nachbar über die Kante.
+                if n is None or n in bad:  # Kein Nachbar oder schon erfasst.
+                    continue  # Überspringt den Nachbarn.
+                na, nb, nc = self._triangles[n]  # Eckpunkte des Nachbarn.
+                if in_circumcircle(self._vertices[na], self._vertices[nb], self._vertices[nc], p):  # p liegt im Umkreis.
+                    bad.add(n)  # Nachbar gehört zum Hohlraum.
+                    stack.append(n)  # Nachbar wird weiter untersucht.
+
+        # Randkanten des Hohlraums sammeln
+        boundary = []  # Liste der Randkanten.
+        for t in bad:  # Für jedes Dreieck im Hohlraum.
+            a, b, c = self._triangles[t]  # Eckpunkte.
+            for x, y in ((a, b), (b, c), (c, a)):  # Alle Kanten.
+                if self._edges.get((y, x)) not in bad:  # Kante grenzt nicht an ein anderes Hohlraum-Dreieck.
+                    boundary.append((x, y))  # Kante liegt auf dem Rand.
+        for t in bad:  # Entfernt alle Hohlraum-Dreiecke.
+            self._remove_triangle(t)
+        for x, y in boundary:  # Verbindet jede Randkante mit dem neuen Punkt.
+            self._add_triangle(x, y, v)
+        return v  # Gibt den neuen Eckpunkt zurück.
+
+    def add_point(self, p):  # Methode zum Hinzufügen eines weiteren Punktes.
+        """Fügt einen Punkt hinzu und gibt seinen Index in self.points zurück."""
+        p = (float(p[0]), float(p[1]))  # Normalisiert den Punkt.
+        self.points.append(p)  # Speichert den Punkt.
+        index = len(self.points) - 1  # Index des neuen Punktes.
+        v0, v1, v2 = self._vertices[0], self._vertices[1], self._vertices[2]  # Eckpunkte des Hilfsdreiecks.
+        if orientation(v0, v1, p) <= 0 or orientation(v1, v2, p) <= 0 or orientation(v2, v0, p) <= 0:  # Punkt außerhalb des Hilfsdreiecks.
+            self._build_from_points()  # Baut die Triangulation mit größerem Hilfsdreieck neu auf.
+        else:  # Punkt liegt im Hilfsdreieck.
+            self._vertex_of_point.append(self._insert(p, index))  # Fügt den Punkt inkrementell ein.
+        return index  # Gibt den Index zurück.
+
+    def remove_point(self, index):  # Methode zum Entfernen eines Punktes.
+        """
+        Entfernt den Punkt mit dem Index index. Die Indizes der übrigen Punkte bleiben
+        unverändert (self.points[index] wird None). Nur die Dreiecke um den Punkt werden neu gebildet.
+        """
+        v = self._vertex_of_point[index]  # Interner Eckpunkt des Punktes.
+        self.points[index] = None  # Markiert den Punkt als entfernt.
+        self._vertex_of_point[index] = None  # Löst die Zuordnung.
+        if self._point_of_vertex.get(v) != index:  # Punkt war ein Duplikat eines anderen Punktes.
+            return  # Die Triangulation bleibt unverändert.
+        others = [i for i, w in enumerate(self._vertex_of_point) if w == v]  # Weitere Punkte an derselben Stelle.
+        if others:  # Ein Duplikat übernimmt den Eckpunkt.
+            self._point_of_vertex[v] = others[0]  # Verweist auf das Duplikat.
+            touching = [t for t, tri in self._triangles.items() if v in tri]  # Dreiecke am Eckpunkt.
+            self._removed.update(touching)  # Als entfernt und neu melden, da sie jetzt auf einen
+            self._added.update(touching)  # anderen Punktindex verweisen.
+            return  # Die Geometrie bleibt unverändert.
+        del self._point_of_vertex[v]  # Entfernt die Rückzuordnung.
+        self._remove_vertex(v)  # Entfernt den Eckpunkt aus der Triangulation.
+
+    def move_point(self, index, p):  # Methode zum Verschieben eines Punktes.
+        """Verschiebt einen Punkt; gibt seinen neuen Index zurück (Entfernen + Einfügen)."""
+        self.remove_point(index)  # Entfernt den Punkt an der alten Stelle.
+        return self.add_point(p)  # Fügt ihn an der neuen Stelle ein.
+
+    def _remove_vertex(self, v):  # Private Methode zum Entfernen eines Eckpunkts.
+        """
+        Entfernt die Dreiecke um v und trianguliert das entstandene sternförmige Loch neu,
+        indem nacheinander "Ohren" abgeschnitten werden, deren Umkreis keinen anderen
+        Randpunkt enthält (so bleibt die Delaunay-Eigenschaft erhalten).
+        """
+        start = self._locate(self._vertices[v])  # Ein Dreieck, das v enthält.
+        if start is None or v not in self._triangles[start]:  # Sollte nicht vorkommen.
+            self._build_from_points()  # Rückfall: vollständiger Neuaufbau.
+            return  # Beendet die Methode.
+        # Rand des Lochs gegen den Uhrzeigersinn einsammeln
+        ring = []  # Randpunkte des Lochs.
+        star = []  # Dreiecke um v.
+        tid = start  # Beginnt beim gefundenen Dreieck.
+        while True:  # Läuft einmal um v herum.
+            tri = self._triangles[tid]  # Aktuelles Dreieck.
+            k = tri.index(v)  # Position von v im Dreieck.
+            a, b = tri[(k + 1) % 3], tri[(k + 2) % 3]  # Gegenüberliegende Kante a -> b.
+            star.append(tid)  # Merkt sich das Dreieck.
+            ring.append(a)  # Merkt sich den Randpunkt.
+            tid = self._edges.get((v, b))  # Nächstes Dreieck um v (teilt die Kante v -> b).
+            if tid is None or tid == start:  # Einmal herum (oder Rand erreicht).
+                break  # Beendet den Umlauf.
+        if tid is None:  # v lag am Rand der Triangulation (sollte wegen des Hilfsdreiecks nicht vorkommen).
+            self._build_from_points()  # Rückfall: vollständiger Neuaufbau.
+            return  # Beendet die Methode.
+        for t in star:  # Entfernt alle Dreiecke um v.
+            self._remove_triangle(t)
+        # Loch durch Abschneiden von Delaunay-Ohren füllen
+        while len(ring) > 3:  # Solange mehr als ein Dreieck übrig ist.
+            count = len(ring)  # Anzahl der Randpunkte.
+            fallback = None  # Erstes konvexes Ohr (falls numerisch kein leerer Umkreis gefunden wird).
+            for i in range(count):  # Prüft alle möglichen Ohren.
+                a, b, c = ring[i], ring[(i + 1) % count], ring[(i + 2) % count]  # Drei aufeinanderfolgende Randpunkte.
+                va, vb, vc = self._vertices[a], self._vertices[b], self._vertices[c]  # Ihre Koordinaten.
+                if orientation(va, vb, vc) <= 0:  # Nicht konvex.
+                    continue  # Kein Ohr.
+                if fallback is None:  # Merkt sich das erste konvexe Ohr.
+                    fallback = i
+                if not any(in_circumcircle(va, vb, vc, self._vertices[w]) for w in ring if w not in (a, b, c)):  # Umkreis ist leer.
+                    break  # Ohr gefunden.
+            else:  # Kein Ohr mit leerem Umkreis gefunden.
+                i = fallback if fallback is not None else 0  # Verwendet das erste konvexe Ohr.
+            a, b, c = ring[i], ring[(i + 1) % count], ring[(i + 2) % count]  # Eckpunkte des Ohrs.
+            self._add_triangle(a, b, c)  # Erzeugt das Dreieck.
+            del ring[(i + 1) % count]  # Entfernt die Ohrspitze aus dem Rand.
+        self._add_triangle(ring[0], ring[1], ring[2])  # Letztes Dreieck.
+
+    def _build_from_points(self):  # Private Methode: Neuaufbau aus self.points (entfernte Punkte bleiben None).
+        points = self.points  # Aktuelle Punkte (mit Lücken).
+        self.points = [p for p in points if p is not None]  # Temporär ohne Lücken.
+        positions = [i for i, p in enumerate(points) if p is not None]  # Ursprüngliche Indizes.
+        self._build()  # Baut die Triangulation auf.
+        vertex_of_point = [None] * len(points)  # Zuordnung mit den ursprünglichen Indizes.
+        for new, old in enumerate(positions):  # Überträgt die Zuordnung.
+            vertex_of_point[old] = self._vertex_of_point[new]
+        self._point_of_vertex = {v: positions[i] for v, i in self._point_of_vertex.items()}  # Rückzuordnung mit ursprünglichen Indizes.
+        self._vertex_of_point = vertex_of_point  # Übernimmt die Zuordnung.
+        self.points = points  # Stellt die Punkte mit Lücken wieder her.
+
+    def take_changes(self):  # Methode zum Abruf der Änderungen seit dem letzten Aufruf.
+        """
+        Gibt (entfernte_ids, neue_ids) der seit dem letzten Aufruf geänderten Dreiecke zurück
+        oder None, wenn die Triangulation inzwischen vollständig neu aufgebaut wurde.
+        """
+        changes = None if self._reset else (self._removed, self._added)  # Ergebnis.
+        self._added, self._removed, self._reset = set(), set(), False  # Setzt das Protokoll zurück.
+        return changes  # Gibt die Änderungen zurück.
+
+    def triangle(self, tid):  # Methode zur Abfrage eines einzelnen Dreiecks.
+        """
+        Gibt das Dreieck tid als Index-Tripel in self.points zurück oder None, wenn es nicht
+        nutzbar ist (am Hilfsdreieck, entartet/sehr flach oder nicht mehr vorhanden).
+        """
+        tri = self._triangles.get(tid)  # Holt das Dreieck.
+        if tri is None:  # Dreieck existiert nicht (mehr).
+            return None  # Nicht nutzbar.
+        a, b, c = tri  # Eckpunkte.
+        if a < 3 or b < 3 or c < 3:  # Dreieck hängt am Hilfsdreieck.
+            return None  # Wird nicht ausgegeben.
+        if triangle_quality(self._vertices[a], self._vertices[b], self._vertices[c]) < self.min_quality:  # Dreieck ist zu flach.
+            return None  # Wird verworfen (würde sonst zu unsinnigen Gewichten führen).
+        return (self._point_of_vertex[a], self._point_of_vertex[b], self._point_of_vertex[c])  # Index-Tripel.
+
+    def triangle_items(self):  # Methode zur Abfrage aller nutzbaren Dreiecke mit ihren ids.
+        """Gibt ein Dictionary id -> (i, j, k) aller nutzbaren Dreiecke zurück."""
+        result = {}  # Ergebnis.
+        for tid in self._triangles:  # Durchläuft alle Dreiecke.
+            tri = self.triangle(tid)  # Prüft und übersetzt das Dreieck.
+            if tri is not None:  # Nur nutzbare Dreiecke.
+                result[tid] = tri
+        return result  # Gibt die Dreiecke zurück.
+
+    def triangles(self):  # Methode zur Abfrage der nutzbaren Dreiecke.
+        """
+        Gibt die Dreiecke als Liste von Index-Tripeln (i, j, k) in self.points zurück.
+        Dreiecke am Hilfsdreieck sowie entartete/sehr flache Dreiecke werden ausgelassen.
+        """
+        return list(self.triangle_items().values())  # Gibt die Dreiecke zurück.
+
+
+def delaunay_triangles(points, min_quality=MIN_TRIANGLE_QUALITY):  # Definiert eine Hilfsfunktion für den einmaligen Aufbau.
+    """
+    Trianguliert die Punkte und gibt die Dreiecke als Index-Tripel zurück.
+
+    Parameter:
+        points: Liste von (x, y)-Punkten (z.B. Ballpositionen der Formationen)
+        min_quality: Mindestformqualität, flachere Dreiecke werden verworfen
+
+    Gibt zurück:
+        Liste von (i, j, k)-Tripeln mit Indizes in points
+    """
+    return DelaunayTriangulation(points, min_quality).triangles()  # Baut die Triangulation und gibt die Dreiecke zurück.
@@ -1,15 +1,35 @@
-import json  # Importiert das json-Modul für die Arbeit mit JSON-Daten.
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QPushButton, QInputDialog, QMenu  # Importiert notwendige Widgets von PySide6 für die GUI.
+from storage import open_store  # Importiert den gemeinsamen Speicher für Formationen und Teams.
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QListView, QLineEdit, QComboBox, QPushButton, QInputDialog, QMenu  # Importiert notwendige Widgets von PySide6 für die GUI.
 from PySide6.QtCore import Qt, Signal  # Importiert Qt-Kernfunktionalitäten und das Signal-System von PySide6.
+from list_models import RecordListModel, RecordFilterProxy  # Importiert das Listenmodell und den Suchfilter.
+
+# Arten von Formationsänderungen (Feld "kind" im formationEdited-Signal)
+FORMATION_ADDED = "added"  # Neue Formation (neue Ballposition).
+FORMATION_REMOVED = "removed"  # Formation gelöscht (Ballposition entfällt).
+FORMATION_METADATA = "metadata"  # Nur Name oder Zonen geändert (ohne Einfluss auf die Interpolation).
+
+# Filter nach Ballbereich: Name und (x0, y0, x1, y1) in Metern in der Hälfte des Balls (Netz bei y = 9)
+BALL_REGIONS = [
+    ("Alle Bereiche", None),
+    ("Vorderzone", (0, 6, 9, 9)),
+    ("Hinterfeld", (0, 0, 9, 6)),
+    ("Links (Pos IV)", (0, 0, 3, 9)),
+    ("Mitte (Pos III)", (3, 0, 6, 9)),
+    ("Rechts (Pos II)", (6, 0, 9, 9)),
+]
 
 class DefensivePositionsPanel(QWidget):  # Definiert eine Klasse für das Panel der Defensivpositionen, die von QWidget erbt.
     # Sendet die ausgewählte Formation: ein Tupel (Ballposition, Liste von Spieler-Offsets)
     formationSelected = Signal(tuple)  # Definiert ein Signal, das ausgelöst wird, wenn eine Formation ausgewählt wird.
-    # Neues Signal, um alle Formationen zu senden, wenn sie geladen oder geändert wurden
-    formationsChanged = Signal(list)  # Definiert ein Signal, das bei Änderungen an den Formationen ausgelöst wird.
+    # Signal, um alle Formationen zu senden, wenn sie (neu) geladen wurden
+    formationsChanged = Signal(object)  # Definiert ein Signal, das beim Laden der Formationen ausgelöst wird (object: die Liste selbst, Signal(list) würde sie bei jedem Senden kopieren).
+    # Signal für einzelne Änderungen: {"kind": FORMATION_..., "index": int, "formation": dict (bei Löschung die entfernte)}
+    formationEdited = Signal(dict)  # Definiert ein Signal, das beschreibt, was sich an einer Formation geändert hat.
     
-    def __init__(self, get_formation_callback=None, scale_factor=None, parent=None):  # Konstruktor der Klasse.
+    def __init__(self, get_formation_callback=None, scale_factor=None, parent=None, store=None, autoload=True):  # Konstruktor der Klasse.
         super().__init__(parent)  # Ruft den Konstruktor der Basisklasse QWidget auf.
+        # Speicher-Backend (JSON oder SQLite, siehe storage.py)
+        self.store = store or open_store()  # Verwendet den übergebenen oder den gemeinsamen Speicher.
         # Aktuell ausgewählte Formation (Index)
         self.current_index = None  # Initialisiert den Index der aktuell ausgewählten Formation.
         self.setFixedWidth(250)  # Setzt eine feste Breite für das Panel (ggf. anpassen).
@@ -19,7 +39,24 @@ class DefensivePositionsPanel(QWidget):  # Definiert eine Klasse für das Panel
         self.save_button = QPushButton("Stellung speichern", self)  # Erstellt einen Knopf zum Speichern der aktuellen Stellung.
         layout.addWidget(self.save_button)  # Fügt den Knopf zum Layout hinzu.
         
-        self.positions_list = QListWidget(self)  # Erstellt eine Listenansicht für die gespeicherten Positionen.
+        # Suche nach Name und Ballbereich (filtert bei jeder Eingabe)
+        self.search_edit = QLineEdit(self)  # Eingabefeld für den Suchtext.
+        self.search_edit.setPlaceholderText("Suchen…")  # Hinweis im leeren Feld.
+        self.search_edit.setClearButtonEnabled(True)  # Knopf zum Leeren.
+        layout.addWidget(self.search_edit)  # Fügt das Suchfeld zum Layout hinzu.
+        self.region_combo = QComboBox(self)  # Auswahl des Ballbereichs.
+        for label, region in BALL_REGIONS:  # Fügt alle Bereiche hinzu.
+            self.region_combo.addItem(label, region)
+        layout.addWidget(self.region_combo)  # Fügt die Auswahl zum Layout hinzu.
+        
+        # Formationen als Modell; die Ansicht erzeugt nur die sichtbaren Zeilen
+        self.model = RecordListModel(self.format_formation, self)  # Listenmodell über self.formations.
+        self.proxy = RecordFilterProxy(self)  # Filter nach Name und Ballbereich.
+        self.proxy.setSourceModel(self.model)
+        self.positions_list = QListView(self)  # Erstellt eine Listenansicht für die gespeicherten Positionen.
+        self.positions_list.setModel(self.proxy)  # Zeigt die gefilterten Formationen.
+        self.positions_list.setUniformItemSizes(True)  # Gleiche Zeilenhöhe: Layout ohne Abfrage jeder Zeile.
+        self.positions_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)  # Umbenennen nur über das Kontextmenü.
         layout.addWidget(self.positions_list)  # Fügt die Listenansicht zum Layout hinzu.
         
         # Kontextmenü für das Listen-Widget aktivieren
@@ -27,41 +64,58 @@ class DefensivePositionsPanel(QWidget):  # Definiert eine Klasse für das Panel
         self.positions_list.customContextMenuRequested.connect(self.show_context_menu)  # Verbindet das Signal für eine Kontextmenü-Anfrage mit der Methode show_context_menu.
         
         # Formationen als Liste von Dictionaries speichern: {"name": ..., "ball": [x, y], "offsets": [[x,y],...]}
-        self.formations = []  # Initialisiert eine leere Liste zur Speicherung der Formationen.
+        self.formations = self.model.records  # Initialisiert eine leere Liste zur Speicherung der Formationen (gemeinsam mit dem Modell).
         self.get_formation_callback = get_formation_callback  # Speichert die Callback-Funktion, um Formationsdaten abzurufen.
         # Übergebenen scale_factor verwenden oder auf Standardwert zurückgreifen (sollte immer von volleyball_field bereitgestellt werden)
         self.scale_factor = scale_factor if scale_factor is not None else 0.01  # Setzt den Skalierungsfaktor, Standardwert ist 0.01.
         
         self.save_button.clicked.connect(self.save_current_formation)  # Verbindet das Klick-Signal des Speicherknopfs mit der Methode save_current_formation.
-        self.positions_list.itemClicked.connect(self.on_item_clicked)  # Verbindet das Klick-Signal eines Listeneintrags mit der Methode on_item_clicked.
-
-        # Zuvor gespeicherte Formationen laden
-        self.load_formations()  # Ruft die Methode zum Laden der Formationen auf.
-
-    def load_formations(self):  # Methode zum Laden der Formationen aus einer Datei.
-        try:  # Beginnt einen try-Block für die Fehlerbehandlung beim Dateizugriff.
-            with open("formations.json", "r", encoding="utf-8") as f:  # Öffnet die Datei "formations.json" im Lesemodus mit UTF-8-Kodierung.
-                loaded = json.load(f)  # Lädt die JSON-Daten aus der Datei.
-                # "loaded" ist eine Liste von Dictionaries
-                # Stelle sicher, dass jede Formation eine 'zones'-Liste hat
-                self.formations = loaded  # Weist die geladenen Formationen der Instanzvariable zu.
-                for form in self.formations:  # Iteriert über jede geladene Formation.
-                    form.setdefault('zones', [])  # Stellt sicher, dass jede Formation einen 'zones'-Schlüssel hat; fügt ihn hinzu, falls nicht vorhanden.
-                for form in loaded:  # Iteriert erneut über die geladenen Formationen, um sie der Liste hinzuzufügen.
-                    ball = form["ball"]  # Holt die Ballposition aus der Formation.
-                    ball_meters = (round(ball[0] * self.scale_factor, 2), round(ball[1] * self.scale_factor, 2))  # Rechnet die Ballkoordinaten in Meter um.
-                    self.positions_list.addItem(f"Stellung: {form['name']} - Ball {ball_meters}")  # Fügt einen Eintrag zur Positionsliste hinzu.
-                
-                # Alle geladenen Formationen senden
-                self.formationsChanged.emit(self.formations)  # Löst das Signal formationsChanged aus, um über die geladenen Formationen zu informieren.
-        except FileNotFoundError:  # Behandelt den Fall, dass die Datei "formations.json" nicht gefunden wird.
-            pass  # Macht nichts, wenn die Datei nicht existiert (z.B. beim ersten Start).
-
-    def save_formations(self):  # Methode zum Speichern der Formationen in eine Datei.
-        with open("formations.json", "w") as f:  # Öffnet die Datei "formations.json" im Schreibmodus.
-            json.dump(self.formations, f)  # Schreibt die aktuellen Formationen im JSON-Format in die Datei.
-        # Alle Formationen nach dem Speichern senden
-        self.formationsChanged.emit(self.formations)  # Löst das Signal formationsChanged aus, um über die Änderungen zu informieren.
+        self.positions_list.clicked.connect(self.on_item_clicked)  # Verbindet das Klick-Signal eines Listeneintrags mit der Methode on_item_clicked.
+        self.search_edit.textChanged.connect(self.proxy.set_name_filter)  # Filtert bei jeder Eingabe.
+        self.region_combo.currentIndexChanged.connect(self.on_region_changed)  # Filtert nach dem gewählten Bereich.
+
+        # Zuvor gespeicherte Formationen laden (ohne autoload übergibt der Aufrufer sie später mit set_formations)
+        if autoload:  # Synchron beim Erstellen laden.
+            self.load_formations()  # Ruft die Methode zum Laden der Formationen auf.
+
+    def load_formations(self):  # Methode zum Laden der Formationen aus dem Speicher.
+        # Liste von Dictionaries mit stabiler Kennung "id" und immer vorhandener 'zones'-Liste
+        self.set_formations(self.store.load_formations())  # Lädt die Formationen (leer beim ersten Start).
+
+    def set_formations(self, formations):  # Methode zum Übernehmen bereits geladener Formationen.
+        """Zeigt die (z.B. im Hintergrund) aus dem Speicher geladenen Formationen an und sendet formationsChanged."""
+        self.formations = formations  # Übernimmt die Liste.
+        self.model.set_records(self.formations)  # Das Modell zeigt dieselbe Liste (Text erst beim Zeichnen).
+        self.current_index = None  # Die Auswahl gilt nicht mehr.
+        if not self.formations:  # Keine Formationen gespeichert.
+            return  # Macht nichts (z.B. beim ersten Start).
+        
+        # Alle geladenen Formationen senden
+        self.formationsChanged.emit(self.formations)  # Löst das Signal formationsChanged aus, um über die geladenen Formationen zu informieren.
+
+    def format_formation(self, form):  # Methode für den angezeigten Text einer Formation.
+        ball = form["ball"]  # Holt die Ballposition aus der Formation.
+        ball_meters = (round(ball[0] * self.scale_factor, 2), round(ball[1] * self.scale_factor, 2))  # Rechnet die Ballkoordinaten in Meter um.
+        return f"Stellung: {form['name']} - Ball {ball_meters}"  # Text des Listeneintrags.
+
+    def on_region_changed(self, combo_index):  # Methode zum Filtern nach dem gewählten Ballbereich.
+        region = self.region_combo.itemData(combo_index)  # Bereich in Metern oder None.
+        if region is not None:  # In Pixel umrechnen (scale_factor = Pixel pro Meter des Spielfelds).
+            region = tuple(value * self.scale_factor for value in region)
+        self.proxy.set_region(region)  # Filtert die Liste.
+
+    def save_formations(self):  # Methode zum Speichern aller Formationen.
+        """Schreibt die komplette Liste neu; einzelne Änderungen nutzen die Einzelmethoden des Speichers."""
+        self.store.replace_formations(self.formations)  # Ersetzt alle gespeicherten Formationen.
+
+    def emit_edit(self, kind, index, formation=None):  # Methode zum Melden einer einzelnen Änderung.
+        """
+        Sendet formationEdited mit der Art der Änderung, damit Empfänger (Marker, Interpolation)
+        nur das Nötige aktualisieren und reine Metadaten-Änderungen ignorieren können.
+        """
+        if formation is None:  # Betroffene Formation aus der Liste (bei Löschung übergibt der Aufrufer die entfernte).
+            formation = self.formations[index]
+        self.formationEdited.emit({"kind": kind, "index": index, "formation": formation})  # Löst das Signal aus.
 
     def save_current_formation(self):  # Methode zum Speichern der aktuell definierten Formation.
         # Nach Formationsnamen fragen
@@ -82,17 +136,19 @@ class DefensivePositionsPanel(QWidget):  # Definiert eine Klasse für das Panel
             "offsets": [[off[0], off[1]] for off in offsets_list],  # Speichert die Spieler-Offsets.
             "zones": zones  # Speichert die Zoneninformationen.
         }
-        self.formations.append(formation_dict)  # Fügt das neue Formations-Dictionary zur Liste der Formationen hinzu.
-        ball = formation_dict["ball"]  # Holt die Ballposition aus dem Dictionary.
-        ball_meters = (round(ball[0] * self.scale_factor, 2), round(ball[1] * self.scale_factor, 2))  # Rechnet die Ballkoordinaten in Meter um.
-        self.positions_list.addItem(f"Stellung: {name} - Ball {ball_meters}")  # Fügt einen Eintrag für die neue Formation zur Positionsliste hinzu.
-        self.save_formations()  # Ruft die Methode zum Speichern aller Formationen auf.
+        self.model.append(formation_dict)  # Fügt das neue Formations-Dictionary zur Liste der Formationen (und zur Ansicht) hinzu.
+        self.store.add_formation(formation_dict)  # Speichert nur die neue Formation (setzt formation_dict["id"]).
+        self.emit_edit(FORMATION_ADDED, len(self.formations) - 1)  # Meldet die neue Ballposition.
         
-    def on_item_clicked(self, item):  # Methode, die aufgerufen wird, wenn ein Element in der Positionsliste angeklickt wird.
-        idx = self.positions_list.row(item)  # Ermittelt den Index des angeklickten Elements.
+    def on_item_clicked(self, index):  # Methode, die aufgerufen wird, wenn ein Element in der Positionsliste angeklickt wird.
+        self.select_formation(self.proxy.source_row(index))  # Index der Ansicht -> Index in self.formations.
+
+    def select_formation(self, idx):  # Methode zum Auswählen einer Formation über ihren Index.
+        """Markiert die Formation idx in der Liste (sofern nicht ausgefiltert) und sendet formationSelected."""
         if 0 <= idx < len(self.formations):  # Überprüft, ob der Index gültig ist.
             # Aktuellen Index für Zonenupdates merken
             self.current_index = idx  # Speichert den Index der ausgewählten Formation.
+            self.positions_list.setCurrentIndex(self.proxy.view_index(idx))  # Markiert den Eintrag in der Ansicht.
             form = self.formations[idx]  # Holt die ausgewählte Formation aus der Liste.
             # Formation als Tupel senden: (Ball, Offsets, Zonen)
             ball = tuple(form["ball"])  # Konvertiert die Ballposition in ein Tupel.
@@ -102,46 +158,46 @@ class DefensivePositionsPanel(QWidget):  # Definiert eine Klasse für das Panel
 
     def show_context_menu(self, position):  # Methode zum Anzeigen eines Kontextmenüs für Listeneinträge.
         # Das Item an dieser Position holen
-        item = self.positions_list.itemAt(position)  # Holt das Listenelement an der angegebenen Mausposition.
-        if item is None:  # Überprüft, ob ein Element vorhanden ist.
+        index = self.proxy.source_row(self.positions_list.indexAt(position))  # Index der Formation an der Mausposition.
+        if index < 0:  # Überprüft, ob ein Element vorhanden ist.
             return  # Bricht ab, wenn kein Element an der Position ist.
         # Kontextmenü: Umbenennen und Löschen
         context_menu = QMenu(self)  # Erstellt ein neues Kontextmenü.
         rename_action = context_menu.addAction("Umbenennen...")  # Fügt eine "Umbenennen"-Aktion zum Menü hinzu.
         delete_action = context_menu.addAction("Weg damit")  # Fügt eine "Löschen"-Aktion zum Menü hinzu (humorvoll formuliert).
-        action = context_menu.exec(self.positions_list.mapToGlobal(position))  # Zeigt das Kontextmenü an und wartet auf eine Aktion.
+        action = context_menu.exec(self.positions_list.viewport().mapToGlobal(position))  # Zeigt das Kontextmenü an und wartet auf eine Aktion.
         if action == rename_action:  # Überprüft, ob die "Umbenennen"-Aktion ausgewählt wurde.
-            self.rename_formation(item)  # Ruft die Methode zum Umbenennen der Formation auf.
+            self.rename_formation(index)  # Ruft die Methode zum Umbenennen der Formation auf.
         elif action == delete_action:  # Überprüft, ob die "Löschen"-Aktion ausgewählt wurde.
-            self.delete_formation(item)  # Ruft die Methode zum Löschen der Formation auf.
+            self.delete_formation(index)  # Ruft die Methode zum Löschen der Formation auf.
     
-    def delete_formation(self, item):  # Methode zum Löschen einer Formation.
-        index = self.positions_list.row(item)  # Ermittelt den Index des zu löschenden Elements.
+    def delete_formation(self, index):  # Methode zum Löschen einer Formation (Index in self.formations).
         if 0 <= index < len(self.formations):  # Überprüft, ob der Index gültig ist.
-            # Aus der Formationsliste entfernen
-            del self.formations[index]  # Löscht die Formation aus der Liste der Formationen.
-            # Aus dem Listen-Widget entfernen
-            self.positions_list.takeItem(index)  # Entfernt das Element aus der Listenansicht.
-            # Änderungen in Datei speichern
-            self.save_formations()  # Ruft die Methode zum Speichern aller Formationen auf.
-            # Dies löst auch das formationsChanged-Signal über save_formations aus
-
-    def rename_formation(self, item):  # Methode zum Umbenennen einer Formation.
+            # Aus Speicher, Formationsliste und Ansicht entfernen
+            removed = self.formations[index]  # Zu löschende Formation (für das Änderungssignal).
+            self.store.delete_formation(removed["id"])  # Löscht nur diese Formation im Speicher.
+            self.model.remove(index)  # Löscht die Formation aus der Liste der Formationen und der Ansicht.
+            # Auswahl anpassen, da sich die Indizes verschieben
+            if self.current_index == index:  # Die ausgewählte Formation wurde gelöscht.
+                self.current_index = None  # Keine Auswahl mehr.
+            elif self.current_index is not None and self.current_index > index:  # Auswahl liegt dahinter.
+                self.current_index -= 1  # Index rückt nach vorn.
+            self.emit_edit(FORMATION_REMOVED, index, removed)  # Meldet die entfernte Ballposition.
+
+    def rename_formation(self, idx):  # Methode zum Umbenennen einer Formation (Index in self.formations).
         """
         Ermöglicht Umbenennen eines gespeicherten Formations-Namens per Dialog.
         """
-        idx = self.positions_list.row(item)  # Ermittelt den Index des umzubenennenden Elements.
         old_name = self.formations[idx]['name']  # Holt den alten Namen der Formation.
         new_name, ok = QInputDialog.getText(self, "Umbenennen", f"Geben Sie neuen Namen für '{old_name}' ein:")  # Öffnet einen Dialog zur Eingabe des neuen Namens.
         if not ok or not new_name:  # Überprüft, ob der Dialog erfolgreich beendet wurde und ein Name eingegeben wurde.
             return  # Bricht ab, wenn nicht.
         # Name in Daten und Liste aktualisieren
         self.formations[idx]['name'] = new_name  # Aktualisiert den Namen in der Formationsliste.
-        ball = self.formations[idx]['ball']  # Holt die Ballposition.
-        ball_meters = (round(ball[0] * self.scale_factor, 2), round(ball[1] * self.scale_factor, 2))  # Rechnet die Ballkoordinaten in Meter um.
-        item.setText(f"Stellung: {new_name} - Ball {ball_meters}")  # Aktualisiert den Text des Listeneintrags.
-        # Datei speichern und Änderung signalisieren
-        self.save_formations()  # Ruft die Methode zum Speichern aller Formationen auf.
+        self.model.refresh(idx)  # Aktualisiert den Text des Listeneintrags (und den Suchfilter).
+        # Speichern und Änderung signalisieren
+        self.store.rename_formation(self.formations[idx]["id"], new_name)  # Ändert nur den Namen im Speicher.
+        self.emit_edit(FORMATION_METADATA, idx)  # Nur der Name hat sich geändert.
 
     def update_zone(self, player_index, rect, color):  # Methode zum Aktualisieren oder Hinzufügen einer Zone für einen Spieler.
         """
@@ -158,7 +214,8 @@ class DefensivePositionsPanel(QWidget):  # Definiert eine Klasse für das Panel
         }
         zones_list.append(entry)  # Fügt den neuen Zoneneintrag zur Liste hinzu.
         # Änderungen persistieren
-        self.save_formations()  # Ruft die Methode zum Speichern aller Formationen auf.
+        self.store.add_zone(self.formations[self.current_index]["id"], entry)  # Speichert nur die neue Zone.
+        self.emit_edit(FORMATION_METADATA, self.current_index)  # Zonen beeinflussen die Interpolation nicht.
 
     def delete_zone_entry(self, player_index, rect_vals, color_vals):  # Methode zum Löschen eines spezifischen Zoneneintrags.
         """
@@ -172,6 +229,6 @@ class DefensivePositionsPanel(QWidget):  # Definiert eine Klasse für das Panel
         for zone in list(zones_list):  # Iteriert über eine Kopie der Zonenliste, um sie während der Iteration modifizieren zu können.
             if zone.get('player_index') == player_index and zone.get('rect') == rect_vals and zone.get('color') == color_vals:  # Überprüft, ob der Zoneneintrag den Kriterien entspricht.
                 zones_list.remove(zone)  # Entfernt den passenden Zoneneintrag.
+                self.store.delete_zone(self.formations[self.current_index]["id"], zone)  # Löscht nur diese Zone im Speicher.
                 break  # Beendet die Schleife, nachdem der Eintrag entfernt wurde.
-        # Aktualisierte Formationen speichern
-        self.save_formations()  # Ruft die Methode zum Speichern aller Formationen auf.
+        self.emit_edit(FORMATION_METADATA, self.current_index)  # Zonen beeinflussen die Interpolation nicht.
@@ -0,0 +1,173 @@
+import collections  # Importiert collections für den Ringpuffer.
+import json  # Importiert json für den Export.
+import os  # Importiert os für Umgebungsvariablen.
+import time  # Importiert time für die Zeitmessung.
+from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsSimpleTextItem, QGraphicsItem  # Importiert die Grafikobjekte für die Anzeige.
+from PySide6.QtGui import QBrush, QColor, QPen, QFont  # Importiert Pinsel, Farben, Stifte und Schriftarten.
+from PySide6.QtCore import Qt, QTimer  # Importiert Qt-Konstanten und QTimer.
+
+# Zeitmessung pro Bild beim Ziehen des Balls (VSM_PROFILE=1); ohne die Variable wird nichts gemessen
+PROFILE_ENABLED = os.environ.get("VSM_PROFILE", "0") not in ("", "0")  # Aktiviert die Zeitmessung.
+PROFILE_FRAMES = int(os.environ.get("VSM_PROFILE_FRAMES", "2000"))  # Größe des Ringpuffers (Bilder).
+PROFILE_DUMP_PATH = os.environ.get("VSM_PROFILE_DUMP", "frame_profile.json")  # Zieldatei für den JSON-Export.
+HUD_REFRESH_MS = 250  # Aktualisierungsintervall der Anzeige in Millisekunden.
+
+
+def percentile(values, p):  # Berechnet ein Perzentil (nächster Rang) einer sortierten Liste.
+    if not values:  # Keine Werte.
+        return None  # Kein Perzentil.
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]  # Wert am gerundeten Rang.
+
+
+class FrameProfiler:  # Definiert eine Klasse für die Zeitmessung pro Bild.
+    """
+    Misst die Verarbeitung jeder Ballposition (ein Bild) und ihrer Stufen in einem Ringpuffer.
+
+    Ein Bild beginnt mit begin_frame() und endet mit end_frame(); mit wrap() umhüllte Funktionen
+    (Sektor, Schatten, Interpolation, Dreieck, Einrasten) tragen ihre Dauer und Aufrufzahl in das
+    laufende Bild ein. Die Zeiten der Stufen sind exklusiv: eine Stufe, die eine andere aufruft,
+    zählt deren Zeit nicht mit. Aufrufe außerhalb eines Bildes werden nicht erfasst.
+    """
+
+    def __init__(self, capacity=PROFILE_FRAMES):  # Konstruktor der Klasse.
+        self.frames = collections.deque(maxlen=capacity)  # Ringpuffer der abgeschlossenen Bilder.
+        self.frame_count = 0  # Anzahl aller erfassten Bilder (auch der verdrängten).
+        self._started = time.perf_counter()  # Bezugszeitpunkt für die Zeitstempel.
+        self._frame = None  # Laufendes Bild.
+        self._stack = []  # Zeit der Unterstufen je offener Stufe (für exklusive Zeiten).
+        self._events = 0  # Mausbewegungen seit dem letzten Bild.
+        self._event_time = 0.0  # Zeit in mouseMoveEvent seit dem letzten Bild.
+        self._first_event = None  # Zeitpunkt der ersten noch nicht verarbeiteten Mausbewegung.
+        self._frame_start = 0.0  # Beginn des laufenden Bildes.
+
+    def record_event(self, start, duration):  # Erfasst eine Mausbewegung.
+        """Vermerkt eine Mausbewegung (Beginn und Dauer in Sekunden) für das nächste Bild."""
+        self._events += 1  # Zählt die Bewegung.
+        self._event_time += duration  # Addiert die Zeit in mouseMoveEvent.
+        if self._first_event is None:  # Erste Bewegung seit dem letzten Bild.
+            self._first_event = start  # Beginn der Latenz.
+
+    def begin_frame(self):  # Beginnt ein Bild.
+        now = time.perf_counter()  # Beginn des Bildes.
+        self._frame = {
+            "t": round(now - self._started, 6),  # Sekunden seit dem Start.
+            "latency_us": round((now - self._first_event) * 1e6, 1) if self._first_event is not None else 0.0,  # Erste Bewegung bis Verarbeitung.
+            "events": self._events,  # Zusammengefasste Mausbewegungen.
+            "move_us": round(self._event_time * 1e6, 1),  # Zeit in mouseMoveEvent.
+            "stages": {},  # Exklusive Zeit je Stufe in Mikrosekunden.
+            "calls": {},  # Aufrufe je Stufe.
+        }
+        self._events = 0  # Setzt die Bewegungen für das nächste Bild zurück.
+        self._event_time = 0.0  # Setzt die Zeit in mouseMoveEvent zurück.
+        self._first_event = None  # Noch keine neue Bewegung.
+        self._stack = [0.0]  # Ebene des Bildes selbst.
+        self._frame_start = now  # Merkt sich den Beginn für die Bilddauer.
+
+    def end_frame(self):  # Schließt das laufende Bild ab.
+        frame = self._frame  # Laufendes Bild.
+        if frame is None:  # Kein Bild offen.
+            return  # Nichts abzuschließen.
+        now = time.perf_counter()  # Ende des Bildes.
+        frame["frame_us"] = round((now - self._frame_start) * 1e6, 1)  # Dauer der Verarbeitung.
+        frame["latency_us"] = round(frame["latency_us"] + frame["frame_us"], 1)  # Bis zum Ende der Verarbeitung.
+        frame["other_us"] = round(max(0.0, frame["frame_us"] - sum(frame["stages"].values())), 1)  # Nicht zugeordnete Zeit.
+        self.frames.append(frame)  # Legt das Bild im Ringpuffer ab (verdrängt ggf. das älteste).
+        self.frame_count += 1  # Zählt das Bild.
+        self._frame = None  # Kein Bild mehr offen.
+        self._stack = []  # Keine offenen Stufen.
+
+    def wrap(self, stage, func):  # Umhüllt eine Funktion mit der Zeitmessung einer Stufe.
+        """Gibt eine Funktion zurück, die func aufruft und die Dauer der Stufe stage im laufenden Bild einträgt."""
+        perf_counter = time.perf_counter  # Lokale Referenz (schneller im Ziehpfad).
+
+        def timed(*args, **kwargs):  # Gemessener Aufruf.
+            if self._frame is None:  # Außerhalb eines Bildes nicht messen.
+                return func(*args, **kwargs)  # Ruft die Funktion ohne Messung auf.
+            self._stack.append(0.0)  # Neue Ebene für Unterstufen.
+            start = perf_counter()  # Beginn der Stufe.
+            try:
+                return func(*args, **kwargs)  # Ruft die Funktion auf.
+            finally:
+                elapsed = perf_counter() - start  # Gesamtdauer der Stufe.
+                children = self._stack.pop() if self._stack else 0.0  # Zeit der Unterstufen.
+                if self._stack:  # Aufgerufen aus einer anderen Stufe oder dem Bild.
+                    self._stack[-1] += elapsed  # Dem Aufrufer als Unterstufe anrechnen.
+                frame = self._frame  # Bild kann inzwischen abgeschlossen sein.
+                if frame is not None:  # Bild noch offen.
+                    frame["stages"][stage] = round(frame["stages"].get(stage, 0.0) + (elapsed - children) * 1e6, 1)  # Exklusive Zeit.
+                    frame["calls"][stage] = frame["calls"].get(stage, 0) + 1  # Zählt den Aufruf.
+        timed.__name__ = getattr(func, "__name__", stage)  # Name der umhüllten Funktion (für Fehlermeldungen).
+        return timed  # Gibt die gemessene Funktion zurück.
+
+    def clear(self):  # Leert den Ringpuffer.
+        self.frames.clear()  # Entfernt alle Bilder.
+        self.frame_count = 0  # Setzt den Zähler zurück.
+
+    def summary(self):  # Fasst den Ringpuffer zusammen.
+        """Perzentile (p50/p95/p99/max) von Bilddauer, Latenz und jeder Stufe über den Ringpuffer."""
+        frames = list(self.frames)  # Momentaufnahme des Ringpuffers.
+
+        def stats(values):  # Perzentile einer Werteliste.
+            values = sorted(values)  # Perzentile brauchen sortierte Werte.
+            return {"p50": percentile(values, 50), "p95": percentile(values, 95),
+                    "p99": percentile(values, 99), "max": values[-1] if values else None}
+
+        stages = sorted({name for frame in frames for name in frame["stages"]})  # Alle gemessenen Stufen.
+        return {
+            "frames": len(frames),  # Bilder im Ringpuffer.
+            "frame_us": stats([f["frame_us"] for f in frames]),  # Bilddauer.
+            "latency_us": stats([f["latency_us"] for f in frames]),  # Latenz von der ersten Bewegung bis zum Bildende.
+            "events_per_frame": round(sum(f["events"] for f in frames) / len(frames), 2) if frames else None,  # Zusammengefasste Bewegungen.
+            "stages_us": {name: stats([f["stages"][name] for f in frames if name in f["stages"]]) for name in stages},  # Je Stufe.
+        }
+
+    def summary_text(self):  # Text für die Anzeige in der Szene.
+        summary = self.summary()  # Aktuelle Zusammenfassung.
+        if not summary["frames"]:  # Noch nichts gemessen.
+            return "Frame-Profil: noch keine Bilder (Ball ziehen)"  # Hinweis statt leerer Tabelle.
+        frame, latency = summary["frame_us"], summary["latency_us"]  # Bilddauer und Latenz.
+        lines = [
+            "Bilder: %d (Puffer %d)   Bewegungen/Bild: %.1f" % (self.frame_count, summary["frames"], summary["events_per_frame"]),
+            "Bild    p50 %7.2f  p95 %7.2f  p99 %7.2f  max %7.2f ms" % tuple(frame[k] / 1000 for k in ("p50", "p95", "p99", "max")),
+            "Latenz  p50 %7.2f  p95 %7.2f  p99 %7.2f  max %7.2f ms" % tuple(latency[k] / 1000 for k in ("p50", "p95", "p99", "max")),
+        ]
+        for name, stats in summary["stages_us"].items():  # Je Stufe (exklusive Zeit).
+            lines.append("%-18s p50 %7.2f  p95 %7.2f ms" % (name, stats["p50"] / 1000, stats["p95"] / 1000))  # Zeile der Stufe.
+        return "\n".join(lines)  # Gibt den Text zurück.
+
+    def dump(self, path=PROFILE_DUMP_PATH):  # Schreibt den Ringpuffer als JSON.
+        """Schreibt Zusammenfassung und alle Bilder des Ringpuffers nach path und gibt den Pfad zurück."""
+        data = {"summary": self.summary(), "frame_count": self.frame_count, "frames": list(self.frames)}  # Inhalt der Datei.
+        with open(path, "w", encoding="utf-8") as f:  # Öffnet die Datei mit UTF-8-Kodierung.
+            json.dump(data, f, indent=1)  # Schreibt die Daten.
+        print("Frame-Profil gespeichert:", os.path.abspath(path))  # Gibt eine Meldung aus.
+        return path  # Gibt den Pfad zurück.
+
+
+class ProfilerHud(QGraphicsRectItem):  # Definiert eine Anzeige der Bildzeiten in der Szene.
+    """Halbtransparente Tafel oben links in der Szene mit den Perzentilen des FrameProfilers."""
+
+    def __init__(self, profiler, parent=None):  # Konstruktor der Klasse.
+        super().__init__(parent)  # Ruft den Konstruktor der Basisklasse auf.
+        self.profiler = profiler  # Datenquelle.
+        self.setZValue(10000)  # Über allen anderen Objekten.
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIgnoresTransformations)  # Lesbar unabhängig vom Zoom.
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)  # Mausklicks gehen an die Szene.
+        self.setBrush(QBrush(QColor(255, 255, 255, 200)))  # Halbtransparenter Hintergrund.
+        self.setPen(QPen(Qt.PenStyle.NoPen))  # Kein Rahmen.
+        self.text = QGraphicsSimpleTextItem(self)  # Text der Anzeige.
+        self.text.setFont(QFont("monospace", 8))  # Feste Zeichenbreite für die Spalten.
+        self.text.setPos(4, 4)  # Innenabstand.
+        self._shown = -1  # Bildzahl der zuletzt angezeigten Zusammenfassung.
+        self._timer = QTimer()  # Aktualisiert die Anzeige gedrosselt statt in jedem Bild.
+        self._timer.timeout.connect(self.refresh)  # Verbindet den Takt mit der Aktualisierung.
+        self._timer.start(HUD_REFRESH_MS)  # Startet den Takt.
+        self.refresh()  # Zeigt sofort den ersten Text an.
+
+    def refresh(self):  # Aktualisiert den Text, falls neue Bilder vorliegen.
+        if self.profiler.frame_count == self._shown:  # Nichts Neues.
+            return  # Text bleibt.
+        self._shown = self.profiler.frame_count  # Merkt sich den angezeigten Stand.
+        self.text.setText(self.profiler.summary_text())  # Setzt den neuen Text.
+        r = self.text.boundingRect()  # Größe des Textes.
+        self.setRect(0, 0, r.width() + 8, r.height() + 8)  # Passt die Tafel an (mit Innenabstand).
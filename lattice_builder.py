@@ -0,0 +1,58 @@
+import threading  # Importiert threading für die Berechnung im Hintergrund.
+from PySide6.QtCore import QObject, Signal  # Importiert QObject und das Signal-System von PySide6.
+
+from core.interpolation import InterpolationLattice, DEFAULT_LATTICE_RESOLUTION  # Importiert das Interpolationsgitter.
+
+
+class LatticeBuilder(QObject):  # Definiert eine Klasse, die das Interpolationsgitter im Hintergrund berechnet.
+    """
+    Berechnet das Interpolationsgitter in einem Hintergrund-Thread.
+
+    Jede Anfrage übergibt eine neue InterpolationEngine. Liegt bereits ein Gitter vor, wird eine
+    Kopie davon inkrementell aktualisiert (nur die betroffenen Knoten), sonst wird es vollständig
+    aufgebaut. Treffen während einer Berechnung weitere Anfragen ein, wird danach nur die
+    neueste bearbeitet. Das fertige Gitter wird über das Signal latticeReady im GUI-Thread geliefert.
+    """
+    latticeReady = Signal(object)  # Signal mit dem fertigen InterpolationLattice.
+
+    def __init__(self, bounds, resolution=DEFAULT_LATTICE_RESOLUTION, parent=None):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            bounds: (x, y, Breite, Höhe) des Bereichs, z.B. BallItem.movement_boundary
+            resolution: Abstand der Gitterknoten in Pixeln
+            parent: Übergeordnetes Qt-Objekt
+        """
+        super().__init__(parent)  # Ruft den Konstruktor der Basisklasse auf.
+        self.bounds = bounds  # Speichert den Bereich.
+        self.resolution = resolution  # Speichert die Rasterweite.
+        self.lattice = None  # Zuletzt fertig berechnetes Gitter.
+        self.last_recomputed = 0  # Anzahl der zuletzt neu berechneten Knoten (zur Kontrolle).
+        self._pending = None  # Neueste noch nicht bearbeitete Engine.
+        self._lock = threading.Lock()  # Schützt _pending und _thread.
+        self._thread = None  # Laufender Hintergrund-Thread.
+
+    def request(self, engine):  # Methode zum Anfordern einer Neuberechnung.
+        """Fordert ein Gitter für die übergebene Engine an (kehrt sofort zurück)."""
+        with self._lock:  # Sperrt den gemeinsamen Zustand.
+            self._pending = engine  # Merkt sich nur die neueste Engine.
+            if self._thread is None:  # Kein Thread aktiv.
+                self._thread = threading.Thread(target=self._run, daemon=True)  # Erstellt einen Hintergrund-Thread.
+                self._thread.start()  # Startet die Berechnung.
+
+    def _run(self):  # Private Methode: Arbeitsschleife des Hintergrund-Threads.
+        while True:  # Bearbeitet Anfragen, bis keine mehr vorliegen.
+            with self._lock:  # Sperrt den gemeinsamen Zustand.
+                engine = self._pending  # Holt die neueste Anfrage.
+                self._pending = None  # Markiert sie als übernommen.
+                if engine is None:  # Keine Anfrage mehr.
+                    self._thread = None  # Thread beendet sich.
+                    return  # Beendet die Schleife.
+            if self.lattice is not None:  # Vorhandenes Gitter inkrementell aktualisieren.
+                lattice = self.lattice.copy()  # Kopie, damit das angezeigte Gitter unverändert bleibt.
+                self.last_recomputed = lattice.update(engine)  # Berechnet nur betroffene Knoten neu.
+            else:  # Erstes Gitter.
+                lattice = InterpolationLattice(self.bounds, self.resolution)  # Erstellt ein neues Gitter.
+                lattice.build(engine)  # Berechnet alle Knoten.
+                self.last_recomputed = lattice.valid.size  # Alle Knoten wurden berechnet.
+            self.lattice = lattice  # Speichert das fertige Gitter.
+            self.latticeReady.emit(lattice)  # Liefert das Gitter (Queued Connection in den GUI-Thread).
@@ -0,0 +1,100 @@
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel  # Importiert die Model/View-Klassen von PySide6.
+
+RECORD_ROLE = Qt.ItemDataRole.UserRole + 1  # Rolle für den Datensatz (dict) eines Eintrags.
+
+
+class RecordListModel(QAbstractListModel):  # Definiert ein Listenmodell über eine Python-Liste von Datensätzen.
+    """
+    Listenmodell über eine Liste von Datensätzen (Formationen oder Teams als dict).
+
+    Das Modell hält dieselbe Liste wie das Panel (keine Kopie); Änderungen laufen über
+    set_records, append, remove und refresh, damit die Ansicht benachrichtigt wird. Der
+    angezeigte Text wird erst beim Zeichnen einer Zeile mit format_record erzeugt, daher
+    kostet eine lange Liste nur die sichtbaren Zeilen.
+    """
+
+    def __init__(self, format_record, parent=None):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            format_record: Funktion, die den angezeigten Text eines Datensatzes liefert
+            parent: Übergeordnetes Qt-Objekt
+        """
+        super().__init__(parent)  # Ruft den Konstruktor der Basisklasse auf.
+        self.format_record = format_record  # Speichert die Formatierungsfunktion.
+        self.records = []  # Datensätze (gemeinsame Liste mit dem Panel).
+
+    def rowCount(self, parent=QModelIndex()):  # Anzahl der Zeilen.
+        return 0 if parent.isValid() else len(self.records)  # Flache Liste ohne Unterelemente.
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):  # Daten einer Zeile.
+        if not index.isValid() or not 0 <= index.row() < len(self.records):  # Ungültige Zeile.
+            return None
+        record = self.records[index.row()]  # Datensatz der Zeile.
+        if role == Qt.ItemDataRole.DisplayRole:  # Angezeigter Text.
+            return self.format_record(record)
+        if role == RECORD_ROLE:  # Datensatz selbst.
+            return record
+        return None
+
+    def set_records(self, records):  # Methode zum Ersetzen aller Datensätze.
+        """Übernimmt die Liste records (ohne Kopie) und setzt die Ansicht zurück."""
+        self.beginResetModel()  # Ansicht verwirft Zeilen und Auswahl.
+        self.records = records  # Übernimmt die Liste.
+        self.endResetModel()
+
+    def append(self, record):  # Methode zum Anhängen eines Datensatzes.
+        row = len(self.records)  # Neue letzte Zeile.
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.records.append(record)  # Hängt ihn an die gemeinsame Liste an.
+        self.endInsertRows()
+
+    def remove(self, row):  # Methode zum Entfernen eines Datensatzes.
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.records[row]  # Entfernt ihn aus der gemeinsamen Liste.
+        self.endRemoveRows()
+
+    def refresh(self, row):  # Methode zum Neuzeichnen einer Zeile nach einer Änderung.
+        index = self.index(row)  # Index der Zeile.
+        self.dataChanged.emit(index, index)  # Ansicht und Filter aktualisieren die Zeile.
+
+
+class RecordFilterProxy(QSortFilterProxyModel):  # Definiert einen Filter über ein RecordListModel.
+    """
+    Filtert die Zeilen eines RecordListModel nach einem Suchtext im Namen (ohne Groß-/Kleinschreibung)
+    und optional nach einem Bereich der Ballposition (x0, y0, x1, y1) in Pixeln.
+
+    Die Prüfung greift direkt auf die Datensätze zu, nicht auf den angezeigten Text. Eine Änderung
+    des Filters prüft alle Zeilen neu; die Ansicht erzeugt danach nur die sichtbaren Zeilen.
+    """
+
+    def __init__(self, parent=None):  # Konstruktor der Klasse.
+        super().__init__(parent)  # Ruft den Konstruktor der Basisklasse auf.
+        self.name_filter = ""  # Suchtext (casefold), leer = alle.
+        self.region = None  # Bereich der Ballposition oder None = alle.
+
+    def set_name_filter(self, text):  # Methode zum Setzen des Suchtexts.
+        text = text.strip().casefold()  # Vergleich ohne Groß-/Kleinschreibung.
+        if text != self.name_filter:  # Nur bei einer Änderung neu filtern.
+            self.name_filter = text  # Übernimmt den neuen Wert.
+            self.invalidateFilter()  # Prüft alle Zeilen neu (in allen Qt-6-Versionen verfügbar).
+
+    def set_region(self, region):  # Methode zum Setzen des Ballbereichs.
+        if region != self.region:  # Nur bei einer Änderung neu filtern.
+            self.region = region  # Übernimmt den neuen Wert.
+            self.invalidateFilter()  # Prüft alle Zeilen neu (in allen Qt-6-Versionen verfügbar).
+
+    def filterAcceptsRow(self, source_row, source_parent):  # Prüft eine Zeile des Modells.
+        record = self.sourceModel().records[source_row]  # Datensatz der Zeile.
+        if self.name_filter and self.name_filter not in record.get("name", "").casefold():  # Suchtext fehlt im Namen.
+            return False
+        if self.region is not None:  # Ballposition im Bereich?
+            x0, y0, x1, y1 = self.region
+            x, y = record["ball"]
+            return x0 <= x <= x1 and y0 <= y <= y1
+        return True
+
+    def source_row(self, index):  # Zeile im Modell zu einem Index der Ansicht.
+        return self.mapToSource(index).row() if index.isValid() else -1
+
+    def view_index(self, source_row):  # Index der Ansicht zu einer Zeile im Modell (ungültig, wenn ausgefiltert).
+        return self.mapFromSource(self.sourceModel().index(source_row))
@@ -1,24 +1,46 @@
 import sys  # Importiert das sys-Modul für den Zugriff auf Systemparameter und -funktionen.
 import math  # Importiert das math-Modul für mathematische Operationen.
-from PySide6.QtWidgets import QApplication, QGraphicsScene, QGraphicsView, QWidget, QHBoxLayout, QGraphicsPathItem, QGraphicsLineItem  # Importiert notwendige Widgets von PySide6.
-from PySide6.QtGui import QBrush, QPen, QColor, QPainterPath  # Importiert Klassen für Pinsel, Stifte, Farben und Pfade von PySide6.
-from PySide6.QtCore import Qt, QRectF, QPointF  # Importiert Kernfunktionalitäten und Typen wie Qt-Konstanten, QRectF und QPointF.
+import os  # Importiert das os-Modul für den Zugriff auf Umgebungsvariablen.
+import time  # Importiert das time-Modul für die Startzeitmessung.
+from types import SimpleNamespace  # Importiert SimpleNamespace für die Rückgabe des Hauptfensters.
+STARTUP_BEGIN = time.perf_counter()  # Beginn der Startzeitmessung (vor den Qt-Importen).
+from PySide6.QtWidgets import QApplication, QGraphicsScene, QGraphicsView, QWidget, QHBoxLayout, QVBoxLayout, QProgressBar, QGraphicsPathItem, QGraphicsLineItem  # Importiert notwendige Widgets von PySide6.
+from PySide6.QtGui import QBrush, QPen, QColor, QPainterPath, QShortcut, QKeySequence  # Importiert Klassen für Pinsel, Stifte, Farben, Pfade und Tastenkürzel von PySide6.
+from PySide6.QtCore import Qt, QRectF, QPointF, QTimer  # Importiert Kernfunktionalitäten und Typen wie Qt-Konstanten, QRectF, QPointF und QTimer.
 
 # Verwende absolute Importe
 from components.player_item import PlayerItem  # Importiert die PlayerItem-Klasse aus dem components-Modul.
-from components.ball_item import BallItem  # Importiert die BallItem-Klasse aus dem components-Modul.
+from components.ball_item import BallItem, ProfiledBallItem, DRAG_COALESCED  # Importiert die BallItem-Klassen und den Standard-Aktualisierungsmodus.
 from sectors.attack_sector import AttackSector  # Importiert die AttackSector-Klasse aus dem sectors-Modul.
+from sectors.block_shadow import update_shadows  # Importiert die gemeinsame Blockschatten-Berechnung.
 from volleyball_field import VolleyballField, players  # Importiert VolleyballField und die globale Spielerliste.
 from utils import CourtDimensions  # Importiert CourtDimensions für Spielfeldabmessungen aus utils.py.
-from defensive_positions_panel import DefensivePositionsPanel  # Importiert das Panel für Defensivpositionen.
+from defensive_positions_panel import DefensivePositionsPanel, FORMATION_ADDED, FORMATION_REMOVED, FORMATION_METADATA  # Importiert das Panel für Defensivpositionen und die Änderungsarten.
 from team_panel import TeamPanel  # Importiert das Panel für Team-Speicherung/Ladung.
+from storage import open_store  # Importiert den gemeinsamen Speicher für Formationen und Teams.
+from startup_loader import StartupLoader, StartupTimer, STARTUP_LOG  # Importiert das Laden im Hintergrund und die Startzeitmessung.
 
 # Import für Formation-Marker hinzufügen
-from components.formation_marker_item import FormationMarkerItem  # Importiert die Klasse für Formationsmarker.
+from components.formation_marker_item import FormationMarkersItem  # Importiert das Item, das alle Formationsmarker zeichnet.
 
 # Zusätzliche Importe - Direktimport statt utils.interpolation verwenden
-from interpolation import interpolate_position, point_in_triangle  # Importiert Interpolationsfunktionen direkt.
-from itertools import combinations  # Importiert combinations für die Erzeugung von Dreieckskombinationen.
+from core.interpolation import InterpolationEngine  # Importiert die Interpolations-Engine (Triangulation + räumlicher Index).
+from lattice_builder import LatticeBuilder  # Importiert den Hintergrund-Builder für das Interpolationsgitter.
+from core.spatial_index import PointGrid  # Importiert den Gitterindex für das Einrasten auf Ballpositionen.
+from frame_profiler import FrameProfiler, ProfilerHud, PROFILE_ENABLED  # Importiert die optionale Zeitmessung pro Bild.
+from session_recorder import SessionRecorder, RECORD_PATH  # Importiert den optionalen Mitschnitt der Sitzung.
+
+# Optionaler Modus: Interpolation über ein vorberechnetes Gitter (VSM_INTERPOLATION_LATTICE=1)
+USE_INTERPOLATION_LATTICE = os.environ.get("VSM_INTERPOLATION_LATTICE", "0") not in ("", "0")  # Aktiviert das Gitter.
+LATTICE_RESOLUTION = float(os.environ.get("VSM_LATTICE_RESOLUTION", "3"))  # Rasterweite des Gitters in Pixeln.
+# Optionaler Modus: Angriffssektor mit nativem QRadialGradient statt gecachter Pixmap (VSM_NATIVE_GRADIENT=1)
+USE_NATIVE_GRADIENT = os.environ.get("VSM_NATIVE_GRADIENT", "0") not in ("", "0")  # Aktiviert den nativen Farbverlauf.
+# Aktualisierung beim Ziehen des Balls: "coalesced" (einmal pro Bild, Standard) oder "immediate" (VSM_DRAG_MODE)
+DRAG_MODE = os.environ.get("VSM_DRAG_MODE", DRAG_COALESCED)  # Aktualisierungsmodus des Balls.
+
+# Einrasten auf gespeicherte Ballpositionen
+SNAP_RADIUS = 10  # Radius, innerhalb dessen eingerastet wird (Pixel).
+SNAP_RELEASE_RADIUS = 15  # Radius, ab dem eine eingerastete Formation wieder freigegeben wird (Hysterese).
 
 # Klasse für skalierbare Ansicht: passt Grafik an die Fenstergröße an
 class ScalableGraphicsView(QGraphicsView):  # Definiert eine von QGraphicsView abgeleitete Klasse für eine skalierbare Ansicht.
@@ -80,8 +102,8 @@ def apply_defensive_formation(formation):  # Definiert eine Funktion, um eine ge
             offset = offsets[i]  # Holt den Offset für den aktuellen Spieler.
             new_position = QPointF(ball_center.x() + offset[0], ball_center.y() + offset[1])  # Berechnet die neue Spielerposition.
             player.setPos(new_position)  # Setzt die neue Position des Spielers.
-            # Spieler-Schatten/Sektoren aktualisieren
-            player.updateShadow(ball_center.x(), ball_center.y())  # Aktualisiert den Schatten des Spielers basierend auf der Ballposition.
+    # Spieler-Schatten für alle Spieler gemeinsam aktualisieren
+    update_shadows(players, ball_center.x(), ball_center.y())  # Aktualisiert die Schatten basierend auf der Ballposition.
     # Nach der Aktualisierung: zeichne alle Annahmezonen
     for zone in zones:  # Iteriert über alle Zonen in der Formation.
         idx = zone.get('player_index')  # Holt den Spielerindex für die Zone.
@@ -92,9 +114,20 @@ def apply_defensive_formation(formation):  # Definiert eine Funktion, um eine ge
             c = QColor(color_vals[0], color_vals[1], color_vals[2], color_vals[3])  # Erstellt ein QColor-Objekt für die Zone.
             players[idx].addZone(r, c)  # Fügt die Zone dem entsprechenden Spieler hinzu.
 
-# Hauptfunktion: initialisiert GUI, Spielfeld, Ball, Spieler, Interpolation und Panels
-def main():  # Definiert die Hauptfunktion der Anwendung.
-    app = QApplication(sys.argv)  # Erstellt eine QApplication-Instanz.
+# Baut das Hauptfenster: Spielfeld, Ball, Spieler, Interpolation und Panels (ohne Event-Loop)
+def build_main_window(store=None, background=False):  # Definiert eine Funktion, die das Hauptfenster aufbaut.
+    """
+    Baut Szene, Ball, Spieler und Panels auf und verbindet alle Signale.
+
+    Parameter:
+        store: Speicher für Formationen und Teams (None = gemeinsamer Speicher, siehe storage.py)
+        background: Formationen und Teams nicht sofort laden; der Aufrufer startet das Laden im
+                    Hintergrund mit window.loader.start(), bis dahin sind die Panels gesperrt
+
+    Rückgabe: SimpleNamespace mit dem Fenster (widget), den Szenenobjekten und den Funktionen des
+    Ziehpfads, damit Benchmarks sie ohne Event-Loop aufrufen können. Eine QApplication muss existieren.
+    """
+    store = store or open_store()  # Verwendet den übergebenen oder den gemeinsamen Speicher.
     scene = QGraphicsScene()  # Erstellt eine QGraphicsScene-Instanz.
 
     # Spielfeld-Einrichtung
@@ -110,13 +143,22 @@ def main():  # Definiert die Hauptfunktion der Anwendung.
                        court_dims.width + 2*volleyball_field.overhang,  # Breite der Szene.
                        court_dims.height)  # Höhe der Szene.
    
+    # Optionale Zeitmessung pro Bild (VSM_PROFILE=1); ohne sie werden Ball und Funktionen unverändert verwendet
+    profiler = FrameProfiler() if PROFILE_ENABLED else None  # Ringpuffer der Bildzeiten oder None.
+    
+    def timed(stage, func):  # Definiert eine Funktion, die func bei aktivierter Zeitmessung als Stufe misst.
+        return profiler.wrap(stage, func) if profiler is not None else func  # Ohne Zeitmessung die Funktion selbst.
+    
     global ball  # Deklariert ball als globale Variable.
     # Ball
     ball_radius = 12  # Definiert den Radius des Balls (vergrößert für bessere Sichtbarkeit).
     ball_diameter = 2 * ball_radius  # Berechnet den Durchmesser des Balls.
     ball_x = 4.5 * scale  # Setzt die initiale x-Position des Balls.
     ball_y = 4.5 * scale  # Setzt die initiale y-Position des Balls.
-    ball = BallItem(QRectF(0, 0, ball_diameter, ball_diameter), label="", court_dimensions=court_dims)  # Erstellt eine BallItem-Instanz.
+    if profiler is not None:  # Ball, der Mausbewegungen und Bilder an den Profiler meldet.
+        ball = ProfiledBallItem(QRectF(0, 0, ball_diameter, ball_diameter), profiler, label="", court_dimensions=court_dims, drag_mode=DRAG_MODE)  # Erstellt eine ProfiledBallItem-Instanz.
+    else:  # Normaler Ball.
+        ball = BallItem(QRectF(0, 0, ball_diameter, ball_diameter), label="", court_dimensions=court_dims, drag_mode=DRAG_MODE)  # Erstellt eine BallItem-Instanz.
     ball.setPos(ball_x - ball_radius, ball_y - ball_radius)  # Setzt die Position des Balls (linke obere Ecke).
     ball.setZValue(500)  # Setzt den Z-Wert des Balls, um ihn über anderen Elementen darzustellen.
 
@@ -125,7 +167,8 @@ def main():  # Definiert die Hauptfunktion der Anwendung.
         QPointF(ball_x, ball_y),  # Setzt den Mittelpunkt des Sektors.
         court_width=court_dims.width,  # Übergibt die Breite des Spielfelds.
         court_height=court_dims.height,  # Übergibt die Höhe des Spielfelds.
-        net_y=court_dims.net_y  # Übergibt die y-Position des Netzes.
+        net_y=court_dims.net_y,  # Übergibt die y-Position des Netzes.
+        native_gradient=USE_NATIVE_GRADIENT  # Wählt zwischen nativem Farbverlauf und gecachter Pixmap.
     )
     scene.addItem(attack_sector)  # Fügt den Angriffssektor zur Szene hinzu.
     ball.link_sector(attack_sector)  # Verknüpft den Ball mit dem Angriffssektor.
@@ -171,89 +214,113 @@ def main():  # Definiert die Hauptfunktion der Anwendung.
     # Erstelle Haupt-Widget mit Ansicht und Abwehrpositionspanel
     main_widget = QWidget()  # Erstellt das Haupt-Widget.
     main_layout = QHBoxLayout(main_widget)  # Erstellt ein horizontales Layout für das Haupt-Widget.
-    main_layout.addWidget(view)  # Fügt die Ansicht zum Layout hinzu.
+    view_layout = QVBoxLayout()  # Spalte mit Ansicht und Ladeanzeige.
+    view_layout.addWidget(view)  # Fügt die Ansicht zum Layout hinzu.
+    loading_bar = QProgressBar()  # Fortschritt beim Laden der Formationen (nur während des Starts sichtbar).
+    loading_bar.hide()  # Zunächst ausgeblendet.
+    view_layout.addWidget(loading_bar)  # Unter der Ansicht.
+    main_layout.addLayout(view_layout)  # Fügt die Spalte zum Hauptlayout hinzu.
     
     # Liste für Formation-Marker erstellen
-    formation_markers = []  # Initialisiert eine leere Liste für Formationsmarker.
+    formation_markers = FormationMarkersItem()  # Ein Item für die Marker aller gespeicherten Ballpositionen.
+    scene.addItem(formation_markers)  # Fügt es zur Szene hinzu.
+    
+    # Interpolations-Engine: besitzt Dreiecke, Offsets und den räumlichen Index
+    interpolation_engine = InterpolationEngine()  # Initialisiert eine leere Interpolations-Engine.
+    
+    # Optionales Interpolationsgitter über den Bewegungsbereich des Balls (wird im Hintergrund berechnet)
+    interpolation_lattice = None  # Aktuelles Gitter (None, solange keins fertig ist).
+    lattice_builder = None  # Hintergrund-Builder für das Gitter.
+    if USE_INTERPOLATION_LATTICE:  # Nur wenn der Gittermodus aktiviert ist.
+        boundary = ball.movement_boundary  # Bewegungsbereich des Balls (9x9 m).
+        lattice_builder = LatticeBuilder((boundary.x(), boundary.y(), boundary.width(), boundary.height()), LATTICE_RESOLUTION)  # Erstellt den Builder.
+        
+        def on_lattice_ready(lattice):  # Wird im GUI-Thread aufgerufen, wenn ein Gitter fertig ist.
+            nonlocal interpolation_lattice  # Erlaubt die Modifikation der äußeren Variable.
+            interpolation_lattice = lattice  # Übernimmt das neue Gitter.
+        lattice_builder.latticeReady.connect(on_lattice_ready)  # Verbindet das Signal mit der Übernahme.
     
-    # Struktur zur Speicherung von Dreiecken und Offsets für Interpolation
-    interpolation_triangles = []  # Initialisiert eine leere Liste für Interpolationsdreiecke.
-    interpolation_offsets = []  # Initialisiert eine leere Liste für Interpolations-Offsets.
+    # Wiederverwendetes Objekt zum Zeichnen des Interpolations-Dreiecks (wird nur ein- und ausgeblendet)
+    triangle_overlay = QGraphicsPathItem()  # Erstellt das Item für die Linie des aktuellen Interpolationsdreiecks einmalig.
+    triangle_overlay.setPen(QPen(QColor("yellow"), 1))  # Setzt einen gelben Stift.
+    triangle_overlay.hide()  # Zunächst ausgeblendet.
+    scene.addItem(triangle_overlay)  # Fügt die Linie zur Szene hinzu.
+    shown_triangle = None  # Dreieck, dessen Pfad das Item gerade enthält.
     
-    # Globales Objekt zum Zeichnen des Interpolations-Dreiecks
-    current_triangle_line = None  # Initialisiert eine Variable für die Linie des aktuellen Interpolationsdreiecks.
+    def show_triangle(selected_triangle):  # Definiert eine Funktion, die das Interpolationsdreieck anzeigt oder ausblendet.
+        nonlocal shown_triangle  # Erlaubt die Modifikation der äußeren Variable shown_triangle.
+        # Gelbe Verbindungslinie für das ausgewählte Dreieck zeichnen oder entfernen
+        if selected_triangle:  # Wenn ein Dreieck ausgewählt wurde.
+            if selected_triangle != shown_triangle:  # Pfad nur bei einem anderen Dreieck neu setzen.
+                path = QPainterPath()  # Erstellt einen neuen QPainterPath.
+                p1 = QPointF(*selected_triangle[0])  # Erster Punkt des Dreiecks.
+                p2 = QPointF(*selected_triangle[1])  # Zweiter Punkt des Dreiecks.
+                p3 = QPointF(*selected_triangle[2])  # Dritter Punkt des Dreiecks.
+                path.moveTo(p1)  # Bewegt den Pfad zum ersten Punkt.
+                path.lineTo(p2)  # Zeichnet eine Linie zum zweiten Punkt.
+                path.lineTo(p3)  # Zeichnet eine Linie zum dritten Punkt.
+                path.lineTo(p1)  # Schließt den Pfad, um das Dreieck zu zeichnen.
+                triangle_overlay.setPath(path)  # Aktualisiert die vorhandene Linie.
+                shown_triangle = selected_triangle  # Merkt sich das angezeigte Dreieck.
+            triangle_overlay.show()  # Blendet die Linie ein.
+        else:  # Wenn kein Dreieck ausgewählt wurde.
+            triangle_overlay.hide()  # Blendet die Linie aus.
+    show_triangle = timed("triangle_overlay", show_triangle)  # Misst die Anzeige bei aktivierter Zeitmessung.
+    
+    # Räumlicher Index über die gespeicherten Ballpositionen für das Einrasten
+    snap_index = PointGrid(cell_size=SNAP_RADIUS)  # Gitter mit Zellgröße = Einrastradius (Abfrage prüft 3x3 Zellen).
+    snapped_formation = None  # Index der Formation, auf die zuletzt eingerastet wurde.
+    
+    def rebuild_snap_index():  # Definiert eine Funktion, die den Einrast-Index neu aufbaut.
+        nonlocal snap_index, snapped_formation  # Erlaubt die Modifikation der äußeren Variablen.
+        snap_index = PointGrid([form["ball"] for form in def_panel.formations], SNAP_RADIUS)  # Indiziert alle Ballpositionen.
+        snapped_formation = None  # Indizes können sich verschoben haben.
+    
+    # Beim Start im Hintergrund aufgebaute Engine und Einrast-Index (werden einmalig übernommen statt neu aufgebaut)
+    prebuilt = None  # (InterpolationEngine, PointGrid) oder None.
     
     def update_interpolation_data():  # Definiert eine Funktion zur Aktualisierung der Interpolationsdaten.
         # Aktualisiert Triangulationsdaten aus gespeicherten Formationen für Interpolation
-        global ball  # Deklariert die Verwendung der globalen Variable ball.
-        interpolation_triangles.clear()  # Leert die Liste der Interpolationsdreiecke.
-        interpolation_offsets.clear()  # Leert die Liste der Interpolations-Offsets.
-        
-        # Mindestens 3 Formationen für Triangulation erforderlich
-        if len(def_panel.formations) < 3:  # Überprüft, ob genügend Formationen für die Triangulation vorhanden sind.
-            return  # Bricht ab, wenn nicht genügend Formationen vorhanden sind.
-            
-        # Erzeuge alle möglichen Dreiecke aus Ballpositionen
+        # Trianguliere die Ballpositionen (Delaunay, ohne entartete/flache Dreiecke) und indiziere die Dreiecke
         ball_positions = [(form["ball"][0], form["ball"][1]) for form in def_panel.formations]  # Extrahiert die Ballpositionen aus den gespeicherten Formationen.
         player_offsets = [form["offsets"] for form in def_panel.formations]  # Extrahiert die Spieler-Offsets aus den gespeicherten Formationen.
-        
-        # Für jede Kombination von 3 Positionen ein Dreieck erstellen
-        for indices in combinations(range(len(ball_positions)), 3):  # Iteriert über alle Kombinationen von 3 Indizes.
-            triangle = [ball_positions[i] for i in indices]  # Erstellt ein Dreieck aus den entsprechenden Ballpositionen.
-            triangle_offsets = [player_offsets[i] for i in indices]  # Holt die entsprechenden Spieler-Offsets.
-            
-            interpolation_triangles.append(triangle)  # Fügt das Dreieck zur Liste hinzu.
-            interpolation_offsets.append(triangle_offsets)  # Fügt die Offsets zur Liste hinzu.
+        interpolation_engine.rebuild(ball_positions, player_offsets)  # Baut Triangulation und räumlichen Index neu auf.
+        request_lattice()  # Aktualisiert ggf. das Interpolationsgitter.
+    
+    def request_lattice():  # Definiert eine Funktion, die das Gitter im Hintergrund neu berechnen lässt.
+        if lattice_builder is not None:  # Nur im Gittermodus.
+            # Kopie der Engine, damit der Hintergrund-Thread einen konsistenten Stand sieht
+            lattice_builder.request(interpolation_engine.snapshot())  # Aktualisiert das Gitter im Hintergrund.
     
     def interpolate_player_positions(x, y):  # Definiert eine Funktion zur Interpolation der Spielerpositionen.
         # Interpoliert und aktualisiert Spielerpositionen basierend auf aktueller Ballposition
-        nonlocal current_triangle_line  # Erlaubt die Modifikation der äußeren Variable current_triangle_line.
         """Versucht, Spielerpositionen basierend auf der Ballposition zu interpolieren.""" # Englischer Kommentar übersetzt.
         # Zonen ausblenden, wenn Ball bewegt wird
         for player in players:  # Iteriert über alle Spieler.
             player.clearZones()  # Löscht die Annahmezonen der Spieler.
         
         # Nur interpolieren, wenn genügend Formationen verfügbar sind
-        if len(interpolation_triangles) == 0:  # Überprüft, ob Interpolationsdreiecke vorhanden sind.
+        if len(interpolation_engine) == 0:  # Überprüft, ob Interpolationsdreiecke vorhanden sind.
             return  # Bricht ab, wenn keine Dreiecke vorhanden sind.
             
         ball_pos = (x, y)  # Speichert die aktuelle Ballposition als Tupel.
         
-        # Wähle das kleinste Dreieck (nach Fläche), das die aktuelle Ballposition enthält
-        selected_triangle = None  # Initialisiert das ausgewählte Dreieck mit None.
-        min_area = None  # Initialisiert die minimale Fläche mit None.
-        for triangle in interpolation_triangles:  # Iteriert über alle Interpolationsdreiecke.
-            if point_in_triangle(ball_pos, *triangle):  # Überprüft, ob der Ball im aktuellen Dreieck liegt.
-                # Berechne die Dreiecksfläche mit der Shoelace-Formel
-                a, b, c = triangle  # Entpackt die Eckpunkte des Dreiecks.
-                area = abs(a[0]*(b[1]-c[1]) + b[0]*(c[1]-a[1]) + c[0]*(a[1]-b[1])) / 2  # Berechnet die Fläche des Dreiecks.
-                if (min_area is None) or (area < min_area):  # Überprüft, ob dies das kleinste Dreieck ist, das den Punkt enthält.
-                    min_area = area  # Aktualisiert die minimale Fläche.
-                    selected_triangle = triangle  # Setzt das aktuell kleinste Dreieck.
+        # Eine einzige Abfrage liefert Dreieck, Gewichte und Offsets (Anzeige und Offsets stimmen überein)
+        result = None  # Ergebnis der Abfrage.
+        if interpolation_lattice is not None and interpolation_lattice.engine.version == interpolation_engine.version:  # Gitter ist aktuell.
+            lookup = interpolation_lattice.lookup(ball_pos)  # Bilineare Abfrage aus dem Gitter (O(1)).
+            if lookup is not None:  # Alle vier Nachbarknoten gültig.
+                # Angezeigtes Dreieck über die Engine (O(1) über das Dreiecksgitter), nicht über den nächsten Gitterknoten:
+                # die Gitter-Offsets sind eine Näherung und mischen an Dreieckskanten Werte beider Dreiecke
+                hit = interpolation_engine.locate(ball_pos)  # Dreieck, das die Ballposition enthält.
+                triangle = interpolation_engine.triangles[hit[0]] if hit else None  # Eckpunkte oder None.
+                result = (triangle, None, lookup[1])  # Gleiches Format wie die Engine-Abfrage (ohne Gewichte).
+        if result is None:  # Kein Gitter oder Rand der Triangulation.
+            result = interpolation_engine.query(ball_pos)  # Fragt die Interpolations-Engine direkt ab.
+        show_triangle(result[0] if result else None)  # Zeigt das Dreieck an, das die Ballposition enthält.
         
-        # Gelbe Verbindungslinie für das ausgewählte Dreieck zeichnen oder entfernen
-        if selected_triangle:  # Wenn ein Dreieck ausgewählt wurde.
-            if current_triangle_line is not None:  # Wenn bereits eine Linie gezeichnet wurde.
-                scene.removeItem(current_triangle_line)  # Entfernt die alte Linie.
-            path = QPainterPath()  # Erstellt einen neuen QPainterPath.
-            p1 = QPointF(*selected_triangle[0])  # Erster Punkt des Dreiecks.
-            p2 = QPointF(*selected_triangle[1])  # Zweiter Punkt des Dreiecks.
-            p3 = QPointF(*selected_triangle[2])  # Dritter Punkt des Dreiecks.
-            path.moveTo(p1)  # Bewegt den Pfad zum ersten Punkt.
-            path.lineTo(p2)  # Zeichnet eine Linie zum zweiten Punkt.
-            path.lineTo(p3)  # Zeichnet eine Linie zum dritten Punkt.
-            path.lineTo(p1)  # Schließt den Pfad, um das Dreieck zu zeichnen.
-            pen = QPen(QColor("yellow"), 1)  # Erstellt einen gelben Stift.
-            current_triangle_line = QGraphicsPathItem(path)  # Erstellt ein QGraphicsPathItem mit dem Pfad.
-            current_triangle_line.setPen(pen)  # Setzt den Stift für das Item.
-            scene.addItem(current_triangle_line)  # Fügt die Linie zur Szene hinzu.
-        else:  # Wenn kein Dreieck ausgewählt wurde.
-            if current_triangle_line is not None:  # Wenn eine Linie vorhanden ist.
-                scene.removeItem(current_triangle_line)  # Entfernt die Linie.
-                current_triangle_line = None  # Setzt die Linienvariable zurück.
-        
-        # Offsets wie zuvor interpolieren
-        interpolated_offsets = interpolate_position(ball_pos, interpolation_triangles, interpolation_offsets)  # Ruft die Interpolationsfunktion auf.
+        # Offsets aus derselben Abfrage übernehmen
+        interpolated_offsets = result[2] if result else None  # Holt die interpolierten Offsets.
         
         if interpolated_offsets:  # Wenn Offsets erfolgreich interpoliert wurden.
             for i, player in enumerate(players):  # Iteriert über alle Spieler.
@@ -261,30 +328,63 @@ def main():  # Definiert die Hauptfunktion der Anwendung.
                     offset = interpolated_offsets[i]  # Holt den interpolierten Offset.
                     new_position = QPointF(x + offset[0], y + offset[1])  # Berechnet die neue Spielerposition.
                     player.setPos(new_position)  # Setzt die neue Spielerposition.
-                    player.updateShadow(x, y)  # Aktualisiert den Spielerschatten.
+            ball.update_player_shadows(x, y)  # Aktualisiert die Spielerschatten in einem Durchlauf.
     
     def update_formation_markers(formations):  # Definiert eine Funktion zur Aktualisierung der Formationsmarker.
         # Aktualisiert visuelle Marker für jede gespeicherte defensive Formation
-        # Alte Marker entfernen
-        for marker in formation_markers:  # Iteriert über vorhandene Marker.
-            if marker.scene():  # Überprüft, ob der Marker Teil einer Szene ist.
-                scene.removeItem(marker)  # Entfernt den Marker aus der Szene.
-        formation_markers.clear()  # Leert die Liste der Formationsmarker.
-        
-        # Neue Marker für jede Formation hinzufügen
-        for i, form in enumerate(formations):  # Iteriert über die aktuellen Formationen.
-            ball_pos = form["ball"]  # Holt die Ballposition der Formation.
-            marker = FormationMarkerItem(ball_pos, i)  # Erstellt einen neuen Formationsmarker.
-            scene.addItem(marker)  # Fügt den Marker zur Szene hinzu.
-            formation_markers.append(marker)  # Fügt den Marker zur Liste hinzu.
+        formation_markers.set_positions([form["ball"] for form in formations])  # Ersetzt alle Ballpositionen im Marker-Item.
+        formation_markers.set_highlight(def_panel.current_index)  # Hebt die ausgewählte Formation hervor (nach dem Laden keine).
         
-        # Nach Marker-Aktualisierung Interpolationsdaten aktualisieren
+        # Nach Marker-Aktualisierung Interpolationsdaten und Einrast-Index aktualisieren
+        nonlocal prebuilt, snap_index, snapped_formation  # Erlaubt die Modifikation der äußeren Variablen.
+        if prebuilt is not None:  # Beim Start bereits im Hintergrund aufgebaut.
+            engine, snap_index = prebuilt  # Übernimmt den Einrast-Index.
+            prebuilt = None  # Nur einmal verwenden.
+            interpolation_engine.take_over(engine)  # Übernimmt die Triangulation ohne Neuaufbau.
+            snapped_formation = None  # Noch nicht eingerastet.
+            request_lattice()  # Aktualisiert ggf. das Interpolationsgitter.
+            return  # Fertig.
         update_interpolation_data()  # Ruft die Funktion zur Aktualisierung der Interpolationsdaten auf.
+        rebuild_snap_index()  # Indiziert die Ballpositionen neu.
+    
+    def on_formation_edited(event):  # Definiert eine Funktion, die einzelne Formationsänderungen verarbeitet.
+        # Aktualisiert nur die betroffenen Marker und Dreiecke statt alles neu aufzubauen
+        nonlocal snapped_formation  # Erlaubt die Modifikation der äußeren Variable.
+        kind = event["kind"]  # Art der Änderung.
+        index = event["index"]  # Index der betroffenen Formation.
+        form = event["formation"]  # Betroffene Formation (bei Löschung die entfernte).
+        if kind == FORMATION_METADATA:  # Name oder Zonen geändert.
+            return  # Kein Einfluss auf Marker oder Interpolation.
+        if kind == FORMATION_ADDED:  # Neue Formation.
+            formation_markers.insert(index, form["ball"])  # Fügt einen Marker für die neue Ballposition ein.
+            interpolation_engine.insert_formation(index, form["ball"], form["offsets"])  # Fügt den Punkt in die Triangulation ein.
+            if index < len(def_panel.formations) - 1:  # Nicht angehängt: spätere Indizes rücken nach hinten.
+                snap_index.shift(index, 1)
+                if snapped_formation is not None and snapped_formation >= index:
+                    snapped_formation += 1
+            snap_index.insert(index, form["ball"])  # Trägt die Ballposition in den Einrast-Index ein.
+        elif kind == FORMATION_REMOVED:  # Formation gelöscht.
+            formation_markers.remove(index)  # Entfernt den Marker.
+            interpolation_engine.remove_formation(index)  # Entfernt den Punkt aus der Triangulation.
+            snap_index.remove(index, form["ball"])  # Trägt die Ballposition aus dem Einrast-Index aus.
+            if index < len(def_panel.formations):  # Nicht die letzte: spätere Indizes rücken nach vorn.
+                snap_index.shift(index + 1, -1)
+            if snapped_formation == index:  # Eingerastete Formation gelöscht.
+                snapped_formation = None
+            elif snapped_formation is not None and snapped_formation > index:  # Eingerastete Formation rückt nach vorn.
+                snapped_formation -= 1
+        formation_markers.set_highlight(def_panel.current_index)  # Hervorhebung folgt der Auswahl im Panel.
+        request_lattice()  # Aktualisiert ggf. das Interpolationsgitter.
     
     # Übergibt volleyball_field.scale als Skalierungsfaktor an das Panel
-    def_panel = DefensivePositionsPanel(get_formation_callback=getFormation, scale_factor=volleyball_field.scale)  # Erstellt das DefensivePositionsPanel.
+    def_panel = DefensivePositionsPanel(get_formation_callback=getFormation, scale_factor=volleyball_field.scale, store=store, autoload=False)  # Erstellt das DefensivePositionsPanel (Formationen kommen vom StartupLoader).
     def_panel.formationSelected.connect(apply_defensive_formation)  # Verbindet das formationSelected-Signal mit der apply_defensive_formation-Funktion.
+
+    def highlight_selected_formation(_formation):  # Hebt den Marker der ausgewählten bzw. eingerasteten Formation hervor.
+        formation_markers.set_highlight(def_panel.current_index)
+    def_panel.formationSelected.connect(highlight_selected_formation)  # Verbindet das formationSelected-Signal mit der Hervorhebung.
     def_panel.formationsChanged.connect(update_formation_markers)  # Verbindet das formationsChanged-Signal mit der update_formation_markers-Funktion.
+    def_panel.formationEdited.connect(on_formation_edited)  # Verbindet einzelne Änderungen mit der inkrementellen Aktualisierung.
     main_layout.addWidget(def_panel)  # Fügt das Panel zum Hauptlayout hinzu.
     
     # Zonen-Callback für alle Spieler setzen
@@ -305,39 +405,136 @@ def main():  # Definiert die Hauptfunktion der Anwendung.
                 player.name_text.setPlainText(names[i])  # Setzt den Text des Namenlabels.
                 player.updateNameTextPosition()  # Aktualisiert die Position des Namenstextes.
 
-    team_panel = TeamPanel(get_names_callback=get_player_names)  # Erstellt das TeamPanel.
+    team_panel = TeamPanel(get_names_callback=get_player_names, store=store, autoload=False)  # Erstellt das TeamPanel (Teams kommen vom StartupLoader).
     team_panel.teamSelected.connect(on_team_selected)  # Verbindet das teamSelected-Signal mit der on_team_selected-Funktion.
     main_layout.addWidget(team_panel)  # Fügt das TeamPanel zum Hauptlayout hinzu.
-    # Erst nach Verbindung des Signals initiales Team laden
-    team_panel.load_teams()  # Lädt die gespeicherten Teams.
     
-    # Initialisierung der Marker mit aktuell geladenen Formationen
-    update_formation_markers(def_panel.formations)  # Aktualisiert die Formationsmarker initial.
+    # Formationen und Teams laden, Triangulation und Einrast-Index aufbauen (synchron oder im Hintergrund)
+    loader = StartupLoader(store, SNAP_RADIUS)  # Lädt einmalig beim Start.
+    
+    def on_loaded(data):  # Wird im GUI-Thread aufgerufen, wenn die Daten geladen sind.
+        nonlocal prebuilt  # Erlaubt die Modifikation der äußeren Variable.
+        start = time.perf_counter()  # Misst die Übernahme im GUI-Thread.
+        prebuilt = (data.engine, data.snap_index)  # Wird von update_formation_markers übernommen.
+        def_panel.set_formations(data.formations)  # Liste füllen; formationsChanged aktualisiert Marker und Interpolation.
+        prebuilt = None  # Ohne Formationen wird kein Signal gesendet.
+        team_panel.set_teams(data.teams)  # Erst nach Verbindung des Signals das erste Team auswählen.
+        data.timings["apply"] = round((time.perf_counter() - start) * 1000, 1)  # Dauer der Übernahme.
+        loading_bar.hide()  # Ladeanzeige ausblenden.
+        def_panel.setEnabled(True)  # Panels freigeben.
+        team_panel.setEnabled(True)  # Panels freigeben.
+    
+    def on_load_progress(percent, text):  # Zeigt den Fortschritt des Ladens an.
+        loading_bar.setValue(percent)  # Setzt den Fortschritt.
+        loading_bar.setFormat("%s … %%p%%" % text)  # Beschreibt den aktuellen Schritt.
     
-    # Verknüpft Ballpositionsänderungen mit Interpolationsfunktion
-    ball.positionChanged.connect(interpolate_player_positions)  # Verbindet das positionChanged-Signal des Balls mit der Interpolationsfunktion.
+    def on_load_failed(message):  # Laden im Hintergrund fehlgeschlagen.
+        print("Fehler beim Laden der Formationen und Teams:", message)  # Gibt eine Fehlermeldung aus.
+        loading_bar.hide()  # Ladeanzeige ausblenden.
+        def_panel.setEnabled(True)  # Panels freigeben (leere Listen).
+        team_panel.setEnabled(True)  # Panels freigeben (leere Listen).
+    
+    if background:  # Fenster sofort anzeigen, Daten kommen über Signale.
+        loader.loaded.connect(on_loaded)  # Übernimmt die Daten im GUI-Thread.
+        loader.progress.connect(on_load_progress)  # Zeigt den Fortschritt an.
+        loader.failed.connect(on_load_failed)  # Meldet Fehler.
+        def_panel.setEnabled(False)  # Bis zum Ende des Ladens keine Änderungen.
+        team_panel.setEnabled(False)  # Bis zum Ende des Ladens keine Teamänderungen.
+        loading_bar.show()  # Ladeanzeige einblenden.
+    else:  # Synchron laden (Benchmarks, Wiedergabe).
+        on_loaded(loader.load())  # Lädt und übernimmt sofort.
     
     # Einrastfunktion: Überprüft Nähe des Balls zu gespeicherten Formationen und läd sie
     def snap_to_formation(x, y):  # Definiert eine Funktion zum Einrasten auf Formationen.
-        snap_radius = 10  # Definiert den Radius, innerhalb dessen eingerastet wird (halbiert).
-        # Suche nach nächster gespeicherter Formation
-        for idx, form in enumerate(def_panel.formations):  # Iteriert über alle gespeicherten Formationen.
-            fx, fy = form["ball"]  # Holt die Ballposition der Formation.
-            if math.hypot(x - fx, y - fy) <= snap_radius:  # Überprüft, ob der Ball nahe genug an der Formation ist.
-                saved = (fx, fy)  # Speichert die Ballposition der Formation.
-                offs = [tuple(off) for off in form.get("offsets", [])]  # Holt die Offsets der Formation.
-                zones = form.get("zones", [])  # Holt die Zonen der Formation.
-                # Lade Formation und setze Listenauswahl
-                apply_defensive_formation((saved, offs, zones))  # Wendet die Formation an.
-                def_panel.positions_list.setCurrentRow(idx)  # Wählt die Formation in der Liste aus.
-                def_panel.on_item_clicked(def_panel.positions_list.currentItem())  # Simuliert einen Klick auf das Listenelement.
-                break  # Beendet die Schleife, da eine Formation gefunden und angewendet wurde.
-    ball.positionChanged.connect(snap_to_formation)  # Verbindet das positionChanged-Signal des Balls mit der Einrastfunktion.
+        """Rastet auf die nächste Formation im Einrastradius ein; gibt True zurück, solange eine Formation eingerastet ist."""
+        nonlocal snapped_formation  # Erlaubt die Modifikation der äußeren Variable snapped_formation.
+        # Hysterese: bereits eingerastete Formation erst nach Verlassen des größeren Radius wieder freigeben
+        if snapped_formation is not None and snapped_formation < len(def_panel.formations):  # Bereits eingerastet.
+            fx, fy = def_panel.formations[snapped_formation]["ball"]  # Ballposition der eingerasteten Formation.
+            if math.hypot(x - fx, y - fy) <= SNAP_RELEASE_RADIUS:  # Ball noch in der Nähe.
+                return True  # Formation nicht erneut anwenden, sie bleibt stehen.
+            snapped_formation = None  # Einrasten aufgehoben.
+        # Suche nach nächster gespeicherter Formation (nur Nachbarzellen des Gitters)
+        idx = snap_index.nearest(x, y, SNAP_RADIUS)  # Index der nächsten Formation im Einrastradius oder None.
+        if idx is None:  # Keine Formation in der Nähe.
+            return False  # Nicht eingerastet.
+        form = def_panel.formations[idx]  # Holt die Formation.
+        saved = tuple(form["ball"])  # Speichert die Ballposition der Formation.
+        offs = [tuple(off) for off in form.get("offsets", [])]  # Holt die Offsets der Formation.
+        zones = form.get("zones", [])  # Holt die Zonen der Formation.
+        # Lade Formation und setze Listenauswahl
+        apply_defensive_formation((saved, offs, zones))  # Wendet die Formation an.
+        def_panel.select_formation(idx)  # Wählt die Formation in der Liste aus (wie ein Klick auf den Eintrag).
+        snapped_formation = idx  # Merkt sich die eingerastete Formation.
+        return True  # Eingerastet.
+    
+    # Ballbewegung: eingerastete Formation stehen lassen oder Spielerpositionen interpolieren (nie beides)
+    snap_stage = timed("snap", snap_to_formation)  # Misst das Einrasten bei aktivierter Zeitmessung.
+    interpolation_stage = timed("interpolation", interpolate_player_positions)  # Misst die Interpolation bei aktivierter Zeitmessung.
+    
+    def on_ball_moved(x, y):  # Definiert eine Funktion, die auf Ballbewegungen reagiert.
+        if snap_stage(x, y):  # Formation eingerastet: Spieler und Zonen bleiben wie gespeichert.
+            show_triangle(None)  # Keine Interpolation, daher kein Dreieck.
+        else:  # Nicht eingerastet.
+            interpolation_stage(x, y)  # Interpoliert die Spielerpositionen (löscht die Zonen).
+    ball.positionChanged.connect(on_ball_moved)  # Verbindet das positionChanged-Signal des Balls mit Einrasten und Interpolation.
+    
+    # Anzeige der Bildzeiten oben links und Export mit Strg+Umschalt+P (nur bei aktivierter Zeitmessung)
+    if profiler is not None:  # Zeitmessung aktiv.
+        hud = ProfilerHud(profiler)  # Erstellt die Anzeige.
+        scene.addItem(hud)  # Fügt sie zur Szene hinzu.
+        hud.setPos(scene.sceneRect().topLeft())  # Oben links in der Szene.
+        QShortcut(QKeySequence("Ctrl+Shift+P"), main_widget).activated.connect(lambda: profiler.dump())  # Schreibt den Ringpuffer als JSON.
+    
+    # Optionaler Mitschnitt von Ball, Spielern, Zonen und Formationsänderungen (VSM_RECORD)
+    recorder = None  # SessionRecorder oder None.
+    if RECORD_PATH:  # Mitschnitt aktiviert.
+        recorder = SessionRecorder(RECORD_PATH, ball, players, def_panel.formations, DRAG_MODE)  # Schreibt den Ausgangszustand.
+        BallItem.recorder = PlayerItem.recorder = recorder  # Ball und Spieler melden ihre Bewegungen.
+        
+        def record_formation_edit(event):  # Zeichnet Änderungen auf, die Marker oder Interpolation betreffen.
+            if event["kind"] != FORMATION_METADATA:  # Zonen werden als eigene Ereignisse aufgezeichnet.
+                recorder.formations_changed(def_panel.formations)  # Momentaufnahme der Formationsliste.
+        def_panel.formationsChanged.connect(recorder.formations_changed)  # Neu geladene Formationen.
+        def_panel.formationEdited.connect(record_formation_edit)  # Einzelne Änderungen.
     
     main_widget.setWindowTitle("Volleyball Angriffssituation")  # Setzt den Fenstertitel.
     main_widget.resize(1600, 1600)  # Setzt die Größe des Hauptfensters.
-    main_widget.show()  # Zeigt das Hauptfenster an.
     
+    return SimpleNamespace(  # Gibt Fenster, Szenenobjekte und Funktionen des Ziehpfads zurück.
+        widget=main_widget, scene=scene, view=view, ball=ball, players=players, attack_sector=attack_sector,
+        def_panel=def_panel, team_panel=team_panel, interpolation_engine=interpolation_engine,
+        update_interpolation_data=update_interpolation_data, interpolate_player_positions=interpolate_player_positions,
+        update_formation_markers=update_formation_markers, formation_markers=formation_markers, snap_to_formation=snap_to_formation, profiler=profiler,
+        recorder=recorder, loader=loader,
+    )
+
+# Hauptfunktion: erstellt die Anwendung, zeigt das Hauptfenster und startet die Event-Loop
+def main():  # Definiert die Hauptfunktion der Anwendung.
+    timer = StartupTimer(STARTUP_BEGIN)  # Startzeitmessung ab den Qt-Importen.
+    timer.mark("imports")  # Importe abgeschlossen.
+    app = QApplication(sys.argv)  # Erstellt eine QApplication-Instanz.
+    timer.mark("qapplication")
+    window = build_main_window(background=True)  # Baut das Hauptfenster ohne Formationen und Teams auf.
+    timer.mark("window")
+    window.widget.show()  # Zeigt das Hauptfenster an.
+    timer.mark("show")
+    QTimer.singleShot(0, lambda: timer.mark("event_loop"))  # Erste Runde der Event-Loop (Fenster wird gezeichnet).
+    
+    def on_ready(data):  # Formationen und Teams sind übernommen.
+        timer.mark("ready")  # Warten auf den Hintergrund und Übernahme.
+        print(timer.summary_text(data.timings))  # Gibt die Startzeiten aus.
+        if STARTUP_LOG:  # Startzeiten protokollieren (VSM_STARTUP_LOG).
+            timer.write(STARTUP_LOG, timer.report(data.timings, formations=len(data.formations), teams=len(data.teams),
+                                                  store=type(window.def_panel.store).__name__))
+    window.loader.loaded.connect(on_ready)  # Nach der Übernahme im Fenster (Reihenfolge der Verbindungen).
+    window.loader.start()  # Lädt Formationen und Teams im Hintergrund.
+    
+    app.aboutToQuit.connect(window.def_panel.store.flush)  # Schreibt ausstehende Änderungen vor dem Beenden.
+    if window.profiler is not None:  # Zeitmessung aktiv.
+        app.aboutToQuit.connect(lambda: window.profiler.dump())  # Schreibt die Bildzeiten beim Beenden (VSM_PROFILE_DUMP).
+    if window.recorder is not None:  # Mitschnitt aktiv.
+        app.aboutToQuit.connect(window.recorder.close)  # Schließt die Mitschnittdatei.
     sys.exit(app.exec())  # Startet die Event-Loop der Anwendung und beendet das Programm beim Schließen.
 
 if __name__ == '__main__':  # Überprüft, ob das Skript direkt ausgeführt wird.
@@ -1,16 +1,25 @@
 import math # Importiert das Modul math für mathematische Operationen
+from collections import OrderedDict # Importiert OrderedDict für den LRU-Cache
 from PySide6.QtCore import Qt, QPointF # Importiert Qt und QPointF von PySide6.QtCore
 from PySide6.QtGui import QBrush, QColor, QPainterPath, QRadialGradient, QPixmap, QPainter, QTransform # Importiert notwendige Klassen von PySide6.QtGui
 from .base_sector import BaseSector # Importiert die Basisklasse BaseSector
+from core.sectors import attack_sector_arc # Importiert die Qt-freie Geometrie des Angriffssektors
+
+# Farben des Angriffssektors, bereits mit 50% Deckkraft
+ATTACK_COLOR_INNER = QColor(255, 0, 0, 128) # Rot nahe am Ball (hohe Angriffsintensität)
+ATTACK_COLOR_OUTER = QColor(255, 255, 0, 128) # Gelb am Rand (niedrigere Intensität)
+GRADIENT_RADIUS_STEP = 8 # Rasterweite der Radien im Gradienten-Cache (Pixel)
+GRADIENT_CACHE_BYTES = 64 * 1024 * 1024 # Speichergrenze des Gradienten-Caches (64 MB)
 
 class AttackSector(BaseSector): # Definiert die Klasse AttackSector, die von BaseSector erbt
-    def __init__(self, ball_pos:QPointF, court_width=270, court_height=540, net_y=270, radius=300): # Konstruktor der Klasse
+    def __init__(self, ball_pos:QPointF, court_width=270, court_height=540, net_y=270, radius=300, native_gradient=False): # Konstruktor der Klasse
         super().__init__(ball_pos, z_index=2) # Ruft den Konstruktor der Basisklasse auf und initialisiert den Sektor mit der angegebenen Ballposition und einem Z-Index von 2
         self.ball_pos = ball_pos # Speichert die Ballposition
         self.court_width = court_width # Speichert die Breite des Spielfelds
         self.court_height = court_height # Speichert die Höhe des Spielfelds
         self.net_y = net_y # Speichert die Y-Koordinate des Netzes
         self.radius = radius # Speichert den Radius des Sektors (wird hier nicht direkt für den Pfad verwendet, aber für den Gradienten)
+        self.native_gradient = native_gradient # True: QRadialGradient-Pinsel statt gecachter Pixmap
         self.update_path() # Aktualisiert den Pfad des Sektors
         
     def updatePosition(self, ball_x, ball_y): # Methode zur Aktualisierung der Sektorposition basierend auf der Ballposition
@@ -21,23 +30,9 @@ class AttackSector(BaseSector): # Definiert die Klasse AttackSector, die von Bas
     def update_path(self): # Methode zur Aktualisierung des Pfades und des Aussehens des Sektors
         path = QPainterPath() # Erstellt ein neues QPainterPath-Objekt
         
-        # Definiert die Positionen der Netzenden
-        left_net = QPointF(0, self.net_y) # Linkes Netzende
-        right_net = QPointF(self.court_width, self.net_y) # Rechtes Netzende
-        
-        # Dynamischer Radius: Berechnet den verfügbaren Platz vom Ball zum unteren Spielfeldrand
-        dynamic_radius = self.net_y * 2 - self.ball_pos.y() # Berechnet den dynamischen Radius basierend auf der Ballposition und der Netzhöhe
-        
-        # Berechnet die Winkel vom Ball zu den beiden Netzenden
+        # Dynamischer Radius (Platz vom Ball zum unteren Spielfeldrand) und Winkel vom Ball zu den beiden Netzenden
         # Diese Winkel bestimmen die Grenzen des Angriffssektors
-        angle_left = math.degrees(math.atan2(self.ball_pos.y() - left_net.y(), # Berechnet den Winkel zum linken Netzende
-                                            left_net.x() - self.ball_pos.x()))
-        angle_right = math.degrees(math.atan2(self.ball_pos.y() - right_net.y(), # Berechnet den Winkel zum rechten Netzende
-                                            right_net.x() - self.ball_pos.x()))
-        
-        # Zeichnet den Bogen des Angriffssektors
-        start_angle = angle_left # Startwinkel des Bogens
-        sweep_angle = angle_right - angle_left # Ausdehnungswinkel des Bogens
+        dynamic_radius, start_angle, sweep_angle = attack_sector_arc(self.ball_pos.x(), self.ball_pos.y(), self.court_width, self.net_y) # Qt-freie Berechnung des Bogens
         
         path.moveTo(self.ball_pos.x(), self.ball_pos.y()) # Bewegt den Startpunkt des Pfades zur Ballposition
         path.arcTo(self.ball_pos.x() - dynamic_radius, self.ball_pos.y() - dynamic_radius, # Definiert das Rechteck für den Bogen
@@ -50,37 +45,80 @@ class AttackSector(BaseSector): # Definiert die Klasse AttackSector, die von Bas
         self._create_attack_gradient(dynamic_radius) # Ruft die Methode zur Erstellung des Farbverlaufs auf
         
     def _create_attack_gradient(self, radius): # Private Methode zur Erstellung des Farbverlaufs
-        # Erstellt eine Zeichenfläche für den Farbverlauf
-        size = int(radius * 2) # Größe der Pixmap basierend auf dem Radius
-        if size <= 0: # Wenn die Größe ungültig ist
+        if radius <= 0: # Wenn der Radius ungültig ist
+            return # Beendet die Methode
+        if self.native_gradient: # Nativer Farbverlauf ohne Pixmap
+            radial = QRadialGradient(self.ball_pos, radius) # Radialer Farbverlauf direkt um den Ball
+            radial.setColorAt(0.0, ATTACK_COLOR_INNER) # Rot nahe am Ball (hohe Angriffsintensität, 50% Deckkraft)
+            radial.setColorAt(1.0, ATTACK_COLOR_OUTER) # Gelb am Rand (niedrigere Intensität, 50% Deckkraft)
+            self.setBrush(QBrush(radial)) # Setzt den Farbverlauf als Füllpinsel
             return # Beendet die Methode
-            
-        combined = QPixmap(size, size) # Erstellt eine Pixmap für den kombinierten Farbverlauf
-        combined.fill(QColor(0, 0, 0, 0))  # Füllt die Pixmap mit transparenter Farbe (Transparenter Hintergrund)
-        
-        painter = QPainter(combined) # Erstellt einen QPainter zum Zeichnen auf der Pixmap
-        # Erzeugt einen radialen Farbverlauf vom Ball nach außen
-        radial = QRadialGradient(QPointF(size/2, size/2), radius) # Erstellt einen radialen Farbverlauf
-        radial.setColorAt(0.0, QColor(255, 0, 0, 255))   # Setzt die Farbe am Startpunkt (Rot nahe am Ball (hohe Angriffsintensität))
-        radial.setColorAt(1.0, QColor(255, 255, 0, 255)) # Setzt die Farbe am Endpunkt (Gelb am Rand (niedrigere Intensität))
-        painter.setBrush(QBrush(radial)) # Setzt den Farbverlauf als Füllpinsel für den Painter
-        painter.setPen(Qt.PenStyle.NoPen) # Kein Rand für die Zeichnung
-        painter.drawRect(0, 0, size, size) # Zeichnet ein Rechteck mit dem Farbverlauf
-        painter.end() # Beendet den Painter
-        
-        # Fügt Transparenz hinzu (50%)
-        temp = QPixmap(size, size) # Erstellt eine temporäre Pixmap
-        temp.fill(QColor(0, 0, 0, 0)) # Füllt die temporäre Pixmap mit transparenter Farbe
-        painter2 = QPainter(temp) # Erstellt einen zweiten Painter für die temporäre Pixmap
-        painter2.setOpacity(0.5) # Setzt die Deckkraft auf 50%
-        painter2.drawPixmap(0, 0, combined) # Zeichnet die ursprüngliche Pixmap mit Deckkraft auf die temporäre Pixmap
-        painter2.end() # Beendet den zweiten Painter
-        combined = temp # Weist die temporäre Pixmap (mit Transparenz) der combined-Variable zu
         
-        # Positioniert den Farbverlauf auf dem Spielfeld passend zur Ballposition
-        combined_brush = QBrush(combined) # Erstellt einen Füllpinsel aus der kombinierten Pixmap
+        # Pixmap aus dem Cache für den gerundeten Radius holen und auf den exakten Radius skalieren
+        cached_radius = _quantize_radius(radius) # Gerundeter Radius (Cache-Schlüssel)
+        combined_brush = QBrush(_gradient_cache.get(cached_radius)) # Füllpinsel aus der gecachten Pixmap
         transform = QTransform() # Erstellt eine Transformation
-        transform.translate(self.ball_pos.x() - size/2, self.ball_pos.y() - size/2) # Verschiebt die Transformation zur korrekten Position
+        transform.translate(self.ball_pos.x() - radius, self.ball_pos.y() - radius) # Verschiebt den Farbverlauf zur Ballposition
+        transform.scale(radius / cached_radius, radius / cached_radius) # Gleicht den Rundungsunterschied des Radius aus
         combined_brush.setTransform(transform) # Wendet die Transformation auf den Füllpinsel an
         
         self.setBrush(combined_brush) # Setzt den erstellten Füllpinsel für das Sektoritem
+
+
+def _quantize_radius(radius): # Rundet einen Radius auf das Raster des Gradienten-Caches
+    return max(GRADIENT_RADIUS_STEP, int(math.ceil(radius / GRADIENT_RADIUS_STEP)) * GRADIENT_RADIUS_STEP) # Aufrunden, damit die Pixmap den Sektor abdeckt
+
+
+def _render_attack_gradient(radius): # Zeichnet den Farbverlauf für einen Radius in eine neue Pixmap
+    size = int(radius * 2) # Größe der Pixmap basierend auf dem Radius
+    pixmap = QPixmap(size, size) # Erstellt die Pixmap
+    pixmap.fill(QColor(0, 0, 0, 0)) # Transparenter Hintergrund
+    painter = QPainter(pixmap) # Erstellt einen QPainter zum Zeichnen auf der Pixmap
+    # Die halbe Deckkraft steckt bereits in den Farben, ein zweiter Durchgang entfällt
+    radial = QRadialGradient(QPointF(size/2, size/2), radius) # Erzeugt einen radialen Farbverlauf vom Ball nach außen
+    radial.setColorAt(0.0, ATTACK_COLOR_INNER) # Rot nahe am Ball
+    radial.setColorAt(1.0, ATTACK_COLOR_OUTER) # Gelb am Rand
+    painter.setBrush(QBrush(radial)) # Setzt den Farbverlauf als Füllpinsel für den Painter
+    painter.setPen(Qt.PenStyle.NoPen) # Kein Rand für die Zeichnung
+    painter.drawRect(0, 0, size, size) # Zeichnet ein Rechteck mit dem Farbverlauf
+    painter.end() # Beendet den Painter
+    return pixmap # Gibt die fertige Pixmap zurück
+
+
+class GradientCache: # LRU-Cache für Farbverlaufs-Pixmaps, begrenzt durch den Speicherbedarf
+    """
+    Speichert gezeichnete Farbverläufe je gerundetem Radius.
+
+    Beim Ziehen des Balls ändert sich der Radius nur wenig, sodass fast jede Abfrage
+    eine bereits gezeichnete Pixmap findet. Überschreitet der Speicher (4 Byte je Pixel)
+    max_bytes, werden die am längsten nicht genutzten Einträge verworfen.
+    """
+
+    def __init__(self, max_bytes=GRADIENT_CACHE_BYTES): # Konstruktor der Klasse
+        self.max_bytes = max_bytes # Speichergrenze in Byte
+        self.bytes = 0 # Aktuell belegter Speicher
+        self.hits = 0 # Anzahl der Cache-Treffer (zur Kontrolle)
+        self.misses = 0 # Anzahl der neu gezeichneten Pixmaps
+        self._entries = OrderedDict() # Radius -> Pixmap, älteste zuerst
+
+    def get(self, radius): # Methode zum Abrufen (oder Erzeugen) der Pixmap für einen Radius
+        pixmap = self._entries.get(radius) # Sucht im Cache
+        if pixmap is not None: # Treffer
+            self._entries.move_to_end(radius) # Markiert den Eintrag als zuletzt genutzt
+            self.hits += 1
+            return pixmap # Gibt die gecachte Pixmap zurück
+        self.misses += 1
+        pixmap = _render_attack_gradient(radius) # Zeichnet den Farbverlauf neu
+        self._entries[radius] = pixmap # Speichert ihn
+        self.bytes += pixmap.width() * pixmap.height() * 4 # Verbucht den Speicher
+        while self.bytes > self.max_bytes and len(self._entries) > 1: # Speichergrenze überschritten
+            _, old = self._entries.popitem(last=False) # Entfernt den ältesten Eintrag
+            self.bytes -= old.width() * old.height() * 4 # Gibt den Speicher frei
+        return pixmap # Gibt die neue Pixmap zurück
+
+    def clear(self): # Methode zum Leeren des Caches
+        self._entries.clear() # Entfernt alle Einträge
+        self.bytes = 0 # Setzt den Speicherzähler zurück
+
+
+_gradient_cache = GradientCache() # Gemeinsamer Cache für alle Angriffssektoren
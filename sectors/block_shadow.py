@@ -0,0 +1,77 @@
+import numpy as np # Importiert NumPy für die vektorisierte Berechnung
+from core.shadows import SHADOW_ARC_RADIUS, compute_block_shadows # Importiert die Qt-freie Schattengeometrie
+from PySide6.QtCore import QPointF, QRectF # Importiert QPointF und QRectF von PySide6.QtCore
+from PySide6.QtGui import QBrush, QColor, QPainterPath, QRadialGradient # Importiert notwendige Klassen von PySide6.QtGui
+
+SHADOW_COLOR = QColor(128, 128, 128, 128) # Halbtransparentes Grau
+SHADOW_CLEAR = QColor(128, 128, 128, 0) # Transparentes Grau
+
+_HIDDEN = "hidden" # Zustand: Schatten ist ausgeblendet
+
+
+def update_shadows(players, ball_x, ball_y): # Aktualisiert die Blockschatten mehrerer Spieler
+    """
+    Aktualisiert die Blockschatten der Spieler für die angegebene Ballposition.
+
+    Die Geometrie wird für alle Spieler gemeinsam berechnet. Ein Schatten wird nur neu
+    gesetzt, wenn sich Ball oder Spieler seit der letzten Aktualisierung bewegt haben;
+    Spieler außerhalb des Netzbereichs werden nur beim Verlassen einmal geleert.
+    Pfad und Farbverlauf jedes Spielers werden wiederverwendet.
+    """
+    pending = [] # Spieler, deren Schatten neu berechnet werden muss
+    rows = [] # Mittelpunkt, Radius, Netzposition und Maßstab dieser Spieler
+    for player in players: # Iteriert über alle Spieler
+        center = player.scenePos() + player.rect().center() # Mittelpunkt des Spielers
+        cx, cy = center.x(), center.y() # Koordinaten des Mittelpunkts
+        dims = player.court_dims # Spielfeldmaße des Spielers
+        if player.shadow_state == _HIDDEN and abs(cy - dims.net_y) > dims.scale: # Weiterhin außerhalb des Netzbereichs
+            continue # Schatten bleibt leer, Item wird nicht angefasst
+        key = (ball_x, ball_y, cx, cy) # Zustand, aus dem der Schatten berechnet wird
+        if player.shadow_state == key: # Weder Ball noch Spieler bewegt
+            continue # Schatten ist aktuell
+        pending.append((player, key)) # Merkt den Spieler vor
+        rows.append((cx, cy, player.rect().width() / 2, dims.net_y, dims.scale)) # Merkt die Eingangsdaten vor
+    if not pending: # Nichts zu tun
+        return # Beendet die Funktion
+
+    data = np.array(rows, dtype=float) # (N, 5)-Array der Eingangsdaten
+    centers = data[:, :2] # Mittelpunkte der Spieler
+    in_band, visible, start_deg, sweep_deg, fraction = compute_block_shadows(centers, data[:, 2], data[:, 3], data[:, 4], ball_x, ball_y) # Vektorisierte Berechnung
+
+    for i, (player, key) in enumerate(pending): # Überträgt die Ergebnisse auf die Schattenitems
+        if visible[i]: # Sichtbarer Schatten
+            _set_shadow(player, ball_x, ball_y, start_deg[i], sweep_deg[i], fraction[i]) # Setzt Pfad und Farbverlauf
+            player.shadow_state = key # Merkt den berechneten Zustand
+        elif in_band[i] and centers[i, 0] == ball_x and centers[i, 1] == ball_y: # Ball genau auf dem Spieler
+            continue # Schatten bleibt unverändert
+        else: # Schatten ausgeblendet
+            if player.shadow_state != _HIDDEN: # Nur beim Wechsel auf ausgeblendet
+                player.shadow.setPath(QPainterPath()) # Entfernt den Schatten
+            player.shadow_state = _HIDDEN # Merkt den ausgeblendeten Zustand
+
+
+def _set_shadow(player, ball_x, ball_y, start_deg, sweep_deg, fraction): # Setzt Pfad und Farbverlauf eines Schattens
+    path = player.shadow_path # Wiederverwendeter Pfad des Spielers
+    path.clear() # Leert den Pfad
+    path.moveTo(ball_x, ball_y) # Startpunkt an der Ballposition
+    path.arcTo(QRectF(ball_x - SHADOW_ARC_RADIUS, ball_y - SHADOW_ARC_RADIUS, # Rechteck für den Schattenbogen
+                      SHADOW_ARC_RADIUS * 2, SHADOW_ARC_RADIUS * 2),
+               float(start_deg), float(sweep_deg)) # Start- und Ausdehnungswinkel
+    path.lineTo(ball_x, ball_y) # Schließt den Pfad zur Ballposition
+    player.shadow.setPath(path) # Setzt den berechneten Pfad für das Schattenitem
+
+    gradient = player.shadow_gradient # Wiederverwendeter Farbverlauf des Spielers
+    center = QPointF(ball_x, ball_y) # Mittelpunkt des Farbverlaufs
+    gradient.setCenter(center) # Verschiebt den Farbverlauf zum Ball
+    gradient.setFocalPoint(center) # Brennpunkt ebenfalls am Ball
+    fraction = float(fraction) # Anteil der Distanz am Bogenradius
+    stops = [(0.0, SHADOW_CLEAR)] # Transparent am Ball
+    if fraction >= 0.01: # Übergang nur, wenn er im gültigen Bereich liegt
+        stops.append((fraction - 0.01, SHADOW_CLEAR)) # Transparent bis kurz vor dem Spieler
+    stops += [(fraction, SHADOW_COLOR), (0.9, SHADOW_COLOR), (1.0, SHADOW_CLEAR)] # Halbtransparentes Grau ab dem Spieler
+    gradient.setStops(stops) # Ersetzt alle Farbstufen
+    player.shadow.setBrush(QBrush(gradient)) # Setzt den Farbverlauf als Füllung für den Schatten
+
+
+def new_shadow_gradient(): # Erstellt einen Farbverlauf für einen Blockschatten
+    return QRadialGradient(QPointF(), SHADOW_ARC_RADIUS) # Mittelpunkt wird bei jeder Aktualisierung gesetzt
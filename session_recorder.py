@@ -0,0 +1,92 @@
+import copy  # Importiert copy für Momentaufnahmen der Formationen.
+import gzip  # Importiert gzip für komprimierte Mitschnitte (*.gz).
+import json  # Importiert json für das Dateiformat.
+import os  # Importiert os für Umgebungsvariablen.
+import time  # Importiert time für die Zeitstempel.
+
+# Mitschnitt einer Sitzung (VSM_RECORD=pfad.jsonl oder pfad.jsonl.gz); ohne die Variable wird nichts aufgezeichnet
+RECORD_PATH = os.environ.get("VSM_RECORD") or None  # Zieldatei des Mitschnitts.
+SESSION_FORMAT = "vsm-session"  # Kennung in der Kopfzeile.
+SESSION_VERSION = 1  # Version des Dateiformats.
+
+# Ereignisarten (zweites Feld jeder Zeile nach der Zeit in Millisekunden)
+EVENT_BALL = "b"  # [t, "b", x, y]: Ball beim Ziehen verschoben (Position des Items).
+EVENT_RELEASE = "r"  # [t, "r"]: Ball losgelassen.
+EVENT_PLAYER = "p"  # [t, "p", Spielerindex, x, y]: Spieler gezogen (Position des Items).
+EVENT_ZONE = "z"  # [t, "z", Spielerindex, [x, y, w, h], [r, g, b, a]]: Zone gezeichnet.
+EVENT_FORMATIONS = "f"  # [t, "f", Formationen]: Formationsliste geändert (gespeichert, gelöscht, neu geladen).
+
+
+def _open(path, mode):  # Öffnet eine Mitschnittdatei, komprimiert bei Endung .gz.
+    if path.endswith(".gz"):  # Komprimierter Mitschnitt.
+        return gzip.open(path, mode + "t", encoding="utf-8")  # Öffnet die gzip-Datei im Textmodus.
+    return open(path, mode, encoding="utf-8")  # Öffnet die Datei mit UTF-8-Kodierung.
+
+
+def _strip_formations(formations):  # Formationen ohne Speicher-Kennungen (id, version).
+    return [{key: value for key, value in form.items() if key not in ("id", "version")} for form in formations]  # Kopie ohne Kennungen.
+
+
+class SessionRecorder:  # Definiert eine Klasse für den Mitschnitt einer Sitzung.
+    """
+    Schreibt Ballbewegungen, Spielerbewegungen, gezeichnete Zonen und Formationsänderungen als
+    JSON-Zeilen (eine Kopfzeile mit dem Ausgangszustand, dann ein kurzes Array je Ereignis).
+
+    Koordinaten werden auf 0,01 Pixel und Zeiten auf 0,1 ms gerundet; mit der Endung .gz wird
+    die Datei komprimiert. Wiedergabe: benchmarks/replay.py.
+    """
+
+    def __init__(self, path, ball, players, formations, drag_mode):  # Konstruktor der Klasse.
+        self.path = path  # Zieldatei.
+        self._file = _open(path, "w")  # Offene Datei (gepuffert).
+        self._started = time.perf_counter()  # Bezugszeitpunkt der Zeitstempel.
+        self.events = 0  # Anzahl der aufgezeichneten Ereignisse.
+        header = {
+            "format": SESSION_FORMAT,  # Kennung des Dateiformats.
+            "version": SESSION_VERSION,  # Version des Dateiformats.
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),  # Beginn der Aufnahme.
+            "drag_mode": drag_mode,  # Aktualisierungsmodus beim Ziehen (für die Wiedergabe im aufgezeichneten Takt).
+            "ball": [round(ball.pos().x(), 2), round(ball.pos().y(), 2)],  # Ausgangsposition des Balls.
+            "players": [[round(p.pos().x(), 2), round(p.pos().y(), 2)] for p in players],  # Ausgangspositionen der Spieler.
+            "formations": _strip_formations(formations),  # Formationen zu Beginn.
+        }
+        self._file.write(json.dumps(header, separators=(",", ":")) + "\n")  # Schreibt die Kopfzeile.
+
+    def _write(self, *event):  # Schreibt ein Ereignis mit Zeitstempel.
+        if self._file is None:  # Bereits geschlossen.
+            return  # Nichts mehr aufzeichnen.
+        t = round((time.perf_counter() - self._started) * 1000, 1)  # Millisekunden seit dem Start.
+        self._file.write(json.dumps([t, *event], separators=(",", ":")) + "\n")  # Eine kompakte Zeile je Ereignis.
+        self.events += 1  # Zählt das Ereignis.
+
+    def ball_moved(self, pos):  # Ball beim Ziehen verschoben.
+        self._write(EVENT_BALL, round(pos.x(), 2), round(pos.y(), 2))  # Position des Ball-Items.
+
+    def ball_released(self):  # Ball losgelassen.
+        self._write(EVENT_RELEASE)  # Ereignis ohne Daten.
+
+    def player_moved(self, index, pos):  # Spieler gezogen.
+        self._write(EVENT_PLAYER, index, round(pos.x(), 2), round(pos.y(), 2))  # Spielerindex und Position des Items.
+
+    def zone_drawn(self, index, rect, color):  # Zone gezeichnet.
+        self._write(EVENT_ZONE, index, [round(rect.x(), 2), round(rect.y(), 2), round(rect.width(), 2), round(rect.height(), 2)],
+                    [color.red(), color.green(), color.blue(), color.alpha()])  # Spielerindex, Rechteck und Farbe.
+
+    def formations_changed(self, formations):  # Formationsliste geändert.
+        self._write(EVENT_FORMATIONS, _strip_formations(copy.deepcopy(formations)))  # Momentaufnahme der ganzen Liste.
+
+    def close(self):  # Schließt die Datei.
+        if self._file is not None:  # Noch offen.
+            self._file.close()  # Schreibt den Puffer und schließt die Datei.
+            self._file = None  # Weitere Ereignisse werden ignoriert.
+            print("Sitzung aufgezeichnet: %d Ereignisse in %s" % (self.events, os.path.abspath(self.path)))  # Gibt eine Meldung aus.
+
+
+def load_session(path):  # Liest einen Mitschnitt.
+    """Gibt (Kopfzeile, Ereignisliste) eines Mitschnitts zurück; ValueError bei fremdem Format."""
+    with _open(path, "r") as f:  # Öffnet den Mitschnitt (ggf. komprimiert).
+        header = json.loads(f.readline())  # Erste Zeile: Kopfzeile.
+        if header.get("format") != SESSION_FORMAT or header.get("version") != SESSION_VERSION:  # Fremdes Format oder andere Version.
+            raise ValueError("%s ist kein Mitschnitt im Format %s v%d" % (path, SESSION_FORMAT, SESSION_VERSION))
+        events = [json.loads(line) for line in f if line.strip()]  # Übrige Zeilen: Ereignisse.
+    return header, events  # Gibt Kopfzeile und Ereignisse zurück.
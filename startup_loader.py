@@ -0,0 +1,112 @@
+import json  # Importiert json für das Startprotokoll.
+import os  # Importiert os für Umgebungsvariablen.
+import threading  # Importiert threading für das Laden im Hintergrund.
+import time  # Importiert time für die Zeitmessung.
+from types import SimpleNamespace  # Importiert SimpleNamespace für die geladenen Daten.
+from PySide6.QtCore import QObject, Signal  # Importiert QObject und das Signal-System von PySide6.
+
+from core.interpolation import InterpolationEngine  # Importiert die Interpolations-Engine (Triangulation + räumlicher Index).
+from core.spatial_index import PointGrid  # Importiert den Gitterindex für das Einrasten.
+
+# Startzeiten als JSON-Zeile an diese Datei anhängen (VSM_STARTUP_LOG=pfad); ohne die Variable nur Konsolenausgabe
+STARTUP_LOG = os.environ.get("VSM_STARTUP_LOG") or None  # Zieldatei des Startprotokolls.
+
+
+class StartupLoader(QObject):  # Definiert eine Klasse, die Formationen und Teams im Hintergrund lädt.
+    """
+    Lädt Formationen und Teams aus dem Speicher und baut Triangulation und Einrast-Index auf.
+
+    Mit start() läuft das Laden in einem Hintergrund-Thread; Fortschritt und Ergebnis kommen
+    über die Signale progress und loaded (bzw. failed) im GUI-Thread an. load() erledigt
+    dieselbe Arbeit synchron und gibt das Ergebnis zurück. Die gelieferte Engine und der
+    Index gehören danach dem Empfänger (InterpolationEngine.take_over).
+    """
+    progress = Signal(int, str)  # Fortschritt in Prozent und Beschreibung des Schritts.
+    loaded = Signal(object)  # SimpleNamespace mit formations, teams, engine, snap_index und timings.
+    failed = Signal(str)  # Fehlermeldung, wenn das Laden abgebrochen ist.
+
+    def __init__(self, store, snap_radius, parent=None):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            store: Speicher für Formationen und Teams (JsonStore oder SqliteStore)
+            snap_radius: Zellgröße des Einrast-Index in Pixeln
+            parent: Übergeordnetes Qt-Objekt
+        """
+        super().__init__(parent)  # Ruft den Konstruktor der Basisklasse auf.
+        self.store = store  # Speichert den Speicher.
+        self.snap_radius = snap_radius  # Speichert die Zellgröße des Einrast-Index.
+        self._thread = None  # Hintergrund-Thread (nur einmal gestartet).
+
+    def start(self):  # Methode zum Starten des Ladens im Hintergrund.
+        """Startet das Laden in einem Hintergrund-Thread (kehrt sofort zurück)."""
+        if self._thread is None:  # Nur einmal laden.
+            self._thread = threading.Thread(target=self._run, daemon=True)  # Erstellt einen Hintergrund-Thread.
+            self._thread.start()  # Startet das Laden.
+
+    def load(self):  # Methode zum Laden.
+        """Lädt alle Daten, baut die Indizes auf und gibt sie mit den Zeiten der Schritte (ms) zurück."""
+        timings = {}  # Dauer je Schritt in Millisekunden.
+        last = time.perf_counter()  # Beginn des aktuellen Schritts.
+
+        def step(name):  # Schließt einen Schritt ab.
+            nonlocal last  # Schreibt in den Beginn der äußeren Funktion.
+            now = time.perf_counter()  # Ende des Schritts.
+            timings[name] = round((now - last) * 1000, 1)  # Dauer des Schritts in Millisekunden.
+            last = now  # Beginn des nächsten Schritts.
+
+        self.progress.emit(0, "Formationen laden")  # Erster Schritt.
+        formations = self.store.load_formations()  # Liest die Formationen.
+        step("formations")  # Formationen gelesen.
+        self.progress.emit(35, "Teams laden")  # Zweiter Schritt.
+        teams = self.store.load_teams()  # Liest die Teams.
+        step("teams")  # Teams gelesen.
+        self.progress.emit(40, "Triangulation (%d Formationen)" % len(formations))  # Dritter Schritt.
+        engine = InterpolationEngine([(f["ball"][0], f["ball"][1]) for f in formations],
+                                     [f["offsets"] for f in formations])  # Triangulation und Dreiecksindex.
+        step("triangulation")  # Triangulation aufgebaut.
+        self.progress.emit(90, "Einrast-Index")  # Letzter Schritt.
+        snap_index = PointGrid([f["ball"] for f in formations], self.snap_radius)  # Index der Ballpositionen.
+        step("snap_index")  # Einrast-Index aufgebaut.
+        return SimpleNamespace(formations=formations, teams=teams, engine=engine, snap_index=snap_index, timings=timings)  # Gibt Daten, Indizes und Zeiten zurück.
+
+    def _run(self):  # Private Methode: Arbeit des Hintergrund-Threads.
+        try:  # Fehler beim Laden abfangen.
+            data = self.load()  # Lädt alles.
+        except Exception as exc:  # Fehler im Speicher (z.B. gesperrte Datenbank) nicht im Thread verlieren.
+            self.failed.emit(str(exc))  # Meldet den Fehler im GUI-Thread.
+            return  # Keine Daten liefern.
+        self.loaded.emit(data)  # Liefert die Daten (Queued Connection in den GUI-Thread).
+
+
+class StartupTimer:  # Definiert eine Klasse für die Zeitmessung des Programmstarts.
+    """
+    Misst die Schritte des Programmstarts im GUI-Thread (mark) und fasst sie mit den Zeiten
+    des Hintergrund-Ladens zusammen (Konsole und optional VSM_STARTUP_LOG).
+    """
+
+    def __init__(self, started=None):  # Konstruktor der Klasse.
+        self.started = started if started is not None else time.perf_counter()  # Beginn der Messung.
+        self._last = self.started  # Ende des letzten Schritts.
+        self.stages = {}  # Dauer je Schritt in Millisekunden.
+        self.marks = {}  # Zeit seit Beginn je Schritt in Millisekunden.
+
+    def mark(self, stage):  # Schließt einen Schritt ab.
+        now = time.perf_counter()  # Ende des Schritts.
+        self.stages[stage] = round((now - self._last) * 1000, 1)  # Dauer des Schritts in Millisekunden.
+        self.marks[stage] = round((now - self.started) * 1000, 1)  # Zeit seit Beginn in Millisekunden.
+        self._last = now  # Beginn des nächsten Schritts.
+
+    def report(self, worker=None, **counts):  # Fasst die Messung zusammen.
+        """Schritte im GUI-Thread, Schritte des Ladens (Hintergrund und Übernahme) und Zeitpunkte seit Beginn (ms)."""
+        return {"stages_ms": dict(self.stages), "load_ms": dict(worker or {}), "marks_ms": dict(self.marks), **counts}  # Gibt die Messung als Wörterbuch zurück.
+
+    def summary_text(self, worker=None):  # Einzeilige Zusammenfassung für die Konsole.
+        parts = ["%s %.0f" % (name, ms) for name, ms in self.stages.items()]  # Dauer je Schritt im GUI-Thread.
+        text = "Start: " + ", ".join(parts) + " ms"  # Schritte des Programmstarts.
+        if worker:  # Zeiten des Ladens.
+            text += " | Laden: " + ", ".join("%s %.0f" % (name, ms) for name, ms in worker.items()) + " ms"  # Hängt die Zeiten des Ladens an.
+        return text  # Gibt die Zeile zurück.
+
+    def write(self, path, report):  # Hängt die Messung als JSON-Zeile an.
+        with open(path, "a", encoding="utf-8") as f:  # Öffnet die Protokolldatei zum Anhängen.
+            f.write(json.dumps({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), **report}) + "\n")  # Schreibt die Messung mit Zeitstempel als eine Zeile.
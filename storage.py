@@ -0,0 +1,990 @@
+import atexit  # Importiert atexit, um ausstehende Schreibvorgänge beim Beenden zu sichern.
+import json  # Importiert das json-Modul für die Arbeit mit JSON-Daten.
+import os  # Importiert das os-Modul für Pfade und Umgebungsvariablen.
+import sqlite3  # Importiert sqlite3 für das SQLite-Backend.
+import tempfile  # Importiert tempfile für temporäre Dateien beim atomaren Schreiben.
+import threading  # Importiert threading, damit Desktop und Flask-Threads sicher zugreifen können.
+import time  # Importiert time für die Entprellung der Schreibvorgänge.
+from contextlib import contextmanager  # Importiert contextmanager für die Klammerung von Änderungen.
+
+try:  # Dateisperren für mehrere Prozesse (POSIX).
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows.
+    fcntl = None
+    import msvcrt
+
+# Gemeinsames Datenverzeichnis für Desktop-App und Webapp (Projektverzeichnis)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Verzeichnis dieses Moduls.
+FORMATIONS_PATH = os.path.join(BASE_DIR, "formations.json")  # Pfad der Formationen im JSON-Backend.
+TEAMS_PATH = os.path.join(BASE_DIR, "teams.json")  # Pfad der Teams im JSON-Backend.
+SQLITE_PATH = os.path.join(BASE_DIR, "vsm.sqlite3")  # Pfad der SQLite-Datenbank.
+
+# Backend-Auswahl: VSM_STORE=json (Standard) oder VSM_STORE=sqlite
+STORE_JSON = "json"  # Bisheriges Format: formations.json und teams.json.
+STORE_SQLITE = "sqlite"  # SQLite-Datenbank mit Einzelzeilen-Schreibzugriffen.
+
+# Verzögertes Schreiben der JSON-Dateien: Änderungen innerhalb dieser Zeit werden zusammengefasst
+WRITE_DELAY = float(os.environ.get("VSM_WRITE_DELAY", "0.25"))  # Entprellzeit in Sekunden.
+
+
+def _read_json(path):  # Liest eine JSON-Liste (leer, wenn die Datei fehlt oder ungültig ist).
+    try:  # Beginnt einen try-Block für die Fehlerbehandlung beim Dateizugriff.
+        with open(path, "r", encoding="utf-8") as f:  # Öffnet die Datei mit UTF-8-Kodierung.
+            data = json.load(f)  # Lädt die JSON-Daten.
+    except (FileNotFoundError, json.JSONDecodeError):  # Datei fehlt oder ist beschädigt.
+        return []  # Leere Liste.
+    return data if isinstance(data, list) else []  # Nur Listen sind gültig.
+
+
+def _file_stamp(path):  # Änderungszeit, Größe und Inode einer Datei (None, wenn sie fehlt).
+    try:
+        st = os.stat(path)  # Liest die Dateiinformationen.
+    except FileNotFoundError:  # Datei fehlt.
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino  # Änderungszeit in Nanosekunden, Größe und Inode (os.replace erzeugt eine neue Datei).
+
+
+def _next_id(records):  # Nächste freie Kennung für eine Liste von Datensätzen.
+    return max((r.get("id", 0) for r in records), default=0) + 1  # Größte Kennung plus eins.
+
+
+def _read_id_counter(path):  # Höchste je vergebene Kennung aus "<Pfad>.ids" (0, wenn die Datei fehlt).
+    try:
+        with open(path + ".ids", "r", encoding="utf-8") as f:  # Zählerdatei neben der JSON-Datei.
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):  # Noch keine oder eine beschädigte Zählerdatei.
+        return 0
+
+
+def _atomic_write(path, text):  # Schreibt eine Datei atomar (temporäre Datei + Umbenennen).
+    directory = os.path.dirname(os.path.abspath(path))  # Zielverzeichnis (gleiches Dateisystem für os.replace).
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)  # Temporäre Datei.
+    try:  # Beginnt einen try-Block, damit die temporäre Datei bei Fehlern entfernt wird.
+        with os.fdopen(fd, "w", encoding="utf-8") as f:  # Öffnet die temporäre Datei mit UTF-8-Kodierung.
+            f.write(text)  # Schreibt den Inhalt.
+            f.flush()  # Leert den Puffer.
+            os.fsync(f.fileno())  # Stellt sicher, dass die Daten auf dem Datenträger liegen.
+        os.replace(tmp_path, path)  # Ersetzt die Zieldatei atomar.
+    except BaseException:  # Schreiben fehlgeschlagen.
+        try:
+            os.remove(tmp_path)  # Entfernt die temporäre Datei.
+        except OSError:
+            pass
+        raise  # Gibt den Fehler weiter.
+
+
+class WriteBehind:  # Definiert einen Hintergrund-Schreiber für Dateien.
+    """
+    Schreibt Dateien verzögert in einem Hintergrund-Thread.
+
+    schedule() merkt sich nur, welche Datei neu geschrieben werden muss, und kehrt sofort
+    zurück. Nach WRITE_DELAY Sekunden ohne weitere Änderung erzeugt der Thread den Inhalt
+    und schreibt ihn atomar; mehrere Änderungen in kurzer Folge ergeben so nur einen
+    Schreibvorgang. flush() schreibt alles Ausstehende sofort (auch beim Beenden).
+    """
+
+    def __init__(self, delay=WRITE_DELAY):  # Konstruktor der Klasse.
+        """
+        Parameter:
+            delay: Entprellzeit in Sekunden
+        """
+        self.delay = delay  # Speichert die Entprellzeit.
+        self.writes = 0  # Anzahl der tatsächlich geschriebenen Dateien (zur Kontrolle).
+        self.last_error = None  # Letzter Schreibfehler oder None.
+        self._pending = {}  # Ausstehende Dateien: Pfad -> Funktion, die den Inhalt liefert.
+        self._deadline = 0.0  # Zeitpunkt, ab dem geschrieben wird.
+        self._writing = False  # Gibt an, ob der Thread gerade schreibt.
+        self._cond = threading.Condition()  # Schützt den Zustand und weckt den Thread.
+        self._thread = None  # Laufender Hintergrund-Thread.
+        atexit.register(self.flush)  # Schreibt Ausstehendes beim Beenden des Prozesses.
+
+    def schedule(self, path, render, written=None):  # Methode zum Vormerken einer Datei.
+        """
+        Merkt die Datei vor; render() wird im Hintergrund aufgerufen und liefert den Text
+        und gibt zusätzlich eine Version zurück, die nach dem Schreiben an written(version)
+        übergeben wird (optional).
+        """
+        with self._cond:  # Sperrt den Zustand.
+            self._pending[path] = (render, written)  # Neueste Anfrage je Datei ersetzt ältere.
+            self._deadline = time.monotonic() + self.delay  # Verschiebt den Schreibzeitpunkt.
+            if self._thread is None:  # Kein Thread aktiv.
+                self._thread = threading.Thread(target=self._run, daemon=True)  # Erstellt einen Hintergrund-Thread.
+                self._thread.start()  # Startet den Thread.
+            self._cond.notify_all()  # Weckt den Thread.
+
+    def _run(self):  # Private Methode: Arbeitsschleife des Hintergrund-Threads.
+        while True:  # Bearbeitet Anfragen, bis keine mehr vorliegen.
+            with self._cond:  # Sperrt den Zustand.
+                while self._pending and time.monotonic() < self._deadline:  # Wartet, bis keine Änderung mehr folgt.
+                    self._cond.wait(self._deadline - time.monotonic())
+                batch = self._pending  # Übernimmt alle ausstehenden Dateien.
+                self._pending = {}
+                if not batch:  # Nichts mehr zu tun.
+                    self._thread = None  # Thread beendet sich.
+                    self._cond.notify_all()  # Weckt wartende flush()-Aufrufe.
+                    return  # Beendet die Schleife.
+                self._writing = True  # Markiert den laufenden Schreibvorgang.
+            for path, job in batch.items():  # Schreibt jede Datei außerhalb der Sperre.
+                try:  # Beginnt einen try-Block für die Fehlerbehandlung beim Schreiben.
+                    self._write(path, *job)  # Erzeugt den Inhalt und schreibt ihn atomar.
+                except Exception as e:  # Fängt Fehler ab, damit der Thread weiterläuft.
+                    self.last_error = e  # Merkt sich den Fehler.
+                    print(f"Fehler beim Speichern von {path}: {e}")  # Gibt eine Fehlermeldung aus.
+            with self._cond:  # Sperrt den Zustand.
+                self._writing = False  # Schreibvorgang beendet.
+                self._cond.notify_all()  # Weckt wartende flush()-Aufrufe.
+
+    def _write(self, path, render, written):  # Private Methode: schreibt eine vorgemerkte Datei.
+        text, version = render()  # Erzeugt den Inhalt.
+        _atomic_write(path, text)  # Schreibt ihn atomar.
+        self.writes += 1  # Zählt den Schreibvorgang.
+        if written is not None:  # Rückmeldung an den Auftraggeber.
+            written(version)
+
+    def flush(self):  # Methode zum sofortigen Schreiben.
+        """Schreibt alle ausstehenden Dateien sofort und wartet, bis sie auf dem Datenträger liegen."""
+        with self._cond:  # Sperrt den Zustand.
+            self._deadline = 0.0  # Hebt die Entprellung auf.
+            self._cond.notify_all()  # Weckt den Thread.
+            while self._pending or self._writing:  # Wartet, bis alles geschrieben ist.
+                if self._thread is None or not self._thread.is_alive():  # Thread beendet (z.B. beim Herunterfahren).
+                    batch, self._pending = self._pending, {}  # Schreibt selbst.
+                    for path, job in batch.items():
+                        self._write(path, *job)
+                    break
+                self._cond.wait(0.1)  # Wartet auf den Thread.
+
+
+class VersionConflict(Exception):  # Definiert den Fehler für veraltete Versionen.
+    """Der Datensatz wurde inzwischen geändert: die erwartete Version passt nicht mehr."""
+
+    def __init__(self, record_id, current_version):  # Konstruktor der Klasse.
+        super().__init__("Datensatz %r hat Version %r" % (record_id, current_version))  # Fehlermeldung.
+        self.record_id = record_id  # Kennung des Datensatzes.
+        self.current_version = current_version  # Aktuelle Version im Speicher.
+
+
+class FileLock:  # Definiert eine prozessübergreifende Sperre über eine Sperrdatei.
+    """
+    Exklusive Sperre auf "<Pfad>.lock" (fcntl.flock unter Linux/macOS, msvcrt.locking unter
+    Windows), damit mehrere Prozesse (z.B. Gunicorn-Worker) nicht gleichzeitig lesen,
+    ändern und schreiben.
+    """
+
+    def __init__(self, path):  # Konstruktor der Klasse.
+        self.path = path + ".lock"  # Pfad der Sperrdatei.
+        self._file = None  # Geöffnete Sperrdatei.
+
+    def __enter__(self):  # Sperrt.
+        self._file = open(self.path, "a+")  # Öffnet (oder erzeugt) die Sperrdatei.
+        if fcntl is not None:  # POSIX.
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)  # Wartet auf die exklusive Sperre.
+        else:  # Windows.
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)  # Sperrt das erste Byte.
+        return self
+
+    def __exit__(self, *exc):  # Gibt die Sperre frei.
+        if fcntl is not None:  # POSIX.
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:  # Windows.
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()  # Schließt die Sperrdatei.
+        self._file = None
+
+
+def _check_version(record, expected_version):  # Prüft die erwartete Version eines Datensatzes.
+    if expected_version is not None and record.get("version", 1) != expected_version:  # Inzwischen geändert.
+        raise VersionConflict(record["id"], record.get("version", 1))
+
+
+def _bump(record):  # Erhöht die Version eines Datensatzes.
+    record["version"] = record.get("version", 1) + 1  # Neue Version.
+    return record["version"]  # Gibt sie zurück.
+
+
+class JsonStore:  # Definiert das JSON-Backend.
+    """
+    Speichert Formationen und Teams wie bisher als JSON-Listen.
+
+    Jeder Datensatz erhält eine stabile Kennung ("id") und eine Version ("version"), die
+    bei jeder Änderung steigt; Änderungsmethoden mit expected_version werfen
+    VersionConflict, wenn der Datensatz inzwischen geändert wurde.
+
+    Die Listen bleiben im Speicher. Ändert ein anderer Prozess eine Datei (Änderungszeit,
+    Größe oder Inode weichen vom zuletzt gelesenen/geschriebenen Stand ab) und liegen keine
+    ungespeicherten eigenen Änderungen vor, wird sie beim nächsten Zugriff neu gelesen.
+    formations_version()/teams_version() ändern sich bei jeder Änderung der Liste.
+
+    Ohne shared werden Änderungen verzögert im Hintergrund geschrieben (siehe WriteBehind).
+    Mit shared=True (mehrere Prozesse auf denselben Dateien, z.B. Gunicorn-Worker) läuft
+    jede Änderung unter einer FileLock: Datei bei Bedarf neu lesen, ändern und sofort
+    atomar schreiben.
+
+    Die größte je vergebene Kennung steht in "<Pfad>.ids", damit gelöschte Kennungen auch
+    nach einem Neustart oder in einem anderen Prozess nicht erneut vergeben werden.
+    """
+
+    def __init__(self, formations_path=FORMATIONS_PATH, teams_path=TEAMS_PATH, writer=None, shared=False):  # Konstruktor der Klasse.
+        self.formations_path = formations_path  # Pfad der Formationen.
+        self.teams_path = teams_path  # Pfad der Teams.
+        self.shared = shared  # Mehrere Prozesse greifen auf die Dateien zu.
+        self.writer = None if shared else (writer or WriteBehind())  # Hintergrund-Schreiber für die Dateien.
+        self._lock = threading.RLock()  # Schützt die Listen bei gleichzeitigen Zugriffen.
+        self._formations = None  # Zwischengespeicherte Formationen (None = noch nicht gelesen).
+        self._teams = None  # Zwischengespeicherte Teams.
+        self._version = {formations_path: 0, teams_path: 0}  # Version der Liste je Datei.
+        self._saved = {formations_path: 0, teams_path: 0}  # Zuletzt geschriebene Version je Datei.
+        self._stamps = {}  # (Änderungszeit, Größe, Inode) je Datei beim letzten Lesen/Schreiben.
+        self._id_floor = {formations_path: 0, teams_path: 0}  # Größte je vergebene Kennung (keine Wiederverwendung, siehe "<Pfad>.ids").
+
+    def _stale(self, path):  # Private Methode: prüft, ob ein anderer Prozess die Datei geändert hat.
+        if self._saved[path] != self._version[path]:  # Eigene Änderungen noch nicht geschrieben.
+            return False  # Die Liste im Speicher ist maßgeblich.
+        return _file_stamp(path) != self._stamps.get(path)  # Abweichender Dateistand.
+
+    def _loaded(self, path):  # Private Methode: merkt sich den Dateistand vor dem Lesen.
+        self._stamps[path] = _file_stamp(path)  # Stand der Datei.
+        self._version[path] += 1  # Neue Version der Liste.
+        self._saved[path] = self._version[path]  # Entspricht der Datei.
+
+    def _read(self, path):  # Private Methode: liest eine Datei und ergänzt Kennungen und Versionen.
+        self._loaded(path)  # Merkt sich den Dateistand.
+        records = _read_json(path)  # Liest die Datei.
+        next_id = max(_next_id(records), self._id_floor[path] + 1, _read_id_counter(path) + 1)  # Kennung für Datensätze ohne "id".
+        for record in records:  # Vergibt fehlende Kennungen und Versionen.
+            if "id" not in record:  # Alte Datei ohne Kennungen.
+                record["id"] = next_id
+                next_id += 1
+            record.setdefault("version", 1)  # Alte Datei ohne Versionen.
+        self._id_floor[path] = next_id - 1  # Merkt sich die größte Kennung.
+        return records  # Gibt die Liste zurück.
+
+    def _raise_id_floor(self, path, records):  # Private Methode: berücksichtigt die Kennungen einer Liste.
+        floor = max(self._id_floor[path], _next_id(records) - 1)  # Größte bekannte Kennung.
+        if floor > self._id_floor[path]:  # Neue größte Kennung.
+            self._id_floor[path] = floor
+            self._save_id_floor(path)
+
+    def _new_id(self, path):  # Private Methode: vergibt eine neue Kennung.
+        if self.shared:  # Andere Prozesse können inzwischen Kennungen vergeben (und wieder gelöscht) haben.
+            self._id_floor[path] = max(self._id_floor[path], _read_id_counter(path))
+        self._id_floor[path] += 1  # Nie eine frühere Kennung.
+        self._save_id_floor(path)  # Auch nicht nach einem Neustart oder in einem anderen Prozess.
+        return self._id_floor[path]  # Gibt die Kennung zurück.
+
+    def _save_id_floor(self, path):  # Private Methode: schreibt die größte vergebene Kennung nach "<Pfad>.ids".
+        if self.shared:  # Geteilter Modus: sofort (die Dateisperre wird gehalten).
+            _atomic_write(path + ".ids", str(self._id_floor[path]))
+        else:  # Verzögert mit der JSON-Datei.
+            self.writer.schedule(path + ".ids", lambda: (str(self._id_floor[path]), None))
+
+    @contextmanager
+    def _edit(self, path):  # Private Methode: klammert eine Änderung (mit Dateisperre im geteilten Modus).
+        with self._lock:  # Sperrt die Listen.
+            if self.shared:  # Mehrere Prozesse: Lesen, Ändern und Schreiben unter der Dateisperre.
+                with FileLock(path):
+                    yield
+            else:
+                yield
+
+    def _schedule(self, path, records):  # Private Methode: neue Version, Datei wird geschrieben.
+        self._version[path] += 1  # Neue Version der Liste.
+
+        def render():  # Erzeugt den Dateiinhalt (im Hintergrund-Thread).
+            with self._lock:  # Sperrt die Liste während der Umwandlung.
+                return json.dumps(records(), ensure_ascii=False, indent=2), self._version[path]
+
+        def written(version):  # Merkt sich den geschriebenen Stand.
+            with self._lock:
+                self._stamps[path] = _file_stamp(path)
+                self._saved[path] = max(self._saved[path], version)
+
+        if self.shared:  # Geteilter Modus: sofort schreiben (die Dateisperre wird gehalten).
+            text, version = render()
+            _atomic_write(path, text)
+            written(version)
+        else:
+            self.writer.schedule(path, render, written)  # Schreibt verzögert im Hintergrund.
+
+    # --- Formationen ---
+
+    def _formation_list(self):  # Private Methode: liest die Formationen bei Bedarf.
+        if self._formations is None or self._stale(self.formations_path):  # Noch nicht gelesen oder extern geändert.
+            self._formations = self._read(self.formations_path)  # Liest die Datei.
+            for form in self._formations:  # Stellt sicher, dass jede Formation eine 'zones'-Liste hat.
+                form.setdefault("zones", [])
+        return self._formations  # Gibt die Liste zurück.
+
+    def _find_formation(self, formation_id):  # Private Methode: Formation nach Kennung.
+        for form in self._formation_list():  # Durchsucht die Liste.
+            if form["id"] == formation_id:  # Treffer.
+                return form
+        raise KeyError(formation_id)  # Unbekannte Kennung.
+
+    def _write_formations(self):  # Private Methode: merkt die Formationsdatei zum Schreiben vor.
+        self._schedule(self.formations_path, lambda: self._formations)  # Schreibt die Datei.
+
+    def formations_version(self):  # Methode zur Abfrage der Version der Formationen.
+        """Gibt eine Version zurück, die sich bei jeder Änderung der Formationen ändert."""
+        with self._lock:  # Sperrt den Zugriff.
+            self._formation_list()  # Liest die Datei neu, falls sie extern geändert wurde.
+            return self._version[self.formations_path]  # Aktuelle Version.
+
+    def load_formations(self):  # Methode zum Laden aller Formationen.
+        """Gibt Kopien aller Formationen in gespeicherter Reihenfolge zurück."""
+        with self._lock:  # Sperrt den Zugriff.
+            return json.loads(json.dumps(self._formation_list()))  # Tiefe Kopie.
+
+    def get_formation(self, formation_id):  # Methode zum Laden einer Formation.
+        """Gibt eine Kopie der Formation zurück (KeyError bei unbekannter Kennung)."""
+        with self._lock:  # Sperrt den Zugriff.
+            return json.loads(json.dumps(self._find_formation(formation_id)))  # Tiefe Kopie.
+
+    def query_formations(self, name=None, bbox=None, after=None, limit=None, fields=None):  # Methode zum seitenweisen Laden.
+        """
+        Gibt eine Seite von Formationen in gespeicherter Reihenfolge zurück.
+
+        Parameter:
+            name: Teil des Namens (ohne Groß-/Kleinschreibung) oder None
+            bbox: (x0, y0, x1, y1) für die Ballposition oder None
+            after: Cursor der vorherigen Seite oder None
+            limit: Höchstzahl der Formationen oder None (alle)
+            fields: Menge der gewünschten Felder oder None (alle; "id" ist immer enthalten)
+
+        Rückgabe: (Formationen, Cursor der nächsten Seite oder None). ValueError bei ungültigem Cursor.
+        """
+        with self._lock:  # Sperrt den Zugriff.
+            forms = self._formation_list()  # Aktuelle Liste.
+            start = self._cursor_start(forms, after) if after is not None else 0  # Erste zu prüfende Position.
+            page = []  # Gefundene Formationen.
+            last = None  # Position der zuletzt übernommenen Formation.
+            for i in range(start, len(forms)):  # Durchsucht die Liste ab dem Cursor.
+                form = forms[i]
+                if name and not _name_contains(form.get("name"), name):  # Name passt nicht.
+                    continue
+                if bbox and not _ball_in_box(form["ball"], bbox):  # Ballposition außerhalb.
+                    continue
+                if limit is not None and len(page) == limit:  # Weitere Formation vorhanden: Seite ist voll.
+                    return page, "%d:%d" % (last, forms[last]["id"])  # Cursor auf die letzte Formation der Seite.
+                page.append(_project(form, fields))  # Übernimmt die Formation.
+                last = i
+            return page, None  # Letzte Seite.
+
+    @staticmethod
+    def _cursor_start(forms, cursor):  # Private Methode: Startposition nach einem Cursor "<Position>:<Kennung>".
+        try:
+            index, formation_id = (int(part) for part in cursor.split(":"))
+        except ValueError:
+            raise ValueError("Ungültiger Cursor: %r" % cursor)
+        if 0 <= index < len(forms) and forms[index]["id"] == formation_id:  # Liste unverändert.
+            return index + 1
+        for i, form in enumerate(forms):  # Liste hat sich verschoben: sucht die Formation.
+            if form["id"] == formation_id:
+                return i + 1
+        return max(0, min(index, len(forms)))  # Formation gelöscht: weiter an ihrer alten Position.
+
+    def add_formation(self, formation):  # Methode zum Anhängen einer Formation.
+        """Hängt eine Formation an, setzt formation["id"] und formation["version"] und gibt die Kennung zurück."""
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            forms = self._formation_list()  # Aktuelle Liste.
+            formation["id"] = self._new_id(self.formations_path)  # Vergibt eine neue Kennung.
+            formation["version"] = 1  # Erste Version.
+            formation.setdefault("zones", [])  # Stellt sicher, dass eine 'zones'-Liste existiert.
+            forms.append(json.loads(json.dumps(formation)))  # Speichert eine Kopie.
+            self._write_formations()  # Schreibt die Datei.
+            return formation["id"]  # Gibt die Kennung zurück.
+
+    def update_formation(self, formation_id, formation, expected_version=None):  # Methode zum Ersetzen einer Formation.
+        """Ersetzt die Formation und gibt die neue Version zurück."""
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            forms = self._formation_list()  # Aktuelle Liste.
+            current = self._find_formation(formation_id)  # Bisherige Formation.
+            _check_version(current, expected_version)  # Prüft die erwartete Version.
+            record = json.loads(json.dumps(formation))  # Kopie der neuen Daten.
+            record["id"] = formation_id  # Kennung bleibt erhalten.
+            record["version"] = current.get("version", 1) + 1  # Neue Version.
+            record.setdefault("zones", [])  # Stellt sicher, dass eine 'zones'-Liste existiert.
+            forms[forms.index(current)] = record  # Ersetzt die Formation an ihrer Position.
+            self._write_formations()  # Schreibt die Datei.
+            return record["version"]  # Gibt die neue Version zurück.
+
+    def patch_formation(self, formation_id, changes, expected_version=None):  # Methode zum teilweisen Ändern einer Formation.
+        """Übernimmt nur die angegebenen Felder (ohne "id" und "version") und gibt die neue Version zurück."""
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            form = self._find_formation(formation_id)  # Bisherige Formation.
+            _check_version(form, expected_version)  # Prüft die erwartete Version.
+            form.update({k: v for k, v in json.loads(json.dumps(changes)).items() if k not in ("id", "version")})  # Übernimmt die Felder.
+            version = _bump(form)  # Neue Version.
+            self._write_formations()  # Schreibt die Datei.
+            return version  # Gibt die neue Version zurück.
+
+    def rename_formation(self, formation_id, name):  # Methode zum Umbenennen einer Formation.
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            form = self._find_formation(formation_id)  # Formation.
+            form["name"] = name  # Setzt den neuen Namen.
+            _bump(form)  # Neue Version.
+            self._write_formations()  # Schreibt die Datei.
+
+    def delete_formation(self, formation_id, expected_version=None):  # Methode zum Löschen einer Formation.
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            form = self._find_formation(formation_id)  # Formation.
+            _check_version(form, expected_version)  # Prüft die erwartete Version.
+            self._formation_list().remove(form)  # Entfernt die Formation.
+            self._write_formations()  # Schreibt die Datei.
+
+    def add_zone(self, formation_id, zone):  # Methode zum Hinzufügen einer Zone.
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            form = self._find_formation(formation_id)  # Formation.
+            form.setdefault("zones", []).append(dict(zone))  # Hängt die Zone an.
+            _bump(form)  # Neue Version.
+            self._write_formations()  # Schreibt die Datei.
+
+    def delete_zone(self, formation_id, zone):  # Methode zum Löschen einer Zone.
+        """Entfernt die erste Zone mit gleichem Spieler, Rechteck und Farbe."""
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            form = self._find_formation(formation_id)  # Formation.
+            zones = form.get("zones", [])  # Zonen der Formation.
+            for existing in zones:  # Sucht die passende Zone.
+                if _same_zone(existing, zone):  # Treffer.
+                    zones.remove(existing)  # Entfernt sie.
+                    _bump(form)  # Neue Version.
+                    break
+            self._write_formations()  # Schreibt die Datei.
+
+    def replace_formations(self, formations):  # Methode zum Ersetzen aller Formationen.
+        """Speichert die komplette Liste (Kennungen bleiben erhalten, fehlende werden vergeben)."""
+        with self._edit(self.formations_path):  # Sperrt den Zugriff.
+            records = json.loads(json.dumps(formations))  # Kopie der Liste.
+            current = self._formation_list()  # Bisherige Liste.
+            versions = {r["id"]: r.get("version", 1) for r in current}  # Bisherige Versionen.
+            self._raise_id_floor(self.formations_path, records)  # Berücksichtigt die Kennungen der neuen Liste.
+            for record, form in zip(records, formations):  # Vergibt fehlende Kennungen und neue Versionen.
+                if "id" not in record:
+                    record["id"] = form["id"] = self._new_id(self.formations_path)
+                record["version"] = form["version"] = versions.get(record["id"], 0) + 1  # Versionen steigen immer.
+            self._formations = records  # Übernimmt die Liste.
+            self._write_formations()  # Schreibt die Datei.
+
+    # --- Teams ---
+
+    def _team_list(self):  # Private Methode: liest die Teams bei Bedarf.
+        if self._teams is None or self._stale(self.teams_path):  # Noch nicht gelesen oder extern geändert.
+            self._teams = self._read(self.teams_path)  # Liest die Datei.
+        return self._teams  # Gibt die Liste zurück.
+
+    def _find_team(self, team_id):  # Private Methode: Team nach Kennung.
+        for team in self._team_list():  # Durchsucht die Liste.
+            if team["id"] == team_id:  # Treffer.
+                return team
+        raise KeyError(team_id)  # Unbekannte Kennung.
+
+    def _write_teams(self):  # Private Methode: merkt die Teamdatei zum Schreiben vor.
+        self._schedule(self.teams_path, lambda: self._teams)  # Schreibt die Datei.
+
+    def teams_version(self):  # Methode zur Abfrage der Version der Teams.
+        """Gibt eine Version zurück, die sich bei jeder Änderung der Teams ändert."""
+        with self._lock:  # Sperrt den Zugriff.
+            self._team_list()  # Liest die Datei neu, falls sie extern geändert wurde.
+            return self._version[self.teams_path]  # Aktuelle Version.
+
+    def load_teams(self):  # Methode zum Laden aller Teams.
+        with self._lock:  # Sperrt den Zugriff.
+            return json.loads(json.dumps(self._team_list()))  # Tiefe Kopie.
+
+    def get_team(self, team_id):  # Methode zum Laden eines Teams.
+        """Gibt eine Kopie des Teams zurück (KeyError bei unbekannter Kennung)."""
+        with self._lock:  # Sperrt den Zugriff.
+            return json.loads(json.dumps(self._find_team(team_id)))  # Tiefe Kopie.
+
+    def add_team(self, team):  # Methode zum Anhängen eines Teams.
+        """Hängt ein Team an, setzt team["id"] und team["version"] und gibt die Kennung zurück."""
+        with self._edit(self.teams_path):  # Sperrt den Zugriff.
+            teams = self._team_list()  # Aktuelle Liste.
+            team["id"] = self._new_id(self.teams_path)  # Vergibt eine neue Kennung.
+            team["version"] = 1  # Erste Version.
+            teams.append(json.loads(json.dumps(team)))  # Speichert eine Kopie.
+            self._write_teams()  # Schreibt die Datei.
+            return team["id"]  # Gibt die Kennung zurück.
+
+    def patch_team(self, team_id, changes, expected_version=None):  # Methode zum teilweisen Ändern eines Teams.
+        """Übernimmt nur die angegebenen Felder (ohne "id" und "version") und gibt die neue Version zurück."""
+        with self._edit(self.teams_path):  # Sperrt den Zugriff.
+            team = self._find_team(team_id)  # Bisheriges Team.
+            _check_version(team, expected_version)  # Prüft die erwartete Version.
+            team.update({k: v for k, v in json.loads(json.dumps(changes)).items() if k not in ("id", "version")})  # Übernimmt die Felder.
+            version = _bump(team)  # Neue Version.
+            self._write_teams()  # Schreibt die Datei.
+            return version  # Gibt die neue Version zurück.
+
+    def delete_team(self, team_id, expected_version=None):  # Methode zum Löschen eines Teams.
+        with self._edit(self.teams_path):  # Sperrt den Zugriff.
+            team = self._find_team(team_id)  # Team.
+            _check_version(team, expected_version)  # Prüft die erwartete Version.
+            self._team_list().remove(team)  # Entfernt das Team.
+            self._write_teams()  # Schreibt die Datei.
+
+    def replace_teams(self, teams):  # Methode zum Ersetzen aller Teams.
+        with self._edit(self.teams_path):  # Sperrt den Zugriff.
+            records = json.loads(json.dumps(teams))  # Kopie der Liste.
+            current = self._team_list()  # Bisherige Liste.
+            versions = {r["id"]: r.get("version", 1) for r in current}  # Bisherige Versionen.
+            self._raise_id_floor(self.teams_path, records)  # Berücksichtigt die Kennungen der neuen Liste.
+            for record, team in zip(records, teams):  # Vergibt fehlende Kennungen und neue Versionen.
+                if "id" not in record:
+                    record["id"] = team["id"] = self._new_id(self.teams_path)
+                record["version"] = team["version"] = versions.get(record["id"], 0) + 1  # Versionen steigen immer.
+            self._teams = records  # Übernimmt die Liste.
+            self._write_teams()  # Schreibt die Datei.
+
+    def flush(self):  # Methode zum sofortigen Schreiben.
+        """Schreibt ausstehende Änderungen sofort (z.B. beim Beenden der Anwendung)."""
+        if self.writer is not None:  # Im geteilten Modus wird sofort geschrieben.
+            self.writer.flush()  # Leert den Hintergrund-Schreiber.
+
+
+def _same_zone(a, b):  # Vergleicht zwei Zonen über Spieler, Rechteck und Farbe.
+    return (a.get("player_index") == b.get("player_index") and list(a.get("rect", [])) == list(b.get("rect", []))
+            and list(a.get("color", [])) == list(b.get("color", [])))
+
+
+def _name_contains(name, text):  # Prüft, ob ein Name den Suchtext enthält (ohne Groß-/Kleinschreibung).
+    return text.casefold() in (name or "").casefold()
+
+
+def _ball_in_box(ball, bbox):  # Prüft, ob die Ballposition im Rechteck (x0, y0, x1, y1) liegt.
+    x0, y0, x1, y1 = bbox
+    return x0 <= ball[0] <= x1 and y0 <= ball[1] <= y1
+
+
+def _project(record, fields):  # Kopie eines Datensatzes mit den gewünschten Feldern (None = alle, "id" immer).
+    if fields is None:
+        return json.loads(json.dumps(record))  # Tiefe Kopie.
+    return json.loads(json.dumps({k: record[k] for k in record if k == "id" or k in fields}))
+
+
+_FORMATION_COLUMNS = ("id", "version", "name", "ball", "offsets", "zones")  # Felder mit eigenen Spalten bzw. Tabellen.
+_TEAM_COLUMNS = ("id", "version", "name", "player_names")  # Felder mit eigenen Spalten bzw. Tabellen.
+
+
+def _extra_json(record, columns):  # Übrige Felder eines Datensatzes als JSON (None, wenn es keine gibt).
+    extra = {k: v for k, v in record.items() if k not in columns}  # Z.B. "names" aus der Webapp.
+    return json.dumps(extra) if extra else None
+
+
+def _with_extra(record, extra):  # Ergänzt einen gelesenen Datensatz um die übrigen Felder.
+    if extra:
+        record.update(json.loads(extra))
+    return record
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS formations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    ball_x REAL NOT NULL,
+    ball_y REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS formations_position ON formations (position);
+CREATE TABLE IF NOT EXISTS offsets (
+    formation_id INTEGER NOT NULL REFERENCES formations (id) ON DELETE CASCADE,
+    player_index INTEGER NOT NULL,
+    dx REAL NOT NULL,
+    dy REAL NOT NULL,
+    PRIMARY KEY (formation_id, player_index)
+);
+CREATE TABLE IF NOT EXISTS zones (
+    id INTEGER PRIMARY KEY,
+    formation_id INTEGER NOT NULL REFERENCES formations (id) ON DELETE CASCADE,
+    player_index INTEGER NOT NULL,
+    x REAL NOT NULL, y REAL NOT NULL, width REAL NOT NULL, height REAL NOT NULL,
+    r INTEGER NOT NULL, g INTEGER NOT NULL, b INTEGER NOT NULL, a INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS zones_formation ON zones (formation_id);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS team_players (
+    team_id INTEGER NOT NULL REFERENCES teams (id) ON DELETE CASCADE,
+    slot INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (team_id, slot)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SqliteStore:  # Definiert das SQLite-Backend.
+    """
+    Speichert Formationen, Offsets, Zonen und Teams in einer SQLite-Datenbank (WAL-Modus).
+    Felder ohne eigene Spalte (z.B. "names") liegen als JSON in der Spalte extra, daher
+    liefern beide Backends dieselben Felder; nur Zonen tragen hier zusätzlich eine "id".
+
+    Jede Änderung betrifft nur die zugehörigen Zeilen: Umbenennen oder eine Zone
+    hinzufügen/löschen ist ein einzelnes UPDATE/INSERT/DELETE (plus Versionszähler).
+    Änderungen laufen in BEGIN IMMEDIATE-Transaktionen, daher können mehrere Prozesse
+    dieselbe Datenbank verwenden. Beim ersten Start werden vorhandene formations.json
+    und teams.json übernommen.
+    """
+
+    def __init__(self, path=SQLITE_PATH, formations_path=FORMATIONS_PATH, teams_path=TEAMS_PATH):  # Konstruktor der Klasse.
+        self.path = path  # Pfad der Datenbank.
+        self._lock = threading.RLock()  # Eine Verbindung für alle Threads, daher gesperrt.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)  # Öffnet die Datenbank (Autocommit, wartet auf Sperren anderer Prozesse).
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Schreib-Log statt Rollback-Journal.
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Im WAL-Modus ausreichend sicher.
+        self._conn.execute("PRAGMA foreign_keys=ON")  # Löscht Offsets und Zonen mit ihrer Formation.
+        self._conn.create_function("vsm_contains", 2, _name_contains, deterministic=True)  # Namenssuche wie im JSON-Backend.
+        self._conn.executescript(_SCHEMA)  # Legt die Tabellen an.
+        self._migrate()  # Ergänzt Spalten älterer Datenbanken.
+        self._import_json(formations_path, teams_path)  # Übernimmt einmalig die JSON-Dateien.
+
+    def _migrate(self):  # Private Methode: ergänzt die Versions- und Zusatzspalten älterer Datenbanken.
+        def run(cur):
+            for table in ("formations", "teams"):  # Tabellen mit Versionen.
+                columns = [row[1] for row in cur.execute("PRAGMA table_info(%s)" % table)]  # Vorhandene Spalten.
+                if "version" not in columns:  # Datenbank ohne Versionen.
+                    cur.execute("ALTER TABLE %s ADD COLUMN version INTEGER NOT NULL DEFAULT 1" % table)
+                if "extra" not in columns:  # Datenbank ohne Zusatzfelder.
+                    cur.execute("ALTER TABLE %s ADD COLUMN extra TEXT" % table)
+        self._transaction(run)
+
+    def _transaction(self, statements):  # Private Methode: führt Anweisungen atomar aus.
+        with self._lock:  # Sperrt die Verbindung.
+            cur = self._conn.cursor()  # Erstellt einen Cursor.
+            cur.execute("BEGIN IMMEDIATE")  # Startet die Transaktion (Schreibsperre sofort, kein Lesen-dann-Schreiben-Konflikt).
+            try:
+                result = statements(cur)  # Führt die Anweisungen aus.
+            except Exception:
+                cur.execute("ROLLBACK")  # Verwirft alle Änderungen.
+                raise
+            cur.execute("COMMIT")  # Schreibt die Änderungen.
+            return result  # Gibt das Ergebnis zurück.
+
+    @staticmethod
+    def _check_version(cur, table, record_id, expected_version):  # Private Methode: prüft und gibt die Version zurück.
+        row = cur.execute("SELECT version FROM %s WHERE id = ?" % table, (record_id,)).fetchone()  # Aktuelle Version.
+        if row is None:  # Unbekannte Kennung.
+            raise KeyError(record_id)
+        if expected_version is not None and row[0] != expected_version:  # Inzwischen geändert.
+            raise VersionConflict(record_id, row[0])
+        return row[0]  # Gibt die Version zurück.
+
+    @staticmethod
+    def _bump(cur, table, record_id):  # Private Methode: erhöht die Version eines Datensatzes.
+        cur.execute("UPDATE %s SET version = version + 1 WHERE id = ?" % table, (record_id,))  # Neue Version.
+        return cur.execute("SELECT version FROM %s WHERE id = ?" % table, (record_id,)).fetchone()[0]  # Gibt sie zurück.
+
+    def _import_json(self, formations_path, teams_path):  # Private Methode: einmaliger Import der JSON-Dateien.
+        def run(cur):
+            if cur.execute("SELECT 1 FROM meta WHERE key = 'imported'").fetchone():  # Bereits importiert.
+                return
+            for form in _read_json(formations_path):  # Übernimmt alle Formationen.
+                self._insert_formation(cur, form)
+            for team in _read_json(teams_path):  # Übernimmt alle Teams.
+                self._insert_team(cur, team)
+            cur.execute("INSERT INTO meta (key, value) VALUES ('imported', '1')")  # Merkt den Import.
+        self._transaction(run)
+
+    # --- Formationen ---
+
+    @staticmethod
+    def _insert_formation(cur, form, position=None):  # Private Methode: fügt eine Formation samt Offsets und Zonen ein.
+        if position is None:  # Ans Ende der Liste.
+            position = cur.execute("SELECT COALESCE(MAX(position), 0) + 1 FROM formations").fetchone()[0]
+        cur.execute("INSERT INTO formations (id, position, name, ball_x, ball_y, version, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (form.get("id"), position, form.get("name", ""), form["ball"][0], form["ball"][1],
+                     form.get("version", 1), _extra_json(form, _FORMATION_COLUMNS)))  # Formation.
+        formation_id = cur.lastrowid  # Kennung der Formation.
+        cur.executemany("INSERT INTO offsets (formation_id, player_index, dx, dy) VALUES (?, ?, ?, ?)",
+                        [(formation_id, i, off[0], off[1]) for i, off in enumerate(form.get("offsets", []))])  # Offsets.
+        for zone in form.get("zones", []):  # Zonen.
+            SqliteStore._insert_zone(cur, formation_id, zone)
+        return formation_id  # Gibt die Kennung zurück.
+
+    @staticmethod
+    def _insert_zone(cur, formation_id, zone):  # Private Methode: fügt eine Zone ein.
+        cur.execute("INSERT INTO zones (formation_id, player_index, x, y, width, height, r, g, b, a) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (formation_id, zone.get("player_index"), *zone["rect"], *zone["color"]))  # Zone.
+        return cur.lastrowid  # Gibt die Kennung zurück.
+
+    @staticmethod
+    def _select_formations(cur, formation_id=None):  # Private Methode: liest alle oder eine Formation.
+        where, params = ("WHERE id = ?", (formation_id,)) if formation_id is not None else ("", ())  # Optionaler Filter.
+        rows = cur.execute("SELECT id, name, ball_x, ball_y, version, extra FROM formations %s ORDER BY position" % where, params).fetchall()  # Formationen.
+        where = where.replace("id", "formation_id")  # Gleicher Filter für Offsets und Zonen.
+        offsets = {}  # Kennung -> Offsets.
+        for fid, dx, dy in cur.execute("SELECT formation_id, dx, dy FROM offsets %s ORDER BY formation_id, player_index" % where, params):
+            offsets.setdefault(fid, []).append([dx, dy])
+        zones = {}  # Kennung -> Zonen.
+        for zid, fid, pi, x, y, w, h, r, g, b, a in cur.execute(
+                "SELECT id, formation_id, player_index, x, y, width, height, r, g, b, a FROM zones %s ORDER BY id" % where, params):
+            zones.setdefault(fid, []).append({"id": zid, "player_index": pi, "rect": [x, y, w, h], "color": [r, g, b, a]})
+        return [_with_extra({"id": fid, "name": name, "ball": [bx, by], "offsets": offsets.get(fid, []), "zones": zones.get(fid, []),
+                             "version": version}, extra) for fid, name, bx, by, version, extra in rows]  # Baut die Formationen zusammen.
+
+    def load_formations(self):  # Methode zum Laden aller Formationen.
+        """Gibt alle Formationen in gespeicherter Reihenfolge zurück (Format wie formations.json, mit "id" und "version")."""
+        with self._lock:  # Sperrt die Verbindung.
+            return self._select_formations(self._conn.cursor())  # Liest alle Formationen.
+
+    def get_formation(self, formation_id):  # Methode zum Laden einer Formation.
+        """Gibt die Formation zurück (KeyError bei unbekannter Kennung)."""
+        with self._lock:  # Sperrt die Verbindung.
+            forms = self._select_formations(self._conn.cursor(), formation_id)  # Liest die Formation.
+        if not forms:  # Unbekannte Kennung.
+            raise KeyError(formation_id)
+        return forms[0]  # Gibt sie zurück.
+
+    def query_formations(self, name=None, bbox=None, after=None, limit=None, fields=None):  # Methode zum seitenweisen Laden.
+        """
+        Wie JsonStore.query_formations. Filter und Seitengröße übernimmt SQLite (der Cursor ist
+        die Listenposition); Offsets und Zonen werden nur gelesen, wenn sie gewünscht sind.
+        """
+        conditions, params = [], []  # WHERE-Bedingungen und ihre Parameter.
+        if after is not None:  # Fortsetzung nach der vorherigen Seite.
+            try:
+                conditions.append("position > ?")
+                params.append(int(after))
+            except ValueError:
+                raise ValueError("Ungültiger Cursor: %r" % after)
+        if name:  # Namenssuche.
+            conditions.append("vsm_contains(name, ?)")
+            params.append(name)
+        if bbox:  # Rechteck für die Ballposition.
+            conditions.append("ball_x BETWEEN ? AND ? AND ball_y BETWEEN ? AND ?")
+            params += [bbox[0], bbox[2], bbox[1], bbox[3]]
+        sql = "SELECT id, name, ball_x, ball_y, version, position, extra FROM formations"  # Formationen.
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY position"
+        if limit is not None:  # Eine Zeile mehr zeigt an, ob eine weitere Seite existiert.
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        with self._lock:  # Sperrt die Verbindung.
+            cur = self._conn.cursor()  # Erstellt einen Cursor.
+            rows = cur.execute(sql, params).fetchall()  # Liest die Seite.
+            cursor = None  # Cursor der nächsten Seite.
+            if limit is not None and len(rows) > limit:  # Weitere Seite vorhanden.
+                rows = rows[:limit]
+                cursor = str(rows[-1][5])  # Position der letzten Formation der Seite.
+            forms = [_with_extra({"id": fid, "name": fname, "ball": [bx, by], "offsets": [], "zones": [], "version": version}, extra)
+                     for fid, fname, bx, by, version, _, extra in rows]  # Formationen ohne Offsets und Zonen.
+            by_id = {form["id"]: form for form in forms}  # Kennung -> Formation.
+            ids = json.dumps(list(by_id))  # Kennungen der Seite für json_each.
+            if fields is None or "offsets" in fields:  # Offsets gewünscht.
+                for fid, dx, dy in cur.execute(
+                        "SELECT formation_id, dx, dy FROM offsets WHERE formation_id IN (SELECT value FROM json_each(?)) "
+                        "ORDER BY formation_id, player_index", (ids,)):
+                    by_id[fid]["offsets"].append([dx, dy])
+            if fields is None or "zones" in fields:  # Zonen gewünscht.
+                for zid, fid, pi, x, y, w, h, r, g, b, a in cur.execute(
+                        "SELECT id, formation_id, player_index, x, y, width, height, r, g, b, a FROM zones "
+                        "WHERE formation_id IN (SELECT value FROM json_each(?)) ORDER BY id", (ids,)):
+                    by_id[fid]["zones"].append({"id": zid, "player_index": pi, "rect": [x, y, w, h], "color": [r, g, b, a]})
+        if fields is not None:  # Nur die gewünschten Felder.
+            forms = [{k: form[k] for k in form if k == "id" or k in fields} for form in forms]
+        return forms, cursor  # Gibt die Seite und den Cursor zurück.
+
+    def add_formation(self, formation):  # Methode zum Anhängen einer Formation.
+        """Hängt eine Formation an, setzt formation["id"] und formation["version"] und gibt die Kennung zurück."""
+        formation.pop("id", None)  # Kennung vergibt die Datenbank.
+        formation["version"] = 1  # Erste Version.
+        formation["id"] = self._transaction(lambda cur: self._insert_formation(cur, formation))  # Fügt ein.
+        return formation["id"]  # Gibt die Kennung zurück.
+
+    def _replace_formation(self, cur, formation_id, formation, version):  # Private Methode: ersetzt eine Formation an ihrer Position.
+        position = cur.execute("SELECT position FROM formations WHERE id = ?", (formation_id,)).fetchone()[0]  # Bisherige Position.
+        cur.execute("DELETE FROM formations WHERE id = ?", (formation_id,))  # Entfernt die alte Fassung (mit Offsets und Zonen).
+        self._insert_formation(cur, dict(formation, id=formation_id, version=version), position)  # Fügt die neue Fassung ein.
+
+    def update_formation(self, formation_id, formation, expected_version=None):  # Methode zum Ersetzen einer Formation.
+        """Ersetzt die Formation und gibt die neue Version zurück."""
+        def run(cur):
+            version = self._check_version(cur, "formations", formation_id, expected_version) + 1  # Neue Version.
+            self._replace_formation(cur, formation_id, formation, version)
+            return version
+        return self._transaction(run)
+
+    def patch_formation(self, formation_id, changes, expected_version=None):  # Methode zum teilweisen Ändern einer Formation.
+        """Übernimmt nur die angegebenen Felder (ohne "id" und "version") und gibt die neue Version zurück."""
+        def run(cur):
+            version = self._check_version(cur, "formations", formation_id, expected_version) + 1  # Neue Version.
+            form = self._select_formations(cur, formation_id)[0]  # Bisherige Formation.
+            form.update({k: v for k, v in changes.items() if k not in ("id", "version")})  # Übernimmt die Felder.
+            self._replace_formation(cur, formation_id, form, version)
+            return version
+        return self._transaction(run)
+
+    def rename_formation(self, formation_id, name):  # Methode zum Umbenennen einer Formation.
+        def run(cur):
+            cur.execute("UPDATE formations SET name = ?, version = version + 1 WHERE id = ?", (name, formation_id))  # Eine Zeile.
+            if not cur.rowcount:  # Unbekannte Kennung (wie JsonStore).
+                raise KeyError(formation_id)
+        self._transaction(run)
+
+    def delete_formation(self, formation_id, expected_version=None):  # Methode zum Löschen einer Formation.
+        def run(cur):
+            self._check_version(cur, "formations", formation_id, expected_version)  # Prüft die erwartete Version.
+            cur.execute("DELETE FROM formations WHERE id = ?", (formation_id,))  # Offsets und Zonen folgen per CASCADE.
+        self._transaction(run)
+
+    def add_zone(self, formation_id, zone):  # Methode zum Hinzufügen einer Zone.
+        """Fügt eine Zone hinzu und setzt zone["id"]."""
+        def run(cur):
+            zone["id"] = self._insert_zone(cur, formation_id, zone)  # Eine Zeile.
+            self._bump(cur, "formations", formation_id)  # Neue Version der Formation.
+        self._transaction(run)
+
+    def delete_zone(self, formation_id, zone):  # Methode zum Löschen einer Zone.
+        """Entfernt die Zone über ihre Kennung oder, ohne Kennung, die erste gleiche Zone."""
+        def run(cur):
+            if "id" in zone:  # Kennung bekannt.
+                cur.execute("DELETE FROM zones WHERE id = ? AND formation_id = ?", (zone["id"], formation_id))  # Eine Zeile.
+            else:
+                cur.execute(
+                    "DELETE FROM zones WHERE id = (SELECT id FROM zones WHERE formation_id = ? AND player_index = ? "
+                    "AND x = ? AND y = ? AND width = ? AND height = ? AND r = ? AND g = ? AND b = ? AND a = ? ORDER BY id LIMIT 1)",
+                    (formation_id, zone.get("player_index"), *zone["rect"], *zone["color"]))  # Erste passende Zone.
+            if cur.rowcount:  # Zone entfernt.
+                self._bump(cur, "formations", formation_id)  # Neue Version der Formation.
+        self._transaction(run)
+
+    def replace_formations(self, formations):  # Methode zum Ersetzen aller Formationen.
+        def run(cur):
+            versions = dict(cur.execute("SELECT id, version FROM formations").fetchall())  # Bisherige Versionen.
+            cur.execute("DELETE FROM formations")  # Entfernt alle Formationen.
+            for form in formations:  # Fügt alle neu ein (Kennungen bleiben erhalten, Versionen steigen).
+                form["version"] = versions.get(form.get("id"), 0) + 1
+                form["id"] = self._insert_formation(cur, form)
+        self._transaction(run)
+
+    # --- Teams ---
+
+    @staticmethod
+    def _insert_team(cur, team, position=None):  # Private Methode: fügt ein Team samt Spielernamen ein.
+        if position is None:  # Ans Ende der Liste.
+            position = cur.execute("SELECT COALESCE(MAX(position), 0) + 1 FROM teams").fetchone()[0]
+        cur.execute("INSERT INTO teams (id, position, name, version, extra) VALUES (?, ?, ?, ?, ?)",
+                    (team.get("id"), position, team.get("name", ""), team.get("version", 1), _extra_json(team, _TEAM_COLUMNS)))  # Team.
+        team_id = cur.lastrowid  # Kennung des Teams.
+        cur.executemany("INSERT INTO team_players (team_id, slot, name) VALUES (?, ?, ?)",
+                        [(team_id, i, name) for i, name in enumerate(team.get("player_names", []))])  # Spielernamen.
+        return team_id  # Gibt die Kennung zurück.
+
+    @staticmethod
+    def _select_teams(cur, team_id=None):  # Private Methode: liest alle oder ein Team.
+        where, params = ("WHERE id = ?", (team_id,)) if team_id is not None else ("", ())  # Optionaler Filter.
+        rows = cur.execute("SELECT id, name, version, extra FROM teams %s ORDER BY position" % where, params).fetchall()  # Teams.
+        names = {}  # Kennung -> Spielernamen.
+        for tid, name in cur.execute("SELECT team_id, name FROM team_players %s ORDER BY team_id, slot"
+                                     % where.replace("id", "team_id"), params):
+            names.setdefault(tid, []).append(name)
+        return [_with_extra({"id": tid, "name": name, "player_names": names.get(tid, []), "version": version}, extra)
+                for tid, name, version, extra in rows]  # Baut die Teams zusammen.
+
+    def load_teams(self):  # Methode zum Laden aller Teams.
+        with self._lock:  # Sperrt die Verbindung.
+            return self._select_teams(self._conn.cursor())  # Liest alle Teams.
+
+    def get_team(self, team_id):  # Methode zum Laden eines Teams.
+        """Gibt das Team zurück (KeyError bei unbekannter Kennung)."""
+        with self._lock:  # Sperrt die Verbindung.
+            teams = self._select_teams(self._conn.cursor(), team_id)  # Liest das Team.
+        if not teams:  # Unbekannte Kennung.
+            raise KeyError(team_id)
+        return teams[0]  # Gibt es zurück.
+
+    def add_team(self, team):  # Methode zum Anhängen eines Teams.
+        """Hängt ein Team an, setzt team["id"] und team["version"] und gibt die Kennung zurück."""
+        team.pop("id", None)  # Kennung vergibt die Datenbank.
+        team["version"] = 1  # Erste Version.
+        team["id"] = self._transaction(lambda cur: self._insert_team(cur, team))  # Fügt ein.
+        return team["id"]  # Gibt die Kennung zurück.
+
+    def patch_team(self, team_id, changes, expected_version=None):  # Methode zum teilweisen Ändern eines Teams.
+        """Übernimmt nur die angegebenen Felder (ohne "id" und "version") und gibt die neue Version zurück."""
+        def run(cur):
+            version = self._check_version(cur, "teams", team_id, expected_version) + 1  # Neue Version.
+            team = self._select_teams(cur, team_id)[0]  # Bisheriges Team.
+            team.update({k: v for k, v in changes.items() if k not in ("id", "version")})  # Übernimmt die Felder.
+            position = cur.execute("SELECT position FROM teams WHERE id = ?", (team_id,)).fetchone()[0]  # Bisherige Position.
+            cur.execute("DELETE FROM teams WHERE id = ?", (team_id,))  # Entfernt die alte Fassung (mit Spielernamen).
+            self._insert_team(cur, dict(team, version=version), position)  # Fügt die neue Fassung ein.
+            return version
+        return self._transaction(run)
+
+    def delete_team(self, team_id, expected_version=None):  # Methode zum Löschen eines Teams.
+        def run(cur):
+            self._check_version(cur, "teams", team_id, expected_version)  # Prüft die erwartete Version.
+            cur.execute("DELETE FROM teams WHERE id = ?", (team_id,))  # Spielernamen folgen per CASCADE.
+        self._transaction(run)
+
+    def replace_teams(self, teams):  # Methode zum Ersetzen aller Teams.
+        def run(cur):
+            versions = dict(cur.execute("SELECT id, version FROM teams").fetchall())  # Bisherige Versionen.
+            cur.execute("DELETE FROM teams")  # Entfernt alle Teams.
+            for team in teams:  # Fügt alle neu ein (Kennungen bleiben erhalten, Versionen steigen).
+                team["version"] = versions.get(team.get("id"), 0) + 1
+                team["id"] = self._insert_team(cur, team)
+        self._transaction(run)
+
+    def flush(self):  # Methode zum sofortigen Schreiben.
+        """Nichts zu tun: jede Änderung ist bereits eine abgeschlossene Transaktion."""
+
+    def formations_version(self):  # Methode zur Abfrage der Version der Daten.
+        """
+        Gibt eine Version zurück, die sich bei jeder Änderung ändert: data_version zählt
+        Transaktionen anderer Verbindungen, total_changes die eigenen Änderungen.
+        Formationen und Teams teilen sich die Version.
+        """
+        with self._lock:  # Sperrt die Verbindung.
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]  # Änderungen anderer Prozesse.
+            return data_version, self._conn.total_changes  # Gemeinsame Version.
+
+    teams_version = formations_version  # Teams verwenden dieselbe Version.
+
+
+_default_store = None  # Gemeinsamer Speicher des Prozesses.
+_default_lock = threading.Lock()  # Schützt die Erzeugung.
+
+
+def open_store(kind=None, shared=None):  # Gibt den gemeinsamen Speicher zurück.
+    """
+    Gibt den Speicher des Prozesses zurück (Desktop-Panels und Flask-App teilen ihn).
+
+    Parameter:
+        kind: STORE_JSON oder STORE_SQLITE; None liest die Umgebungsvariable VSM_STORE
+        shared: JSON-Dateien mit Dateisperre sofort schreiben (mehrere Prozesse, z.B. Gunicorn-Worker);
+                None liest die Umgebungsvariable VSM_STORE_SHARED ("1" = ein)
+
+    Die Pfade lassen sich über VSM_FORMATIONS_PATH, VSM_TEAMS_PATH und VSM_SQLITE_PATH ändern.
+    """
+    global _default_store
+    with _default_lock:  # Sperrt die Erzeugung.
+        if _default_store is None:  # Noch kein Speicher geöffnet.
+            kind = kind or os.environ.get("VSM_STORE", STORE_JSON)  # Gewähltes Backend.
+            formations_path = os.environ.get("VSM_FORMATIONS_PATH", FORMATIONS_PATH)  # JSON-Datei der Formationen.
+            teams_path = os.environ.get("VSM_TEAMS_PATH", TEAMS_PATH)  # JSON-Datei der Teams.
+            if kind == STORE_SQLITE:  # SQLite-Backend (importiert beim ersten Start die JSON-Dateien).
+                _default_store = SqliteStore(os.environ.get("VSM_SQLITE_PATH", SQLITE_PATH), formations_path, teams_path)
+            elif kind == STORE_JSON:  # JSON-Backend.
+                if shared is None:  # Umgebungsvariable entscheidet.
+                    shared = os.environ.get("VSM_STORE_SHARED", "0") == "1"
+                _default_store = JsonStore(formations_path, teams_path, shared=shared)
+            else:  # Unbekanntes Backend.
+                raise ValueError("Unbekannter Speicher: %r (erlaubt: json, sqlite)" % kind)
+        return _default_store  # Gibt den Speicher zurück.
@@ -1,20 +1,26 @@
-import json  # Importiert das json-Modul für die Arbeit mit JSON-Daten.
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QPushButton, QInputDialog, QMenu  # Importiert notwendige Widgets von PySide6 für die GUI.
+from storage import open_store  # Importiert den gemeinsamen Speicher für Formationen und Teams.
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QListView, QLineEdit, QPushButton, QInputDialog, QMenu  # Importiert notwendige Widgets von PySide6 für die GUI.
 from PySide6.QtCore import Qt, Signal  # Importiert Qt-Kernfunktionalitäten und das Signal-System von PySide6.
+from list_models import RecordListModel, RecordFilterProxy  # Importiert das Listenmodell und den Suchfilter.
 
 class TeamPanel(QWidget):  # Definiert eine Klasse für das Panel zur Teamverwaltung, die von QWidget erbt.
     """
     Panel zur Verwaltung von Teams: Speichern, Laden und Auswählen.
-    Persistenz in teams.json.
+    Persistenz über den gemeinsamen Speicher (teams.json oder SQLite, siehe storage.py).
     """
     teamSelected = Signal(list)   # Definiert ein Signal, das ausgelöst wird, wenn ein Team ausgewählt wird und die Spielerliste sendet.
     # Signal bei Änderungen an der Teams-Liste, um die Änderungen zu speichern.
-    teamsChanged = Signal(list)  # Definiert ein Signal, das bei Änderungen an der Teamliste ausgelöst wird.
+    teamsChanged = Signal(object)  # Definiert ein Signal, das bei Änderungen an der Teamliste ausgelöst wird (die Liste selbst, ohne Kopie).
 
-    def __init__(self, get_names_callback=None, parent=None): # get_names_callback ist eine Funktion, die die Namen der Spieler ausliest.
+    def __init__(self, get_names_callback=None, parent=None, store=None, autoload=True): # get_names_callback ist eine Funktion, die die Namen der Spieler ausliest.
         super().__init__(parent)  # Ruft den Konstruktor der Basisklasse QWidget auf.
+        self.store = store or open_store()  # Verwendet den übergebenen oder den gemeinsamen Speicher.
         self.get_names_callback = get_names_callback  # Speichert die Callback-Funktion zum Abrufen der Spielernamen.
-        self.teams = []  # Initialisiert eine leere Liste zur Speicherung der Teams (jedes Team als Diktionär: {'name': str, 'player_names': list}).
+        # Teams als Modell; die Ansicht erzeugt nur die sichtbaren Zeilen
+        self.model = RecordListModel(lambda team: team['name'], self)  # Listenmodell über self.teams.
+        self.proxy = RecordFilterProxy(self)  # Filter nach Name.
+        self.proxy.setSourceModel(self.model)
+        self.teams = self.model.records  # Initialisiert eine leere Liste zur Speicherung der Teams (jedes Team als Diktionär: {'name': str, 'player_names': list}).
 
         self.setFixedWidth(250) # Setzt die feste Breite des Panels.
         layout = QVBoxLayout(self)  # Erstellt ein vertikales Box-Layout für dieses Widget.
@@ -23,41 +29,44 @@ class TeamPanel(QWidget):  # Definiert eine Klasse für das Panel zur Teamverwal
         self.save_button = QPushButton("Team speichern", self)   # Erstellt einen Knopf zum Speichern des aktuellen Teams.
         layout.addWidget(self.save_button)  # Fügt den Knopf zum Layout hinzu.
 
-        self.team_list = QListWidget(self)   # Erstellt eine Listenansicht für die gespeicherten Teams.
+        self.search_edit = QLineEdit(self)  # Eingabefeld für die Suche nach Teamnamen.
+        self.search_edit.setPlaceholderText("Suchen…")  # Hinweis im leeren Feld.
+        self.search_edit.setClearButtonEnabled(True)  # Knopf zum Leeren.
+        layout.addWidget(self.search_edit)  # Fügt das Suchfeld zum Layout hinzu.
+
+        self.team_list = QListView(self)   # Erstellt eine Listenansicht für die gespeicherten Teams.
+        self.team_list.setModel(self.proxy)  # Zeigt die gefilterten Teams.
+        self.team_list.setUniformItemSizes(True)  # Gleiche Zeilenhöhe: Layout ohne Abfrage jeder Zeile.
+        self.team_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)  # Keine Bearbeitung in der Liste.
         self.team_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)  # Ermöglicht ein benutzerdefiniertes Kontextmenü für die Liste.
         layout.addWidget(self.team_list) # Fügt die Liste der Teams zum Layout hinzu.
 
         
         self.save_button.clicked.connect(self.save_current_team) # Verbindet das Klick-Signal des Speicherknopfs mit der Methode save_current_team.
-        self.team_list.itemClicked.connect(self.on_item_clicked)  # Verbindet das Klick-Signal eines Listeneintrags mit der Methode on_item_clicked.
+        self.team_list.clicked.connect(self.on_item_clicked)  # Verbindet das Klick-Signal eines Listeneintrags mit der Methode on_item_clicked.
+        self.search_edit.textChanged.connect(self.proxy.set_name_filter)  # Filtert bei jeder Eingabe.
         self.team_list.customContextMenuRequested.connect(self.show_context_menu) # Verbindet das Signal für eine Kontextmenü-Anfrage mit der Methode show_context_menu.
 
-        # Lädt die Teams aus teams.json.
-        self.load_teams()   # Ruft die Methode zum Laden der Teams auf.
+        # Lädt die Teams aus dem Speicher (ohne autoload übergibt der Aufrufer sie später mit set_teams).
+        if autoload:  # Synchron beim Erstellen laden.
+            self.load_teams()   # Ruft die Methode zum Laden der Teams auf.
 
-    def load_teams(self):  # Methode zum Laden der Teams aus einer JSON-Datei.
-        """Lädt Teams aus teams.json und wählt das erste Team automatisch aus."""
-        try:  # Beginnt einen try-Block für die Fehlerbehandlung beim Dateizugriff.
-            with open("teams.json", "r", encoding="utf-8") as f: # Öffnet die Datei "teams.json" im Lesemodus mit UTF-8-Kodierung.
-                loaded = json.load(f)  # Lädt die JSON-Daten aus der Datei.
-                self.teams = loaded if isinstance(loaded, list) else []  # Weist die geladenen Teams der Instanzvariable zu, stellt sicher, dass es eine Liste ist.
-        except (FileNotFoundError, json.JSONDecodeError):   # Behandelt den Fall, dass die Datei nicht gefunden wird oder einen JSON-Dekodierungsfehler enthält.
-            self.teams = []  # Initialisiert die Teamliste als leer, wenn ein Fehler auftritt.
+    def load_teams(self):  # Methode zum Laden der Teams aus dem Speicher.
+        """Lädt Teams aus dem Speicher und wählt das erste Team automatisch aus."""
+        self.set_teams(self.store.load_teams())  # Lädt die Teams (leer, wenn keine gespeichert sind).
 
-        self.team_list.clear()   # Leert die aktuelle Teamliste in der GUI.
-        for team in self.teams:  # Iteriert über jedes geladene Team.
-            self.team_list.addItem(team['name'])  # Fügt den Namen des Teams zur Listenansicht hinzu.
+    def set_teams(self, teams):  # Methode zum Übernehmen bereits geladener Teams.
+        """Zeigt die (z.B. im Hintergrund) geladenen Teams an und wählt das erste Team automatisch aus."""
+        self.teams = teams  # Übernimmt die Liste.
+        self.model.set_records(self.teams)  # Das Modell zeigt dieselbe Liste.
 
-    
         self.teamsChanged.emit(self.teams)  # Löst das Signal teamsChanged aus, um über die geladenen Teams zu informieren.
         if self.teams:  # Überprüft, ob Teams geladen wurden.
-            self.team_list.setCurrentRow(0)  # Wählt das erste Team in der Liste standardmäßig aus.
-            self.on_item_clicked(self.team_list.currentItem()) # Wenn ein Team ausgewählt wird, wird die on_item_clicked Funktion aufgerufen.
+            self.select_team(0)  # Wählt das erste Team in der Liste standardmäßig aus.
 
-    def save_teams(self):  # Methode zum Speichern der aktuellen Teamliste in eine JSON-Datei.
-        """Speichert die Teams-Liste in teams.json."""
-        with open("teams.json", "w", encoding="utf-8") as f:  # Öffnet die Datei "teams.json" im Schreibmodus mit UTF-8-Kodierung.
-            json.dump(self.teams, f, ensure_ascii=False, indent=2)  # Schreibt die Teamliste im JSON-Format in die Datei (mit Einrückung für Lesbarkeit).
+    def save_teams(self):  # Methode zum Speichern der kompletten Teamliste.
+        """Ersetzt alle gespeicherten Teams durch die aktuelle Liste."""
+        self.store.replace_teams(self.teams)  # Schreibt die Teamliste in den Speicher.
         self.teamsChanged.emit(self.teams)  # Löst das Signal teamsChanged aus, um über die Änderungen zu informieren.
 
     def save_current_team(self):  # Methode zum Speichern des aktuell konfigurierten Teams.
@@ -67,29 +76,31 @@ class TeamPanel(QWidget):  # Definiert eine Klasse für das Panel zur Teamverwal
             return  # Bricht ab, wenn nicht.
         player_names = self.get_names_callback() if self.get_names_callback else []  # Ruft die Spielernamen über die Callback-Funktion ab, falls vorhanden.
         entry = {'name': name, 'player_names': player_names}  # Erstellt ein Dictionary für das neue Team.
-        self.teams.append(entry)  # Fügt das neue Team zur Liste der Teams hinzu.
-        self.team_list.addItem(name)  # Fügt den Namen des neuen Teams zur Listenansicht hinzu.
-        self.save_teams()   # Ruft die Methode zum Speichern aller Teams auf.
+        self.model.append(entry)  # Fügt das neue Team zur Liste der Teams (und zur Ansicht) hinzu.
+        self.store.add_team(entry)  # Speichert nur das neue Team (setzt entry["id"]).
+        self.teamsChanged.emit(self.teams)  # Löst das Signal teamsChanged aus, um über die Änderungen zu informieren.
 
-    def on_item_clicked(self, item):  # Methode, die aufgerufen wird, wenn ein Element in der Teamliste angeklickt wird.
+    def on_item_clicked(self, index):  # Methode, die aufgerufen wird, wenn ein Element in der Teamliste angeklickt wird.
         """Sendet ein Signal für das ausgewählte Team mit den Spielernamen.""" # Englischer Kommentar übersetzt.
-        idx = self.team_list.row(item)  # Ermittelt den Index des angeklickten Elements.
+        self.select_team(self.proxy.source_row(index))  # Index der Ansicht -> Index in self.teams.
+
+    def select_team(self, idx):  # Methode zum Auswählen eines Teams über seinen Index.
         if 0 <= idx < len(self.teams):  # Überprüft, ob der Index gültig ist.
+            self.team_list.setCurrentIndex(self.proxy.view_index(idx))  # Markiert den Eintrag in der Ansicht.
             self.teamSelected.emit(self.teams[idx]['player_names'])  # Löst das Signal teamSelected mit den Namen der Spieler des ausgewählten Teams aus.
 
     def show_context_menu(self, pos):   # Methode zum Anzeigen eines Kontextmenüs für Listeneinträge.
-        item = self.team_list.itemAt(pos)   # Holt das Listenelement an der angegebenen Mausposition.
-        if not item:  # Überprüft, ob ein Element vorhanden ist.
+        idx = self.proxy.source_row(self.team_list.indexAt(pos))   # Index des Teams an der Mausposition.
+        if idx < 0:  # Überprüft, ob ein Element vorhanden ist.
             return  # Bricht ab, wenn kein Element an der Position ist.
         menu = QMenu(self)  # Erstellt ein neues Kontextmenü.
         delete_action = menu.addAction("Löschen")   # Fügt eine "Löschen"-Aktion zum Menü hinzu.
-        action = menu.exec(self.team_list.mapToGlobal(pos))  # Zeigt das Kontextmenü an und wartet auf eine Aktion.
+        action = menu.exec(self.team_list.viewport().mapToGlobal(pos))  # Zeigt das Kontextmenü an und wartet auf eine Aktion.
         if action == delete_action:  # Überprüft, ob die "Löschen"-Aktion ausgewählt wurde.
-            self.delete_team(item)  # Ruft die Methode zum Löschen des Teams auf.
+            self.delete_team(idx)  # Ruft die Methode zum Löschen des Teams auf.
 
-    def delete_team(self, item): # Löscht ein Team.
-        idx = self.team_list.row(item)  # Ermittelt den Index des zu löschenden Elements.
+    def delete_team(self, idx): # Löscht ein Team (Index in self.teams).
         if 0 <= idx < len(self.teams):  # Überprüft, ob der Index gültig ist.
-            del self.teams[idx]  # Löscht das Team aus der Liste der Teams.
-            self.team_list.takeItem(idx)   # Entfernt das Element aus der Listenansicht.
-            self.save_teams()   # Ruft die Methode zum Speichern aller Teams auf. 
\ No newline at end of file
+            self.store.delete_team(self.teams[idx]["id"])  # Löscht nur dieses Team im Speicher.
+            self.model.remove(idx)  # Löscht das Team aus der Liste der Teams und der Ansicht.
+            self.teamsChanged.emit(self.teams)  # Löst das Signal teamsChanged aus, um über die Änderungen zu informieren. 
\ No newline at end of file
@@ -1,50 +1,24 @@
-import math  # Importiert das math-Modul für mathematische Operationen.
 from PySide6.QtCore import QPointF  # Importiert QPointF von PySide6 für die Arbeit mit 2D-Punkten mit Fließkommazahlen.
 from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsTextItem, QGraphicsItem  # Importiert Klassen für grafische Elemente wie Ellipsen und Text.
 from PySide6.QtGui import QBrush, QPen, QColor  # Importiert Klassen für Pinsel, Stifte und Farben.
 from PySide6.QtCore import Qt, QRectF  # Importiert Qt-Kernfunktionalitäten und QRectF für Rechtecke mit Fließkommazahlen.
+from core import geometry  # Importiert die Qt-freie Spielfeldgeometrie.
+from core.geometry import DEFAULT_SCALE, CourtDimensions  # noqa: F401  Re-Export für bestehende Importe.
 
-# Konstanten
-DEFAULT_SCALE = 30  # Definiert den Standardmaßstab: 30 Pixel pro Meter.
-
-class CourtDimensions:  # Definiert eine Klasse zur Speicherung und Berechnung von Spielfeldabmessungen.
-    def __init__(self, scale=DEFAULT_SCALE):  # Konstruktor der Klasse, nimmt einen optionalen Maßstab entgegen.
-        self.scale = scale  # Speichert den Maßstab.
-        self.width = 9 * scale  # Berechnet die Breite des Spielfelds.
-        self.height = 18 * scale  # Berechnet die Höhe des Spielfelds.
-        self.net_y = 9 * scale  # Definiert die y-Position der Netzlinie.
-        self.attack_line_y = self.net_y - 3 * scale  # Berechnet die y-Position der Angriffslinie (auf der eigenen Seite, daher Subtraktion).
-        self.defense_line_y = self.net_y + 3 * scale  # Berechnet die y-Position der (gegnerischen) Angriffslinie (aus Sicht der eigenen Seite).
+# Qt-Adapter der Geometriefunktionen: nehmen QPointF entgegen und geben QPointF zurück
 
 def calculate_distance(p1: QPointF, p2: QPointF) -> float:  # Definiert eine Funktion zur Abstandsberechnung zwischen zwei QPointF-Punkten.
     """Berechnet den Abstand zwischen zwei Punkten"""  # Docstring der Funktion.
-    dx = p2.x() - p1.x()  # Berechnet die Differenz der x-Koordinaten.
-    dy = p2.y() - p1.y()  # Berechnet die Differenz der y-Koordinaten.
-    return math.sqrt(dx*dx + dy*dy)  # Gibt den euklidischen Abstand zurück.
+    return geometry.calculate_distance((p1.x(), p1.y()), (p2.x(), p2.y()))  # Delegiert an die Qt-freie Funktion.
 
 def calculate_angle(from_point: QPointF, to_point: QPointF) -> float:  # Definiert eine Funktion zur Winkelberechnung zwischen zwei QPointF-Punkten.
     """Berechnet den Winkel in Grad von einem Punkt zu einem anderen"""  # Docstring der Funktion.
-    dx = to_point.x() - from_point.x()  # Berechnet die Differenz der x-Koordinaten.
-    dy = to_point.y() - from_point.y()  # Berechnet die Differenz der y-Koordinaten.
-    return (-math.degrees(math.atan2(dy, dx))) % 360  # Gibt den Winkel in Grad zurück (im Uhrzeigersinn, 0° ist rechts).
+    return geometry.calculate_angle((from_point.x(), from_point.y()), (to_point.x(), to_point.y()))  # Delegiert an die Qt-freie Funktion.
 
 def get_intersection_with_net(player_pos: QPointF, ball_pos: QPointF, net_y: float) -> QPointF:  # Definiert eine Funktion zur Berechnung des Schnittpunkts einer Linie mit dem Netz.
     """Berechnet den Schnittpunkt der Linie zwischen Spieler und Ball mit dem Netz"""  # Docstring der Funktion.
-    dx = ball_pos.x() - player_pos.x()  # Differenz der x-Koordinaten zwischen Ball und Spieler.
-    dy = ball_pos.y() - player_pos.y()  # Differenz der y-Koordinaten zwischen Ball und Spieler.
-    
-    # Prüft, ob beide Punkte auf der gleichen Seite des Netzes sind
-    if (player_pos.y() < net_y and ball_pos.y() < net_y) or \
-       (player_pos.y() > net_y and ball_pos.y() > net_y):  # Bedingung: Beide Punkte unterhalb des Netzes.
-        return None  # Gibt None zurück, wenn kein Schnittpunkt mit dem Netz möglich ist.
-    
-    # Behandelt den Fall einer horizontalen Linie
-    if dy == 0:  # Wenn die y-Differenz null ist (horizontale Linie).
-        return QPointF(player_pos.x(), net_y)  # Gibt einen Punkt auf der Netzlinie mit der x-Koordinate des Spielers zurück (oder des Balls, da y identisch).
-    
-    # Berechnet den Schnittpunkt mit der Geradengleichung
-    intersection_x = player_pos.x() + (net_y - player_pos.y()) * dx / dy  # Berechnet die x-Koordinate des Schnittpunkts.
-    return QPointF(intersection_x, net_y)  # Gibt den Schnittpunkt als QPointF zurück.
+    point = geometry.get_intersection_with_net((player_pos.x(), player_pos.y()), (ball_pos.x(), ball_pos.y()), net_y)  # Delegiert an die Qt-freie Funktion.
+    return QPointF(*point) if point is not None else None  # Gibt den Schnittpunkt als QPointF zurück (None ohne Schnittpunkt).
 
 class DraggableEllipse(QGraphicsEllipseItem):  # Definiert eine Klasse für eine ziehbare Ellipse, die von QGraphicsEllipseItem erbt.
     def __init__(self, rect, label=""):  # Konstruktor der Klasse, nimmt ein Rechteck (QRectF) und ein optionales Label entgegen.
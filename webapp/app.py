@@ -1,59 +1,432 @@
+import collections
+import hashlib
 import json
+import math
 import os
-from flask import Flask, jsonify, render_template, request
+import sys
+import threading
+import numpy as np
+from flask import Flask, Response, jsonify, render_template, request
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from storage import VersionConflict, open_store  # noqa: E402  (shared with the desktop panels)
+from core.interpolation import InterpolationEngine  # noqa: E402  (Qt-free)
 
 app = Flask(__name__)
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-FORMATIONS_PATH = os.path.join(BASE_DIR, 'formations.json')
-TEAMS_PATH = os.path.join(BASE_DIR, 'teams.json')
+# JSON (default) or SQLite backend, selected via VSM_STORE; shared so several
+# worker processes (e.g. gunicorn -w 4) can write the same files safely
+store = open_store(shared=True)
+
+
+class ListCache:
+    """Serialized GET bodies of a store list, reused until the store version changes."""
+
+    def __init__(self, load, version):
+        self.load = load
+        self.version = version
+        self._lock = threading.Lock()
+        self._entry = None  # (version, body, etag)
+
+    def get(self):
+        version = self.version()
+        entry = self._entry
+        if entry is None or entry[0] != version:
+            with self._lock:
+                entry = self._entry
+                if entry is None or entry[0] != version:
+                    body = json.dumps(self.load(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                    entry = (version, body, hashlib.sha1(body).hexdigest())
+                    self._entry = entry
+        return entry[1], entry[2]
+
+
+formations_cache = ListCache(store.load_formations, store.formations_version)
+teams_cache = ListCache(store.load_teams, store.teams_version)
+
+
+def cached_list(cache):
+    """Return the cached list with a strong ETag, or 304 if the client already has it."""
+    return etag_response(*cache.get())
+
+
+def etag_response(body, etag):
+    """JSON body with a strong ETag, or 304 if the client already has it."""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+class EngineCache:
+    """Interpolation engine over the stored formations, rebuilt only when the store version changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entry = None  # (version, engine)
+
+    def get(self):
+        version = store.formations_version()
+        entry = self._entry
+        if entry is None or entry[0] != version:
+            with self._lock:
+                entry = self._entry
+                if entry is None or entry[0] != version:
+                    # records that do not have the shape of a formation (e.g. written before validation) are skipped
+                    forms = [f for f in store.load_formations() if is_point(f.get('ball')) and is_point_list(f.get('offsets'))]
+                    engine = InterpolationEngine([f['ball'] for f in forms], [f['offsets'] for f in forms])
+                    engine.locate_batch(np.empty((0, 2)))  # prepare the batch matrices once
+                    entry = (version, engine)
+                    self._entry = entry
+        return entry[1]
+
+
+engine_cache = EngineCache()
+
+# How often the change feed checks the store for edits made by other workers or the desktop app
+EVENT_POLL_INTERVAL = float(os.environ.get('VSM_EVENT_POLL', '0.5'))
+EVENT_HEARTBEAT = 15.0
+EVENT_BACKLOG = 1000
+
+
+class ChangeFeed:
+    """Created/updated/deleted events for formations and teams, shared by all event streams.
+
+    One thread per process compares record versions whenever the store version changes,
+    so edits from any worker or the desktop app are reported. Recent events are kept for
+    clients reconnecting with ``Last-Event-ID``; older or foreign ids get a ``reset``.
+    """
+
+    def __init__(self):
+        self.token = os.urandom(4).hex()  # distinguishes event ids of different processes
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._events = collections.deque(maxlen=EVENT_BACKLOG)  # (seq, kind, data)
+        self._seq = 0
+        self._thread = None
+
+    def poke(self):
+        """Check for changes now instead of at the next poll."""
+        self._wake.set()
+
+    def _start(self):
+        with self._cond:
+            if self._thread is None:
+                snapshot = self._snapshot()
+                self._thread = threading.Thread(target=self._run, args=(snapshot,), name='change-feed', daemon=True)
+                self._thread.start()
+
+    @staticmethod
+    def _snapshot():
+        versions = (store.formations_version(), store.teams_version())
+        forms, _ = store.query_formations(fields={'name', 'ball', 'version'})
+        records = {('formation', f['id']): f for f in forms}
+        records.update({('team', t['id']): t for t in store.load_teams()})
+        return versions, records
+
+    def _run(self, snapshot):
+        versions, records = snapshot
+        while True:
+            self._wake.wait(EVENT_POLL_INTERVAL)
+            self._wake.clear()
+            try:
+                if (store.formations_version(), store.teams_version()) == versions:
+                    continue
+                versions, current = self._snapshot()
+            except Exception as exc:  # keep the feed alive, e.g. while a file is being replaced
+                print(f"Change feed error: {exc}")
+                continue
+            events = []
+            for key, record in current.items():
+                old = records.get(key)
+                if old is None or old['version'] != record['version']:
+                    op = 'created' if old is None else 'updated'
+                    events.append((key[0], {'op': op, 'id': key[1], 'version': record['version'], 'record': record}))
+            for key in records.keys() - current.keys():
+                events.append((key[0], {'op': 'deleted', 'id': key[1], 'version': records[key]['version']}))
+            records = current
+            if events:
+                with self._cond:
+                    for kind, data in events:
+                        self._seq += 1
+                        self._events.append((self._seq, kind, json.dumps(data, ensure_ascii=False, separators=(',', ':'))))
+                    self._cond.notify_all()
+
+    def _resume(self, last_event_id):
+        """Sequence number to continue after, or None if the client has to reload."""
+        token, _, seq = (last_event_id or '').partition('-')
+        if token != self.token or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._events[0][0] if self._events else self._seq + 1
+        return seq if oldest - 1 <= seq <= self._seq else None
+
+    def stream(self, last_event_id=None):
+        """Server-sent event messages, starting after ``last_event_id``."""
+        self._start()
+        with self._cond:
+            seq = self._resume(last_event_id) if last_event_id else self._seq
+            reset = seq is None
+            if reset:
+                seq = self._seq
+        yield 'retry: 2000\n\n'
+        if reset:
+            yield 'id: %s-%d\nevent: reset\ndata: {}\n\n' % (self.token, seq)
+        while True:
+            with self._cond:
+                if self._seq == seq:
+                    self._cond.wait(EVENT_HEARTBEAT)
+                pending = [event for event in self._events if event[0] > seq]
+            if not pending:
+                yield ': ping\n\n'
+                continue
+            for seq, kind, data in pending:
+                yield 'id: %s-%d\nevent: %s\ndata: %s\n\n' % (self.token, seq, kind, data)
+
+
+change_feed = ChangeFeed()
+
+
+@app.after_request
+def notify_change_feed(response):
+    if request.method in ('POST', 'PUT', 'PATCH', 'DELETE') and request.path != '/api/interpolate':
+        change_feed.poke()
+    return response
 
+# Upper bound for one /api/interpolate request (one animation frame of drag positions is far less)
+MAX_INTERPOLATE_POINTS = 10000
 
-def load_json(path):
-    if not os.path.exists(path):
-        return []
-    with open(path, 'r', encoding='utf-8') as fh:
-        return json.load(fh)
 
+def read_points():
+    """Ball positions from the request as an (N, 2) array, or None if the body is invalid.
 
-def save_json(path, data):
-    with open(path, 'w', encoding='utf-8') as fh:
-        json.dump(data, fh, indent=2, ensure_ascii=False)
+    Accepts a JSON pair ``[x, y]``, a JSON list of pairs, ``{"points": [...]}``,
+    or an ``application/octet-stream`` body of little-endian float32 x/y pairs.
+    """
+    if request.mimetype == 'application/octet-stream':
+        data = request.get_data()
+        if len(data) % 8:
+            return None
+        return np.frombuffer(data, dtype='<f4').astype(float).reshape(-1, 2)
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get('points')
+    try:
+        points = np.asarray(payload, dtype=float)
+    except (TypeError, ValueError):
+        return None
+    if points.shape == (2,):
+        points = points.reshape(1, 2)
+    if points.ndim != 2 or points.shape[1] != 2:
+        return None
+    return points
+
+
+@app.route('/api/interpolate', methods=['POST'])
+def interpolate():
+    """Interpolate player positions for one or many ball positions.
+
+    JSON response: one entry per point, ``null`` outside the triangulation, otherwise
+    ``positions`` (ball + interpolated offset per player), ``triangle`` and ``weights``.
+    With ``Accept: application/octet-stream`` the body is float32 positions of shape
+    (points, players, 2), NaN outside the triangulation; ``X-Players`` gives the count.
+    """
+    points = read_points()
+    if points is None:
+        return jsonify({'error': 'Invalid data'}), 400
+    if len(points) > MAX_INTERPOLATE_POINTS:
+        return jsonify({'error': 'too many points'}), 413
+    engine = engine_cache.get()
+    triangle_ids, weights, offsets = engine.query_batch(points)
+    positions = offsets + points[:, None, :]
+    if request.accept_mimetypes.best == 'application/octet-stream':
+        response = Response(positions.astype('<f4').tobytes(), mimetype='application/octet-stream')
+        response.headers['X-Players'] = str(positions.shape[1])
+        return response
+    results = []
+    for i, tid in enumerate(triangle_ids.tolist()):
+        if tid < 0:
+            results.append(None)
+            continue
+        results.append({
+            'positions': positions[i].tolist(),
+            'triangle': [list(corner) for corner in engine.triangles[tid]],
+            'weights': weights[i].tolist(),
+        })
+    return jsonify({'players': int(positions.shape[1]), 'results': results})
 
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def expected_version():
+    """Version from an ``If-Match: "<version>"`` header, or None if absent."""
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    for tag in request.if_match.as_set():
+        if tag.isdigit():
+            return int(tag)
+    return -1  # never matches: the client holds an ETag that is not a record version
+
+
+def record_response(record):
+    """A single record with its version as ETag."""
+    response = jsonify(record)
+    response.set_etag(str(record['version']))
+    return response
+
+
+def modify_record(action):
+    """Run a store mutation and map missing records and stale versions to HTTP errors."""
+    try:
+        version = action()
+    except KeyError:
+        return jsonify({'error': 'not found'}), 404
+    except VersionConflict as exc:
+        response = jsonify({'error': 'version conflict', 'version': exc.current_version})
+        response.set_etag(str(exc.current_version))
+        return response, 412
+    if version is None:
+        return jsonify({'status': 'ok'})
+    response = jsonify({'status': 'ok', 'version': version})
+    response.set_etag(str(version))
+    return response
+
+
+FORMATION_FIELDS = {'id', 'name', 'ball', 'offsets', 'zones', 'names', 'version'}
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def is_point(value):
+    """A JSON pair of finite numbers, e.g. a ball position or a player offset."""
+    return isinstance(value, list) and len(value) == 2 and all(is_number(v) for v in value)
+
+
+def is_point_list(value):
+    return isinstance(value, list) and all(is_point(v) for v in value)
+
+
+def is_zone(zone):
+    return (isinstance(zone, dict) and isinstance(zone.get('player_index'), int) and not isinstance(zone['player_index'], bool)
+            and isinstance(zone.get('rect'), list) and len(zone['rect']) == 4 and all(is_number(v) for v in zone['rect'])
+            and isinstance(zone.get('color'), list) and len(zone['color']) == 4
+            and all(isinstance(v, int) and not isinstance(v, bool) and 0 <= v <= 255 for v in zone['color']))
+
+
+def formation_error(data, partial=False):
+    """Why a formation body is malformed, or None if it is valid.
+
+    POST and PUT bodies need ``ball`` and ``offsets``; PATCH bodies (``partial``) only
+    need valid values for the fields they contain.
+    """
+    for field in ('ball', 'offsets'):
+        if not partial and field not in data:
+            return 'missing %s' % field
+    if 'ball' in data and not is_point(data['ball']):
+        return 'ball must be [x, y]'
+    if 'offsets' in data and not is_point_list(data['offsets']):
+        return 'offsets must be a list of [dx, dy] pairs'
+    if 'zones' in data and not (isinstance(data['zones'], list) and all(is_zone(z) for z in data['zones'])):
+        return 'zones must be a list of {player_index, rect: [x, y, w, h], color: [r, g, b, a]}'
+    if 'name' in data and not isinstance(data['name'], str):
+        return 'name must be a string'
+    return None
+
+
+def invalid_formation(message):
+    return jsonify({'error': 'Invalid formation: %s' % message}), 400
+
+
+MAX_PAGE_SIZE = 500
+
+
+def read_formation_query():
+    """Parse ``limit``, ``cursor``, ``q``, ``bbox`` and ``fields``; None if any is invalid."""
+    args = request.args
+    query = {'name': args.get('q') or None, 'after': args.get('cursor') or None}
+    try:
+        if 'limit' in args:
+            query['limit'] = int(args['limit'])
+            if not 0 < query['limit'] <= MAX_PAGE_SIZE:
+                return None
+        if 'bbox' in args:
+            bbox = [float(v) for v in args['bbox'].split(',')]
+            if len(bbox) != 4:
+                return None
+            query['bbox'] = (min(bbox[0], bbox[2]), min(bbox[1], bbox[3]), max(bbox[0], bbox[2]), max(bbox[1], bbox[3]))
+    except ValueError:
+        return None
+    if 'fields' in args:
+        fields = {f.strip() for f in args['fields'].split(',') if f.strip()}
+        if not fields or not fields <= FORMATION_FIELDS:
+            return None
+        query['fields'] = fields
+    return query
+
+
 @app.route('/api/formations', methods=['GET', 'POST'])
 def formations():
-    """List or append formations."""
+    """List or append formations.
+
+    Without query parameters the full list is returned. ``limit`` and ``cursor`` page
+    through it (the next cursor is sent as ``X-Next-Cursor``), ``q`` searches names,
+    ``bbox=x0,y0,x1,y1`` filters by ball position and ``fields=name,ball`` selects
+    fields (``id`` is always included).
+    """
     if request.method == 'POST':
         formation = request.get_json(silent=True)
-        if not formation:
+        if not isinstance(formation, dict) or not formation:
             return jsonify({'error': 'Invalid data'}), 400
-        formations = load_json(FORMATIONS_PATH)
-        formations.append(formation)
-        save_json(FORMATIONS_PATH, formations)
-        return jsonify({'status': 'ok'})
-    return jsonify(load_json(FORMATIONS_PATH))
+        error = formation_error(formation)
+        if error:
+            return invalid_formation(error)
+        store.add_formation(formation)
+        return record_response({'status': 'ok', 'id': formation['id'], 'version': formation['version']}), 201
+    if not request.args:
+        return cached_list(formations_cache)
+    query = read_formation_query()
+    if query is None:
+        return jsonify({'error': 'Invalid query'}), 400
+    try:
+        page, cursor = store.query_formations(**query)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    body = json.dumps(page, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    response = etag_response(body, hashlib.sha1(body).hexdigest())
+    if cursor is not None:
+        response.headers['X-Next-Cursor'] = cursor
+    return response
 
 
-@app.route('/api/formations/<int:idx>', methods=['PUT', 'DELETE'])
-def formations_modify(idx):
-    """Update or delete a formation by index."""
-    formations = load_json(FORMATIONS_PATH)
-    if idx < 0 or idx >= len(formations):
-        return jsonify({'error': 'invalid index'}), 404
+@app.route('/api/formations/<int:formation_id>', methods=['GET', 'PUT', 'PATCH', 'DELETE'])
+def formation_detail(formation_id):
+    """Read, replace, partially update or delete a formation by id (If-Match: version)."""
+    if request.method == 'GET':
+        try:
+            return record_response(store.get_formation(formation_id))
+        except KeyError:
+            return jsonify({'error': 'not found'}), 404
     if request.method == 'DELETE':
-        formations.pop(idx)
-    else:
-        data = request.get_json(silent=True)
-        if not data:
-            return jsonify({'error': 'Invalid data'}), 400
-        formations[idx] = data
-    save_json(FORMATIONS_PATH, formations)
-    return jsonify({'status': 'ok'})
+        return modify_record(lambda: store.delete_formation(formation_id, expected_version()))
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data:
+        return jsonify({'error': 'Invalid data'}), 400
+    error = formation_error(data, partial=request.method == 'PATCH')
+    if error:
+        return invalid_formation(error)
+    if request.method == 'PATCH':
+        return modify_record(lambda: store.patch_formation(formation_id, data, expected_version()))
+    return modify_record(lambda: store.update_formation(formation_id, data, expected_version()))
 
 
 @app.route('/api/teams', methods=['GET', 'POST'])
@@ -61,24 +434,37 @@ def teams():
     """List or append teams."""
     if request.method == 'POST':
         team = request.get_json(silent=True)
-        if not team:
+        if not isinstance(team, dict) or not team:
             return jsonify({'error': 'Invalid data'}), 400
-        teams = load_json(TEAMS_PATH)
-        teams.append(team)
-        save_json(TEAMS_PATH, teams)
-        return jsonify({'status': 'ok'})
-    return jsonify(load_json(TEAMS_PATH))
+        store.add_team(team)
+        return record_response({'status': 'ok', 'id': team['id'], 'version': team['version']}), 201
+    return cached_list(teams_cache)
 
 
-@app.route('/api/teams/<int:idx>', methods=['DELETE'])
-def teams_delete(idx):
-    teams = load_json(TEAMS_PATH)
-    if idx < 0 or idx >= len(teams):
-        return jsonify({'error': 'invalid index'}), 404
-    teams.pop(idx)
-    save_json(TEAMS_PATH, teams)
+@app.route('/api/teams/<int:team_id>', methods=['GET', 'PATCH', 'DELETE'])
+def team_detail(team_id):
+    """Read, partially update or delete a team by id (If-Match: version)."""
+    if request.method == 'GET':
+        try:
+            return record_response(store.get_team(team_id))
+        except KeyError:
+            return jsonify({'error': 'not found'}), 404
+    if request.method == 'DELETE':
+        return modify_record(lambda: store.delete_team(team_id, expected_version()))
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data:
+        return jsonify({'error': 'Invalid data'}), 400
+    return modify_record(lambda: store.patch_team(team_id, data, expected_version()))
+
 
-    return jsonify({'status': 'ok'})
+@app.route('/api/events')
+def events():
+    """Server-sent events: ``formation``/``team`` with ``{op, id, version, record}``, or ``reset``."""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    response = Response(change_feed.stream(last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 
 if __name__ == '__main__':
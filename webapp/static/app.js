@@ -7,7 +7,15 @@ let offsetX = 0;
 let offsetY = 0;
 let markers = [];
 let formations = [];
+let formationDetails = {};
+let formationRequests = {};
+let formationItems = {};
+let currentFormationId = null;
+let changeFeed = null;
 let teams = [];
+let pendingPoints = [];
+let interpolationFrame = null;
+let interpolationInFlight = false;
 
 function drawField() {
     ctx.clearRect(0, 0, canvas.width, canvas.height);
@@ -55,41 +63,132 @@ function drawField() {
     }
 }
 
+const FORMATION_PAGE_SIZE = 200;
+
+// The list only needs names and ball positions; full formations are loaded on demand.
 function loadData() {
-    Promise.all([
-        fetch('/api/formations').then(r => r.json()),
-        fetch('/api/teams').then(r => r.json())
-    ]).then(([fData, tData]) => {
-        formations = fData;
+    formations = [];
+    markers = [];
+    formationItems = {};
+    formationDetails = {};
+    formationRequests = {};
+    document.getElementById('formations').innerHTML = '';
+    loadFormationPage(null);
+
+    fetch('/api/teams').then(r => r.json()).then(tData => {
         teams = tData;
-        const formList = document.getElementById('formations');
-        formList.innerHTML = '';
-        markers = [];
-        formations.forEach((f, idx) => {
-            const li = document.createElement('li');
-            li.textContent = f.name || 'Formation ' + (idx + 1);
-            li.onclick = () => applyFormation(idx);
-            formList.appendChild(li);
-            markers.push({x: f.ball[0], y: f.ball[1]});
+        renderTeams();
+    });
+}
+
+function loadFormationPage(cursor) {
+    let url = '/api/formations?fields=id,name,ball&limit=' + FORMATION_PAGE_SIZE;
+    if (cursor) url += '&cursor=' + encodeURIComponent(cursor);
+    return fetch(url).then(r => {
+        const next = r.headers.get('X-Next-Cursor');
+        return r.json().then(page => {
+            page.forEach(upsertFormation);
+            if (!cursor && formations.length > 0) {
+                applyFormation(0);
+            } else {
+                drawField();
+            }
+            if (next) return loadFormationPage(next);
         });
+    });
+}
+
+function formationIndex(id) {
+    return formations.findIndex(f => f.id === id);
+}
 
-        const teamList = document.getElementById('teams');
-        teamList.innerHTML = '';
-        teams.forEach((t, idx) => {
-            const li = document.createElement('li');
-            li.textContent = t.name || 'Team ' + (idx + 1);
-            li.onclick = () => applyTeam(idx);
-            teamList.appendChild(li);
+// Adds a formation to the list or updates it in place (pages and change events may overlap).
+function upsertFormation(f) {
+    let idx = formationIndex(f.id);
+    if (idx < 0) {
+        idx = formations.length;
+        formations.push(f);
+        markers.push(null);
+        const li = document.createElement('li');
+        li.onclick = () => applyFormation(formationIndex(f.id));
+        document.getElementById('formations').appendChild(li);
+        formationItems[f.id] = li;
+    } else {
+        formations[idx] = f;
+    }
+    markers[idx] = {x: f.ball[0], y: f.ball[1]};
+    formationItems[f.id].textContent = f.name || 'Formation ' + (idx + 1);
+}
+
+function loadFormation(id) {
+    if (!formationRequests[id]) {
+        const request = fetch('/api/formations/' + id).then(r => {
+            if (!r.ok) throw new Error(r.status);
+            return r.json();
+        }).then(f => {
+            if (formationRequests[id] === request) formationDetails[id] = f;
+        }).catch(() => {
+            if (formationRequests[id] === request) delete formationRequests[id];
         });
+        formationRequests[id] = request;
+    }
+    return formationRequests[id];
+}
+
+// Server-sent events keep the lists in sync with edits from other devices.
+function listenForChanges() {
+    if (!window.EventSource) return;
+    changeFeed = new EventSource('/api/events');
+    changeFeed.addEventListener('formation', e => applyFormationChange(JSON.parse(e.data)));
+    changeFeed.addEventListener('team', e => applyTeamChange(JSON.parse(e.data)));
+    changeFeed.addEventListener('reset', () => loadData());
+}
 
-        if (formations.length > 0) {
-            applyFormation(0);
-        } else {
-            drawField();
+function applyFormationChange(change) {
+    const detail = formationDetails[change.id];
+    if (!detail || detail.version !== change.version) {
+        delete formationDetails[change.id];
+        delete formationRequests[change.id];
+    }
+    if (change.op === 'deleted') {
+        const idx = formationIndex(change.id);
+        if (idx < 0) return;
+        formations.splice(idx, 1);
+        markers.splice(idx, 1);
+        formationItems[change.id].remove();
+        delete formationItems[change.id];
+    } else {
+        upsertFormation(change.record);
+        if (change.id === currentFormationId && !dragging) {
+            applyFormation(formationIndex(change.id));
         }
+    }
+    drawField();
+}
+
+function renderTeams() {
+    const teamList = document.getElementById('teams');
+    teamList.innerHTML = '';
+    teams.forEach((t, idx) => {
+        const li = document.createElement('li');
+        li.textContent = t.name || 'Team ' + (idx + 1);
+        li.onclick = () => applyTeam(idx);
+        teamList.appendChild(li);
     });
 }
 
+function applyTeamChange(change) {
+    const idx = teams.findIndex(t => t.id === change.id);
+    if (change.op === 'deleted') {
+        if (idx >= 0) teams.splice(idx, 1);
+    } else if (idx < 0) {
+        teams.push(change.record);
+    } else {
+        teams[idx] = change.record;
+    }
+    renderTeams();
+}
+
 canvas.addEventListener('mousedown', startDrag);
 canvas.addEventListener('touchstart', e => startDrag(e.touches[0]));
 canvas.addEventListener('mousemove', moveDrag);
@@ -120,6 +219,7 @@ function moveDrag(e) {
     dragging.x = e.offsetX - offsetX;
     dragging.y = e.offsetY - offsetY;
     if (dragging === ball) {
+        queueInterpolation(ball.x, ball.y);
         markers.forEach((m, idx) => {
             if (Math.hypot(dragging.x - m.x, dragging.y - m.y) < 15) {
                 applyFormation(idx);
@@ -129,12 +229,66 @@ function moveDrag(e) {
     drawField();
 }
 
+// Ball positions are collected and sent once per animation frame as float32 pairs;
+// only the newest position is applied to the players.
+function queueInterpolation(x, y) {
+    pendingPoints.push(x, y);
+    if (interpolationFrame === null) {
+        interpolationFrame = requestAnimationFrame(sendInterpolation);
+    }
+}
+
+function sendInterpolation() {
+    interpolationFrame = null;
+    if (interpolationInFlight || pendingPoints.length === 0) {
+        if (pendingPoints.length) interpolationFrame = requestAnimationFrame(sendInterpolation);
+        return;
+    }
+    const points = new Float32Array(pendingPoints);
+    pendingPoints = [];
+    interpolationInFlight = true;
+    fetch('/api/interpolate', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/octet-stream', 'Accept': 'application/octet-stream'},
+        body: points
+    }).then(r => {
+        if (!r.ok) throw new Error(r.status);
+        const count = parseInt(r.headers.get('X-Players'), 10);
+        return r.arrayBuffer().then(buf => applyInterpolation(points, new Float32Array(buf), count));
+    }).catch(() => {}).finally(() => {
+        interpolationInFlight = false;
+    });
+}
+
+function applyInterpolation(points, positions, count) {
+    const last = points.length / 2 - 1;
+    if (!ball || Math.fround(ball.x) !== points[2 * last] || Math.fround(ball.y) !== points[2 * last + 1]) return;
+    const base = last * count * 2;
+    if (count === 0 || Number.isNaN(positions[base])) return;
+    players.forEach((p, i) => {
+        if (i < count) {
+            p.x = positions[base + 2 * i];
+            p.y = positions[base + 2 * i + 1];
+        }
+    });
+    drawField();
+}
+
 function endDrag() {
     dragging = null;
 }
 
 function applyFormation(idx) {
-    const f = formations[idx];
+    if (idx < 0) return;
+    const id = formations[idx].id;
+    const f = formationDetails[id];
+    if (!f) {
+        loadFormation(id).then(() => {
+            if (formationDetails[id]) applyFormation(formationIndex(id));
+        });
+        return;
+    }
+    currentFormationId = f.id;
     ball = { x: f.ball[0], y: f.ball[1] };
     players = f.offsets.map((o, i) => ({
         x: ball.x + o[0],
@@ -166,7 +320,9 @@ function saveCurrentFormation() {
         method: 'POST',
         headers: {'Content-Type': 'application/json'},
         body: JSON.stringify(formation)
-    }).then(() => location.reload());
+    }).then(() => {
+        if (!changeFeed) location.reload();
+    });
 }
 
 function saveCurrentTeam() {
@@ -178,10 +334,13 @@ function saveCurrentTeam() {
         method: 'POST',
         headers: {'Content-Type': 'application/json'},
         body: JSON.stringify(team)
-    }).then(() => location.reload());
+    }).then(() => {
+        if (!changeFeed) location.reload();
+    });
 }
 
 document.getElementById('saveFormation').onclick = saveCurrentFormation;
 document.getElementById('saveTeam').onclick = saveCurrentTeam;
 
 loadData();
+listenForChanges();